@@ -2,47 +2,172 @@
 # AIlibrary.py
 
 import os
-from core.train_model import ModelTrainer
 from core.model_handler import ModelHandler
 from core.test_model import ModelTester
+from core.rule_engine import RuleEngine
+from core.compiled_forest import CompiledForest
+from core.streaming import StreamingSummary
+from core.prediction_cache import PredictionCache
+from core.instrumentation import timings, timed
+from utils.dataset_io import read_metrics, iter_metrics
+import joblib
+import numpy as np
 import pandas as pd
 
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'config', 'parameters.json')
+
+# Motores de inferencia disponibles en analyze_code
+INFERENCE_BACKENDS = ('sklearn', 'compiled')
+
+# El entrenamiento (scikit-learn), la evaluación paralela, la extracción de código Java,
+# el análisis incremental y la ruta rápida se importan al usarse por primera vez: cargar
+# un modelo y evaluarlo no debe pagar el arranque de módulos que no va a utilizar.
+
 class AILibrary:
     """
     Librería principal para análisis y optimización de código Java.
     """
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, config_path=DEFAULT_CONFIG_PATH):
         """
         Inicializa la librería.
 
         Args:
             model_path: Ruta al modelo pre-entrenado (opcional)
+            config_path: Ruta al archivo de configuración con las reglas de optimización
         """
         self.model_handler = ModelHandler()
-        self.trainer = ModelTrainer()
+        self._trainer = None
         self.tester = ModelTester()
+        self.rule_engine = RuleEngine.from_config(config_path)
+        self.config_path = config_path
         self.model = None
         self.metrics = None
+        self.model_path = None
+        self._compiled_model = None
+        self._compiled_source = None
+        self._parallel_scorer = None
+        self.prediction_cache = None
+        self._model_fingerprint = None
+        self._fingerprint_source = None
+        self.surrogate = None
+        self.surrogate_metrics = None
+        self.fast_model = None
+        self.timings = timings
 
         if model_path and os.path.exists(model_path):
             self.model, self.metrics = self.model_handler.load_model(model_path)
+            self.model_path = model_path
 
+    @property
+    def trainer(self):
+        """Entrenador de modelos (se crea al primer uso, ya que importa scikit-learn)."""
+        if self._trainer is None:
+            from core.train_model import ModelTrainer
+            self._trainer = ModelTrainer()
+        return self._trainer
+
+    @timed('train')
     def train(self, data_path, model_type='random_forest'):
         """
         Entrena un nuevo modelo.
 
         Args:
-            data_path: Ruta al archivo CSV con datos de entrenamiento
-            model_type: Tipo de modelo ('random_forest' o 'decision_tree')
+            data_path: Ruta a los datos de entrenamiento (CSV, directorio columnar .cols o .parquet)
+            model_type: Tipo de modelo ('random_forest', 'decision_tree' o 'hist_gradient_boosting')
         """
         if not os.path.exists(data_path):
             raise FileNotFoundError(f"No se encontró el archivo de datos: {data_path}")
 
         # Cargar y preparar datos
-        training_data = pd.read_csv(data_path)
+        with timings.span('train.load_data'):
+            training_data = read_metrics(data_path, require_target=True)
 
         # Entrenar modelo
-        self.model, self.metrics = self.trainer.train_model(training_data, model_type)
+        with timings.span('train.fit'):
+            self.model, self.metrics = self.trainer.train_model(training_data, model_type)
+        # El entrenador reutiliza la misma instancia, invalidar la versión compilada y su huella
+        self._compiled_source = None
+        self._fingerprint_source = None
+        self.model_path = None
+        return self.metrics
+
+    @timed('tune')
+    def tune(self, data_path, model_type='random_forest', workers=None):
+        """
+        Busca los hiperparámetros con successive halving (espacios de búsqueda de la configuración) y entrena el ganador.
+
+        Args:
+            data_path: Ruta a los datos de entrenamiento (CSV, directorio columnar .cols o .parquet)
+            model_type: Tipo de modelo ('random_forest', 'decision_tree' o 'hist_gradient_boosting')
+            workers: Número de procesos para evaluar candidatos (por defecto, todos los núcleos)
+        """
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"No se encontró el archivo de datos: {data_path}")
+
+        with timings.span('tune.load_data'):
+            training_data = read_metrics(data_path, require_target=True)
+
+        with timings.span('tune.search'):
+            from core.train_model import ModelTrainer
+            tuner = ModelTrainer.from_config(self.config_path)
+            self.model, self.metrics = tuner.tune_model(training_data, model_type, workers=workers)
+        self._compiled_source = None
+        self._fingerprint_source = None
+        self.model_path = None
+        return self.metrics
+
+    @timed('train_out_of_core')
+    def train_out_of_core(self, data_path, model_type='random_forest', chunksize=100000,
+                          sample_size=200000, num_reservoirs=None):
+        """
+        Entrena leyendo los datos por bloques, para conjuntos que no caben en memoria.
+
+        Args:
+            data_path: Ruta a los datos de entrenamiento (CSV, directorio columnar .cols o .parquet)
+            model_type: Tipo de modelo ('random_forest', 'decision_tree' o 'hist_gradient_boosting')
+            chunksize: Filas por bloque leído
+            sample_size: Filas de cada depósito de muestreo
+            num_reservoirs: Número de depósitos (opcional)
+        """
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"No se encontró el archivo de datos: {data_path}")
+
+        self.model, self.metrics = self.trainer.train_out_of_core(
+            data_path, model_type, chunksize=chunksize,
+            sample_size=sample_size, num_reservoirs=num_reservoirs
+        )
+        self._compiled_source = None
+        self._fingerprint_source = None
+        self.model_path = None
+        return self.metrics
+
+    @timed('grow')
+    def grow(self, data_path, n_new_trees=10, max_trees=None, batch_id=None):
+        """
+        Añade árboles al Random Forest cargado entrenándolos solo con un lote de datos nuevos.
+
+        Args:
+            data_path: Ruta al lote nuevo (CSV, directorio columnar .cols o .parquet)
+            n_new_trees: Número de árboles a añadir
+            max_trees: Tamaño máximo del ensamble; se descartan los árboles más antiguos (opcional)
+            batch_id: Identificador del lote en los metadatos (por defecto, la fecha y hora)
+        """
+        if self.model is None:
+            raise ValueError("No hay modelo cargado. Carga o entrena un modelo primero.")
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"No se encontró el archivo de datos: {data_path}")
+
+        with timings.span('grow.load_data'):
+            batch_data = read_metrics(data_path, require_target=True)
+
+        with timings.span('grow.fit'):
+            self.model, self.metrics = self.trainer.grow_model(
+                self.model, batch_data, previous_metadata=self.metrics,
+                n_new_trees=n_new_trees, max_trees=max_trees, batch_id=batch_id
+            )
+        self._compiled_source = None
+        self._fingerprint_source = None
+        self.model_path = None
         return self.metrics
 
     def save_model(self, path):
@@ -58,7 +183,8 @@ class AILibrary:
         # Asegurar que el directorio existe
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
-        return self.model_handler.save_model(self.model, path, self.metrics)
+        self.model_path = self.model_handler.save_model(self.model, path, self.metrics)
+        return self.model_path
 
     def load_model(self, path):
         """
@@ -68,27 +194,308 @@ class AILibrary:
             path: Ruta al modelo guardado
         """
         self.model, self.metrics = self.model_handler.load_model(path)
+        self.model_path = path
         return self.metrics
 
-    def analyze_code(self, metrics_data):
+    @timed('distill')
+    def distill(self, num_samples=200000, max_depth=8, eval_data_path=None):
         """
-        Analiza métricas de código y predice si es óptimo.
+        Destila el modelo cargado en un árbol pequeño y lo activa como ruta rápida de predict_one.
 
         Args:
-            metrics_data: DataFrame con métricas de código
+            num_samples: Filas sintéticas etiquetadas por el modelo actual
+            max_depth: Profundidad máxima del árbol sustituto
+            eval_data_path: Datos reales para medir la fidelidad (opcional)
+        """
+        if self.model is None:
+            raise ValueError("No hay modelo cargado. Carga o entrena un modelo primero.")
+
+        eval_data = read_metrics(eval_data_path) if eval_data_path else None
+        self.surrogate, self.surrogate_metrics = self.trainer.distill_model(
+            self.model, num_samples=num_samples, max_depth=max_depth, eval_data=eval_data
+        )
+        from core.distillation import FastPathTree
+        self.fast_model = FastPathTree.from_model(self.surrogate)
+        return self.surrogate_metrics
+
+    def save_fast_model(self, path):
+        """
+        Guarda el árbol sustituto con ModelHandler (metadatos con role='fast_path' y la fidelidad).
+
+        Args:
+            path: Ruta donde guardar el modelo
+        """
+        if self.surrogate is None:
+            raise ValueError("No hay modelo sustituto. Ejecuta distill() o carga uno primero.")
+        return self.model_handler.save_model(self.surrogate, path, self.surrogate_metrics)
+
+    def load_fast_model(self, path):
+        """
+        Carga un árbol sustituto guardado y lo usa como ruta rápida de predict_one.
+
+        Args:
+            path: Ruta al modelo guardado
+        """
+        self.surrogate, self.surrogate_metrics = self.model_handler.load_model(path)
+        from core.distillation import FastPathTree
+        self.fast_model = FastPathTree.from_model(self.surrogate)
+        return self.surrogate_metrics
+
+    def predict_one(self, metrics):
+        """
+        Evalúa una sola clase, con el árbol sustituto si hay uno activo (p.ej. al guardar en el IDE).
+
+        Args:
+            metrics: Diccionario con las métricas de la clase
+
+        Returns:
+            Dict: 'prediction', 'probabilities', 'confidence' y 'fast_path'
+        """
+        if self.fast_model is not None:
+            prediction, probabilities = self.fast_model.predict_one(metrics)
+            fast_path = True
+        else:
+            model = self.get_inference_model()
+            row = pd.DataFrame([metrics])
+            probabilities = model.predict_proba(row[self._feature_columns(model, row)])[0].tolist()
+            prediction = model.classes_.tolist()[int(np.argmax(probabilities))]
+            fast_path = False
+
+        return {
+            'prediction': prediction,
+            'probabilities': list(probabilities),
+            'confidence': max(probabilities),
+            'fast_path': fast_path
+        }
+
+    def get_inference_model(self, backend='sklearn', workers=None):
+        """
+        Obtiene el modelo a usar según el motor de inferencia.
+
+        Args:
+            backend: Motor de inferencia ('sklearn' o 'compiled')
+            workers: Número de procesos para evaluar en paralelo (opcional)
+        """
+        if self.model is None:
+            raise ValueError("No hay modelo cargado. Carga o entrena un modelo primero.")
+
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Motor de inferencia no válido. Opciones: {list(INFERENCE_BACKENDS)}")
+
+        if workers is not None and workers > 1:
+            return self._get_parallel_scorer(backend, workers)
+
+        if backend == 'compiled':
+            # Recompilar solo si el modelo cambió desde la última compilación
+            if self._compiled_source is not self.model:
+                self._compiled_model = CompiledForest.from_model(self.model)
+                self._compiled_source = self.model
+            return self._compiled_model
+
+        return self.model
+
+    def _get_parallel_scorer(self, backend, workers):
+        """
+        Obtiene (o crea) el evaluador paralelo para el modelo guardado actual.
+
+        Args:
+            backend: Motor de inferencia de los procesos trabajadores
+            workers: Número de procesos
+        """
+        if self.model_path is None:
+            raise ValueError("La evaluación paralela requiere un modelo guardado. Usa save_model o load_model primero.")
+
+        scorer = self._parallel_scorer
+        if scorer is None or (scorer.model_path, scorer.backend, scorer.workers) != (str(self.model_path), backend, workers):
+            if scorer is not None:
+                scorer.close()
+            from core.parallel import ParallelScorer
+            self._parallel_scorer = ParallelScorer(self.model_path, workers=workers, backend=backend)
+
+        return self._parallel_scorer
+
+    def enable_prediction_cache(self, max_size=100000, path=None):
+        """
+        Activa la caché de predicciones por fila.
+
+        Args:
+            max_size: Número máximo de filas en memoria (desalojo LRU)
+            path: Archivo SQLite para conservar la caché entre ejecuciones (opcional)
+        """
+        if self.prediction_cache is not None:
+            self.prediction_cache.close()
+        self.prediction_cache = PredictionCache(max_size=max_size, path=path)
+        return self.prediction_cache
+
+    def get_model_fingerprint(self):
+        """
+        Obtiene la huella (hash) del modelo actual; se recalcula solo si el modelo cambió.
         """
         if self.model is None:
             raise ValueError("No hay modelo cargado. Carga o entrena un modelo primero.")
 
-        results = self.tester.test_model(self.model, metrics_data)
+        if self._fingerprint_source is not self.model:
+            self._model_fingerprint = joblib.hash(self.model)
+            self._fingerprint_source = self.model
+        return self._model_fingerprint
+
+    def _score(self, model, metrics_data):
+        """
+        Evalúa el lote con el modelo, respondiendo desde la caché de predicciones si está activa.
+
+        Args:
+            model: Modelo de inferencia
+            metrics_data: DataFrame con métricas de código
+        """
+        if self.prediction_cache is None:
+            results = self.tester.test_model(model, metrics_data)
+            results['index'] = metrics_data.index
+            return results
+
+        with timings.span('analyze.cache_lookup'):
+            features = metrics_data[self._feature_columns(model, metrics_data)]
+            keys = self.prediction_cache.row_keys(features, self.get_model_fingerprint())
+            hit_positions, hit_probabilities, miss_positions = self.prediction_cache.get_many(keys)
+
+        probabilities = np.empty((len(metrics_data), len(model.classes_)), dtype=np.float64)
+        if len(hit_positions):
+            probabilities[hit_positions] = np.vstack(hit_probabilities)
+
+        # Solo las filas sin acierto pasan por el modelo
+        if len(miss_positions):
+            miss_results = self.tester.test_model(model, metrics_data.iloc[miss_positions])
+            probabilities[miss_positions] = miss_results['probabilities']
+            self.prediction_cache.put_many([keys[i] for i in miss_positions], miss_results['probabilities'])
+
+        return {
+            'predictions': model.classes_.take(np.argmax(probabilities, axis=1), axis=0),
+            'probabilities': probabilities,
+            'num_samples': len(metrics_data),
+            'index': metrics_data.index,
+            'cache_hits': len(hit_positions),
+            'cache_misses': len(miss_positions)
+        }
+
+    @timed('analyze_code')
+    def analyze_code(self, metrics_data, backend='sklearn', full_results=True, workers=None):
+        """
+        Analiza métricas de código y predice si es óptimo.
+
+        Args:
+            metrics_data: DataFrame con métricas de código
+            backend: Motor de inferencia ('sklearn' o 'compiled')
+            full_results: Si es True incluye en el análisis la copia completa de los
+                datos con predicciones y confianza; False la omite en lotes grandes,
+                donde duplicaría la memoria
+            workers: Número de procesos para repartir las filas (opcional)
+        """
+        with timings.span('analyze.load_model'):
+            model = self.get_inference_model(backend, workers)
+
+        with timings.span('analyze.score'):
+            results = self._score(model, metrics_data)
         analysis = self.tester.analyze_predictions(
             metrics_data,
             results['predictions'],
-            results['probabilities']
+            results['probabilities'],
+            full_results=full_results
         )
 
         return results, analysis
 
+    def analyze_file(self, data_path, chunksize=100000, backend='sklearn', summary=None, workers=None):
+        """
+        Analiza un archivo de métricas por bloques, con memoria acotada.
+
+        Args:
+            data_path: Ruta a las métricas de código (CSV, directorio columnar .cols o .parquet)
+            chunksize: Número de filas leídas y evaluadas por bloque
+            backend: Motor de inferencia ('sklearn' o 'compiled')
+            summary: Acumulador StreamingSummary que se actualiza con cada bloque (opcional)
+            workers: Número de procesos para repartir las filas de cada bloque (opcional)
+
+        Yields:
+            Tuple[pd.DataFrame, Dict, Dict]: Bloque leído, resultados y análisis del bloque
+        """
+        if not os.path.exists(data_path):
+            raise FileNotFoundError(f"No se encontró el archivo de datos: {data_path}")
+
+        model = self.get_inference_model(backend, workers)
+        if summary is None:
+            summary = StreamingSummary()
+
+        for chunk in iter_metrics(data_path, chunksize):
+            features = chunk[self._feature_columns(model, chunk)]
+
+            results = self._score(model, features)
+            analysis = self.tester.analyze_predictions(
+                features,
+                results['predictions'],
+                results['probabilities'],
+                full_results=False
+            )
+            summary.update(results['predictions'], results['probabilities'])
+
+            yield chunk, results, analysis
+
+    def analyze_source(self, source_dir, backend='sklearn', workers=None, cache_path=None):
+        """
+        Extrae las métricas de un árbol de código Java y analiza cada clase.
+
+        Args:
+            source_dir: Directorio raíz del código Java
+            backend: Motor de inferencia ('sklearn' o 'compiled')
+            workers: Número de procesos para la extracción (opcional)
+            cache_path: Archivo SQLite para no volver a analizar los archivos sin cambios (opcional)
+
+        Returns:
+            Tuple[pd.DataFrame, Dict, Dict]: Métricas por clase, resultados y análisis
+        """
+        from core.java_metrics import JavaMetricsExtractor
+        metrics = JavaMetricsExtractor(workers=workers, cache_path=cache_path).extract(source_dir)
+        if metrics.empty:
+            raise ValueError(f"No se encontraron clases Java en: {source_dir}")
+
+        model = self.get_inference_model(backend)
+        features = metrics[self._feature_columns(model, metrics)]
+        results, analysis = self.analyze_code(features, backend=backend)
+
+        return metrics, results, analysis
+
+    def analyze_incremental(self, metrics_data, state_path, backend='sklearn', workers=None, key_columns=None):
+        """
+        Analiza métricas de código evaluando solo las clases nuevas o modificadas desde la última ejecución.
+
+        Args:
+            metrics_data: DataFrame con métricas de código (y file_path/class_name si existen)
+            state_path: Directorio .cols con el estado de la ejecución anterior
+            backend: Motor de inferencia ('sklearn' o 'compiled')
+            workers: Número de procesos para evaluar las filas cambiadas (opcional)
+            key_columns: Columnas que identifican cada clase (opcional)
+
+        Returns:
+            Tuple[Dict, Dict]: Resultados de todas las clases (con 'changed' y 'diff') y análisis
+        """
+        from core.incremental import IncrementalAnalyzer
+        analyzer = IncrementalAnalyzer(self, state_path, key_columns=key_columns)
+        return analyzer.run(metrics_data, backend=backend, workers=workers)
+
+    def _feature_columns(self, model, data):
+        """
+        Determina las columnas de entrada del modelo presentes en los datos.
+
+        Args:
+            model: Modelo de inferencia
+            data: DataFrame con métricas y columnas adicionales (class_type, is_optimal...)
+        """
+        if hasattr(model, 'feature_names_in_'):
+            return list(model.feature_names_in_)
+
+        return [
+            column for column in data.select_dtypes(include='number').columns
+            if column != 'is_optimal'
+        ]
+
     def get_model_metrics(self):
         """
         Obtiene las métricas del modelo actual.
@@ -98,50 +505,45 @@ class AILibrary:
 
         return self.metrics
 
-    def get_optimization_suggestions(self, metrics_data, results):
+    @timed('suggestions')
+    def get_optimization_suggestions(self, metrics_data, results, as_records=True):
         """
         Genera sugerencias de optimización basadas en el análisis.
 
         Args:
             metrics_data: DataFrame con métricas de código
-            results: Resultados del análisis
-        """
-        suggestions = []
-
-        for idx, row in metrics_data.iterrows():
-            if results['predictions'][idx] == 0:  # Si es subóptimo
-                suggestion = {
-                    'index': idx,
-                    'issues': [],
-                    'suggestions': []
-                }
-
-                # Verificar diferentes métricas
-                if row['cyclomatic_complexity'] > 15:
-                    suggestion['issues'].append('Alta complejidad ciclomática')
-                    suggestion['suggestions'].append(
-                        'Considera dividir el método en funciones más pequeñas'
-                    )
-
-                if row['coupling_between_objects'] > 8:
-                    suggestion['issues'].append('Alto acoplamiento')
-                    suggestion['suggestions'].append(
-                        'Considera aplicar principios SOLID para reducir el acoplamiento'
-                    )
-
-                if row['lack_of_cohesion'] > 0.5:
-                    suggestion['issues'].append('Baja cohesión')
-                    suggestion['suggestions'].append(
-                        'Considera reorganizar las responsabilidades de la clase'
-                    )
-
-                if row['number_of_methods'] > 15:
-                    suggestion['issues'].append('Demasiados métodos')
-                    suggestion['suggestions'].append(
-                        'Considera dividir la clase en clases más pequeñas'
-                    )
-
-                if suggestion['issues']:
-                    suggestions.append(suggestion)
-
-        return suggestions
\ No newline at end of file
+            results: Resultados del análisis (las predicciones se alinean con metrics_data
+                por el índice de las filas evaluadas, 'index', si está disponible)
+            as_records: Si es True devuelve la lista de diccionarios; si es False
+                devuelve los resultados columnares del motor de reglas
+        """
+        predictions = results['predictions']
+        if results.get('index') is not None:
+            predictions = pd.Series(predictions, index=results['index'])
+
+        with timings.span('suggestions.evaluate'):
+            evaluation = self.rule_engine.evaluate(metrics_data, predictions)
+
+        if not as_records:
+            return evaluation
+
+        with timings.span('suggestions.to_records'):
+            return self.rule_engine.to_suggestions(evaluation)
+
+    def enable_timing(self, listener=None):
+        """
+        Activa la medición de tiempos por etapa (entrenamiento, análisis, sugerencias y E/S de modelos).
+
+        Args:
+            listener: Función llamada con (etapa, segundos) al terminar cada tramo (opcional)
+        """
+        self.timings.enable(listener)
+
+    def get_timing_stats(self):
+        """
+        Obtiene los tiempos agregados por etapa.
+
+        Returns:
+            Dict: Por etapa, llamadas, tiempos (s) e histograma de latencias
+        """
+        return self.timings.get_stats()
\ No newline at end of file
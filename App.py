@@ -1,7 +1,8 @@
 # App.py
 
 from AIlibrary import AILibrary
-import pandas as pd
+from core.metrics_schema import FEATURE_COLUMNS, validate_metrics
+from utils.dataset_io import read_metrics
 import os
 
 def get_project_root():
@@ -71,16 +72,12 @@ def main():
         # 3. Analizar nuevo código
         print("\n3. Analizando nuevo código...")
         print(f"Usando datos de prueba de: {test_data_path}")
-        test_data = pd.read_csv(test_data_path)
-
-        features_to_use = ['lines_of_code', 'effective_lines', 'number_of_methods',
-                        'cyclomatic_complexity', 'inheritance_depth', 'number_of_branches',
-                        'coupling_between_objects', 'external_dependencies', 'lack_of_cohesion']
-        missing_features = [f for f in features_to_use if f not in test_data.columns]
-        if missing_features:
-            raise ValueError(f"Faltan las siguientes características en los datos de prueba: {missing_features}")
-        test_data_features = test_data[features_to_use]
-        results, analysis = ai_lib.analyze_code(test_data_features)
+        test_data = read_metrics(test_data_path)
+
+        validate_metrics(test_data)
+        test_data_features = test_data[FEATURE_COLUMNS]
+        # Solo se usan las predicciones: sin la copia completa de los datos en el análisis
+        results, analysis = ai_lib.analyze_code(test_data_features, full_results=False)
 
 
         # 4. Mostrar resultados
@@ -0,0 +1,341 @@
+# core/binned_boosting.py
+
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
+
+# Filas usadas para estimar los cuantiles de cada característica
+BINNING_SAMPLE_SIZE = 200000
+
+# Tamaño máximo por defecto de la caché de matrices discretizadas
+DEFAULT_BIN_CACHE_BYTES = 2 ** 30
+
+
+def compute_bin_edges(values: np.ndarray, max_bins: int = 255, random_state: int = None) -> List[np.ndarray]:
+    """
+    Calcula los límites de los bins por cuantiles de cada columna.
+
+    Una columna con max_bins valores distintos o menos tiene un bin por valor (sin
+    pérdida); si no, los límites son cuantiles estimados sobre una muestra.
+
+    Args:
+        values (np.ndarray): Matriz de características en float32
+        max_bins (int): Número máximo de bins por característica (hasta 255)
+        random_state (int): Semilla de la muestra
+
+    Returns:
+        List[np.ndarray]: Por columna, los límites superiores de cada bin salvo el último
+    """
+    if not 2 <= max_bins <= 255:
+        raise ValueError("max_bins debe estar entre 2 y 255")
+
+    if len(values) > BINNING_SAMPLE_SIZE:
+        rows = np.random.RandomState(random_state).choice(len(values), BINNING_SAMPLE_SIZE, replace=False)
+        values = values[rows]
+
+    edges = []
+    for column in range(values.shape[1]):
+        distinct = np.unique(values[:, column])
+        if len(distinct) > max_bins:
+            quantiles = np.linspace(0, 1, max_bins + 1)[1:-1]
+            distinct = np.unique(np.quantile(values[:, column], quantiles, method='lower').astype(np.float32))
+            edges.append(distinct)
+        else:
+            edges.append(distinct[:-1])
+    return edges
+
+
+def apply_bins(values: np.ndarray, edges: List[np.ndarray]) -> np.ndarray:
+    """
+    Convierte una matriz de características a códigos de bin.
+
+    Args:
+        values (np.ndarray): Matriz de características en float32
+        edges (List[np.ndarray]): Límites calculados con compute_bin_edges
+
+    Returns:
+        np.ndarray: Códigos uint8 (el bin k contiene los valores <= edges[k])
+    """
+    codes = np.empty(values.shape, dtype=np.uint8)
+    for column, column_edges in enumerate(edges):
+        codes[:, column] = np.searchsorted(column_edges, values[:, column], side='left')
+    return codes
+
+
+class BinCache:
+    """
+    Caché en disco de matrices ya discretizadas (un .npz por conjunto de datos).
+
+    La clave combina el contenido de las características, max_bins y la semilla, así
+    que reentrenar o repetir una búsqueda sobre los mismos datos reutiliza los límites
+    y los códigos sin recalcular cuantiles ni discretizar los valores originales. La
+    escritura es atómica (archivo temporal y os.replace), por lo que varios procesos
+    pueden compartir el directorio. El tamaño total está acotado por max_bytes: al
+    guardar una entrada se borran las menos usadas (por fecha de modificación, que se
+    actualiza en cada acierto).
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_BIN_CACHE_BYTES):
+        """
+        Inicializa la caché.
+
+        Args:
+            cache_dir (str): Directorio de la caché (se crea si no existe)
+            max_bytes (int): Tamaño máximo de la caché en disco (None para no limitarlo)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(values: np.ndarray, max_bins: int, random_state: int) -> str:
+        """
+        Calcula la clave de una matriz de características.
+
+        Args:
+            values (np.ndarray): Matriz en float32
+            max_bins (int): Número máximo de bins
+            random_state (int): Semilla del muestreo de cuantiles
+
+        Returns:
+            str: Hash hexadecimal
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{values.shape}|{max_bins}|{random_state}".encode())
+        digest.update(np.ascontiguousarray(values).data)
+        return digest.hexdigest()
+
+    def get_or_compute(self, values: np.ndarray, max_bins: int, random_state: int) -> tuple:
+        """
+        Obtiene los límites y códigos de una matriz, discretizándola solo si no están en caché.
+
+        Args:
+            values (np.ndarray): Matriz en float32
+            max_bins (int): Número máximo de bins
+            random_state (int): Semilla del muestreo de cuantiles
+
+        Returns:
+            tuple: (límites por columna, códigos uint8)
+        """
+        path = self.cache_dir / f"{self.key(values, max_bins, random_state)}.npz"
+        try:
+            with np.load(path) as stored:
+                edges = [stored[f'edges_{column}'] for column in range(values.shape[1])]
+                codes = stored['codes']
+            os.utime(path)
+            self.hits += 1
+            return edges, codes
+        except FileNotFoundError:
+            # Puede haberla desalojado otro proceso entre la comprobación y la lectura
+            pass
+
+        self.misses += 1
+        edges = compute_bin_edges(values, max_bins, random_state)
+        codes = apply_bins(values, edges)
+
+        tmp_path = path.with_name(f".{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(tmp_path, codes=codes, **{f'edges_{column}': e for column, e in enumerate(edges)})
+        os.replace(tmp_path, path)
+        self.evict(keep=path)
+        return edges, codes
+
+    def evict(self, keep: Path = None) -> List[Path]:
+        """
+        Borra las entradas menos usadas hasta que la caché quepa en max_bytes.
+
+        Args:
+            keep (Path): Entrada que no se borra aunque por sí sola supere el límite (opcional)
+
+        Returns:
+            List[Path]: Entradas borradas
+        """
+        if self.max_bytes is None:
+            return []
+
+        entries = []
+        for path in self.cache_dir.glob('*.npz'):
+            if path.name.startswith('.'):
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed.append(path)
+        return removed
+
+
+class BinnedHistGradientBoosting(ClassifierMixin, BaseEstimator):
+    """
+    Gradient boosting por histogramas entrenado sobre características ya discretizadas a uint8.
+
+    Las métricas se discretizan por cuantiles (un bin por valor si hay pocos valores
+    distintos, como en los conteos) y el booster de scikit-learn se entrena sobre los
+    códigos; con cache_dir la matriz discretizada se guarda en disco y se reutiliza
+    entre reentrenamientos y búsquedas de hiperparámetros. En inferencia las métricas
+    se discretizan con los mismos límites antes de evaluar el booster.
+
+    El booster no admite datos ya discretizados: su propio _BinMapper vuelve a
+    discretizar los códigos uint8 en cada fit (sin pérdida, porque hay como mucho
+    max_bins valores distintos). La caché solo evita el cálculo de cuantiles y la
+    discretización de los valores originales, una fracción pequeña del entrenamiento
+    (ver el benchmark 'bin_features' de scripts/run_benchmarks.py).
+    """
+
+    def __init__(self,
+                 max_bins: int = 255,
+                 learning_rate: float = 0.1,
+                 max_iter: int = 100,
+                 max_leaf_nodes: int = 31,
+                 max_depth: int = None,
+                 min_samples_leaf: int = 20,
+                 l2_regularization: float = 0.0,
+                 early_stopping: str = 'auto',
+                 random_state: int = None,
+                 cache_dir: str = None,
+                 cache_max_bytes: int = DEFAULT_BIN_CACHE_BYTES):
+        self.max_bins = max_bins
+        self.learning_rate = learning_rate
+        self.max_iter = max_iter
+        self.max_leaf_nodes = max_leaf_nodes
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.l2_regularization = l2_regularization
+        self.early_stopping = early_stopping
+        self.random_state = random_state
+        self.cache_dir = cache_dir
+        self.cache_max_bytes = cache_max_bytes
+
+    def _as_matrix(self, X) -> np.ndarray:
+        """Convierte la entrada a una matriz float32 con las columnas en el orden del entrenamiento."""
+        if isinstance(X, pd.DataFrame):
+            if hasattr(self, 'feature_names_in_'):
+                missing = [column for column in self.feature_names_in_ if column not in X.columns]
+                if missing:
+                    raise ValueError(f"Faltan las siguientes características en los datos: {missing}")
+                X = X[self.feature_names_in_]
+            return X.to_numpy(dtype=np.float32)
+        return np.asarray(X, dtype=np.float32)
+
+    def fit(self, X, y) -> 'BinnedHistGradientBoosting':
+        """
+        Discretiza las características (o las toma de la caché) y entrena el booster.
+
+        Args:
+            X: Métricas (DataFrame o matriz)
+            y: Etiquetas
+
+        Returns:
+            BinnedHistGradientBoosting: El propio estimador entrenado
+        """
+        if isinstance(X, pd.DataFrame):
+            self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        elif hasattr(self, 'feature_names_in_'):
+            del self.feature_names_in_
+        values = self._as_matrix(X)
+        self.n_features_in_ = values.shape[1]
+
+        if self.cache_dir:
+            cache = BinCache(self.cache_dir, self.cache_max_bytes)
+            self.bin_edges_, codes = cache.get_or_compute(values, self.max_bins, self.random_state)
+        else:
+            self.bin_edges_ = compute_bin_edges(values, self.max_bins, self.random_state)
+            codes = apply_bins(values, self.bin_edges_)
+
+        self.booster_ = HistGradientBoostingClassifier(
+            max_bins=self.max_bins,
+            learning_rate=self.learning_rate,
+            max_iter=self.max_iter,
+            max_leaf_nodes=self.max_leaf_nodes,
+            max_depth=self.max_depth,
+            min_samples_leaf=self.min_samples_leaf,
+            l2_regularization=self.l2_regularization,
+            early_stopping=self.early_stopping,
+            random_state=self.random_state
+        )
+        self.booster_.fit(codes, np.asarray(y))
+        self.classes_ = self.booster_.classes_
+        return self
+
+    def transform_bins(self, X) -> np.ndarray:
+        """
+        Discretiza métricas con los límites del entrenamiento.
+
+        Args:
+            X: Métricas (DataFrame o matriz)
+
+        Returns:
+            np.ndarray: Códigos uint8
+        """
+        return apply_bins(self._as_matrix(X), self.bin_edges_)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Calcula las probabilidades de cada clase.
+
+        Args:
+            X: Métricas (DataFrame o matriz)
+
+        Returns:
+            np.ndarray: Probabilidades (n_muestras, n_clases)
+        """
+        return self.booster_.predict_proba(self.transform_bins(X))
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predice la clase de cada muestra.
+
+        Args:
+            X: Métricas (DataFrame o matriz)
+
+        Returns:
+            np.ndarray: Clases predichas
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def permutation_importance(self, X, y, n_repeats: int = 5, max_rows: int = 10000) -> Dict[str, float]:
+        """
+        Estima la importancia de cada característica por permutación (caída media de la precisión).
+
+        Las columnas se permutan ya discretizadas, así que no se vuelve a discretizar
+        en cada repetición.
+
+        Args:
+            X: Métricas de evaluación (DataFrame o matriz)
+            y: Etiquetas de evaluación
+            n_repeats (int): Permutaciones por característica
+            max_rows (int): Máximo de filas usadas (muestra reproducible)
+
+        Returns:
+            Dict[str, float]: Importancia por característica
+        """
+        codes = self.transform_bins(X)
+        y = np.asarray(y)
+        if len(codes) > max_rows:
+            rows = np.random.RandomState(self.random_state).choice(len(codes), max_rows, replace=False)
+            codes, y = codes[rows], y[rows]
+
+        result = permutation_importance(self.booster_, codes, y, n_repeats=n_repeats, random_state=self.random_state)
+        names = getattr(self, 'feature_names_in_', [f'x{column}' for column in range(self.n_features_in_)])
+        return dict(zip(names, result.importances_mean))
@@ -0,0 +1,467 @@
+# core/compiled_forest.py
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Any, Dict
+
+TREE_LEAF = -1
+
+# Arreglos de nodos que se guardan como un .npy cada uno (save_arrays/load_arrays)
+NODE_ARRAYS = ('feature', 'threshold', 'children_left', 'children_right', 'missing_go_to_left', 'value', 'roots')
+ARRAYS_META_FILENAME = 'forest.json'
+
+
+@lru_cache(maxsize=None)
+def _normalized_tree_values() -> bool:
+    """
+    Indica si tree_.value guarda fracciones por clase (scikit-learn 1.4 o posterior).
+
+    Se consulta al compilar un modelo y no al importar el módulo, para que cargar y
+    evaluar un CompiledForest/CompactForest no requiera importar scikit-learn.
+
+    Returns:
+        bool: True si los valores de hoja ya están normalizados
+    """
+    try:
+        import sklearn
+        from sklearn.utils.fixes import parse_version
+    except ImportError:
+        return True
+    return parse_version(sklearn.__version__) >= parse_version("1.4")
+
+
+class CompiledForest:
+    """
+    Motor de inferencia que recorre un RandomForest/DecisionTree compilado a arreglos planos de NumPy.
+
+    Todos los árboles se concatenan en un único conjunto de arreglos (característica,
+    umbral, hijos y valores de hoja) con índices globales, de modo que un lote completo
+    se recorre nivel a nivel sin pasar por el despacho por estimador de scikit-learn.
+    Las probabilidades coinciden bit a bit con predict_proba de scikit-learn.
+    """
+
+    def __init__(self,
+                 feature: np.ndarray,
+                 threshold: np.ndarray,
+                 children_left: np.ndarray,
+                 children_right: np.ndarray,
+                 missing_go_to_left: np.ndarray,
+                 value: np.ndarray,
+                 roots: np.ndarray,
+                 max_depth: int,
+                 classes: np.ndarray,
+                 n_features: int,
+                 feature_names: np.ndarray = None,
+                 average: bool = True):
+        """
+        Inicializa el motor a partir de los arreglos ya compilados.
+
+        Args:
+            feature: Índice de característica por nodo (0 en las hojas)
+            threshold: Umbral por nodo (float64, como en scikit-learn)
+            children_left: Índice global del hijo izquierdo (el propio nodo en las hojas)
+            children_right: Índice global del hijo derecho (el propio nodo en las hojas)
+            missing_go_to_left: Si los valores faltantes van al hijo izquierdo
+            value: Probabilidades por clase en cada nodo
+            roots: Índice global de la raíz de cada árbol
+            max_depth: Profundidad máxima entre todos los árboles
+            classes: Etiquetas de clase del modelo original
+            n_features: Número de características de entrada
+            feature_names: Nombres de las características (opcional)
+            average: Si se promedian las probabilidades entre árboles (bosques)
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.missing_go_to_left = missing_go_to_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.classes_ = classes
+        self.n_features_in_ = int(n_features)
+        if feature_names is not None:
+            self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.average = average
+
+    @classmethod
+    def from_model(cls, model: Any) -> 'CompiledForest':
+        """
+        Compila un modelo entrenado por ModelTrainer.train_model.
+
+        Args:
+            model: RandomForestClassifier o DecisionTreeClassifier entrenado (un modelo
+                ya compilado, p.ej. un CompactForest cargado, se devuelve tal cual)
+
+        Returns:
+            CompiledForest: Motor de inferencia compilado
+        """
+        if isinstance(model, CompiledForest):
+            return model
+
+        if hasattr(model, 'estimators_'):
+            estimators = list(model.estimators_)
+            average = True
+        elif hasattr(model, 'tree_'):
+            estimators = [model]
+            average = False
+        else:
+            raise TypeError(f"Modelo no soportado para compilación: {type(model).__name__}")
+
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Solo se soportan modelos de una única salida")
+
+        n_classes = len(model.classes_)
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in estimators:
+            tree = estimator.tree_
+            node_count = tree.node_count
+            is_leaf = tree.children_left == TREE_LEAF
+            own_index = np.arange(node_count, dtype=np.int64)
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(is_leaf, own_index, tree.children_left) + offset)
+            rights.append(np.where(is_leaf, own_index, tree.children_right) + offset)
+
+            if hasattr(tree, 'missing_go_to_left'):
+                missing.append(np.asarray(tree.missing_go_to_left, dtype=bool))
+            else:
+                missing.append(np.zeros(node_count, dtype=bool))
+
+            # Mismos valores que devuelve DecisionTreeClassifier.predict_proba
+            leaf_values = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+            if not _normalized_tree_values():
+                normalizer = leaf_values.sum(axis=1)[:, np.newaxis]
+                normalizer[normalizer == 0.0] = 1.0
+                leaf_values /= normalizer
+            values.append(leaf_values)
+
+            roots.append(offset)
+            max_depth = max(max_depth, tree.max_depth)
+            offset += node_count
+
+        return cls(
+            feature=np.concatenate(features).astype(np.int32),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            children_left=np.concatenate(lefts).astype(np.int32),
+            children_right=np.concatenate(rights).astype(np.int32),
+            missing_go_to_left=np.concatenate(missing),
+            value=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.int32),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_),
+            n_features=model.n_features_in_,
+            feature_names=getattr(model, 'feature_names_in_', None),
+            average=average
+        )
+
+    def save_arrays(self, directory: str) -> str:
+        """
+        Guarda los arreglos de nodos como archivos .npy, para abrirlos después con memory-mapping.
+
+        Args:
+            directory (str): Directorio de destino (se crea si no existe)
+
+        Returns:
+            str: Ruta del directorio
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in NODE_ARRAYS:
+            np.save(os.path.join(directory, f'{name}.npy'), np.ascontiguousarray(getattr(self, name)))
+
+        meta = {
+            'kind': type(self).__name__,
+            'max_depth': self.max_depth,
+            'classes': self.classes_.tolist(),
+            'classes_dtype': self.classes_.dtype.str if self.classes_.dtype != object else None,
+            'n_features': self.n_features_in_,
+            'feature_names': self.feature_names_in_.tolist() if hasattr(self, 'feature_names_in_') else None,
+            'average': self.average,
+            'leaf_scale': getattr(self, 'leaf_scale', None)
+        }
+        with open(os.path.join(directory, ARRAYS_META_FILENAME), 'w') as f:
+            json.dump(meta, f)
+        return directory
+
+    @staticmethod
+    def load_arrays(directory: str, mmap_mode: str = 'r') -> 'CompiledForest':
+        """
+        Abre un modelo guardado con save_arrays.
+
+        Con mmap_mode los arreglos no se copian al proceso: todos los procesos que
+        abren el mismo directorio comparten las páginas de la caché del sistema.
+
+        Args:
+            directory (str): Directorio escrito por save_arrays
+            mmap_mode (str): Modo de np.load ('r' por defecto; None los lee en memoria)
+
+        Returns:
+            CompiledForest: CompiledForest o CompactForest, según lo guardado
+        """
+        meta_path = os.path.join(directory, ARRAYS_META_FILENAME)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"No se encontró {ARRAYS_META_FILENAME} en {directory}")
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        arrays = {name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode=mmap_mode) for name in NODE_ARRAYS}
+        kwargs = dict(
+            arrays,
+            max_depth=meta['max_depth'],
+            classes=np.asarray(meta['classes'], dtype=meta['classes_dtype'] or object),
+            n_features=meta['n_features'],
+            feature_names=meta['feature_names'],
+            average=meta['average']
+        )
+        if meta['kind'] == 'CompactForest':
+            return CompactForest(leaf_scale=meta['leaf_scale'], **kwargs)
+        return CompiledForest(**kwargs)
+
+    @property
+    def n_trees(self) -> int:
+        """Número de árboles compilados."""
+        return len(self.roots)
+
+    def _prepare_input(self, X: Any) -> np.ndarray:
+        """
+        Convierte la entrada a una matriz float32 con el orden de características del modelo.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+
+        Returns:
+            np.ndarray: Matriz float32 contigua (scikit-learn también compara en float32)
+        """
+        if isinstance(X, pd.DataFrame) and hasattr(self, 'feature_names_in_'):
+            missing = [name for name in self.feature_names_in_ if name not in X.columns]
+            if missing:
+                raise ValueError(f"Faltan las siguientes características: {missing}")
+            X = X[list(self.feature_names_in_)]
+
+        X = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Se esperaban {self.n_features_in_} características por fila")
+        return X
+
+    def apply(self, X: np.ndarray) -> np.ndarray:
+        """
+        Recorre todos los árboles para un lote ya preparado.
+
+        Args:
+            X: Matriz float32 (n_muestras, n_características)
+
+        Returns:
+            np.ndarray: Índice global de la hoja alcanzada (n_muestras, n_árboles)
+        """
+        n_samples = X.shape[0]
+        nodes = np.repeat(self.roots[np.newaxis, :], n_samples, axis=0)
+        row_offsets = (np.arange(n_samples, dtype=np.int64) * self.n_features_in_)[:, np.newaxis]
+        flat_X = X.ravel()
+
+        for _ in range(self.max_depth):
+            x = flat_X[row_offsets + self.feature[nodes]]
+            go_left = x <= self.threshold[nodes]
+            go_left |= np.isnan(x) & self.missing_go_to_left[nodes]
+            nodes = np.where(go_left, self.children_left[nodes], self.children_right[nodes])
+
+        return nodes
+
+    def predict_proba(self, X: Any, batch_size: int = 65536) -> np.ndarray:
+        """
+        Calcula las probabilidades por clase.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+            batch_size (int): Filas recorridas a la vez, para acotar la memoria de trabajo
+
+        Returns:
+            np.ndarray: Probabilidades (n_muestras, n_clases)
+        """
+        X = self._prepare_input(X)
+        proba = np.zeros((X.shape[0], len(self.classes_)), dtype=np.float64)
+
+        for start in range(0, X.shape[0], batch_size):
+            leaves = self.apply(X[start:start + batch_size])
+            block = proba[start:start + batch_size]
+            # Acumular en el mismo orden que scikit-learn para obtener los mismos bits
+            for tree_index in range(self.n_trees):
+                block += self.value[leaves[:, tree_index]]
+
+        if self.average:
+            proba /= self.n_trees
+
+        return proba
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predice la clase de cada muestra.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+
+        Returns:
+            np.ndarray: Clases predichas
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def score(self, X: Any, y: Any) -> float:
+        """
+        Calcula la precisión (accuracy) sobre datos etiquetados.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+            y: Etiquetas reales
+
+        Returns:
+            float: Precisión
+        """
+        return float(np.mean(self.predict(X) == np.asarray(y)))
+
+
+# Escala de cuantización de las probabilidades de hoja (None: float32 sin cuantizar)
+LEAF_SCALES = {'uint8': 255, 'uint16': 65535, 'float32': None}
+
+
+class CompactForest(CompiledForest):
+    """
+    Versión compacta de CompiledForest para guardar y cargar artefactos pequeños.
+
+    Solo conserva lo que usa la inferencia, en arreglos planos con dtypes mínimos:
+    índices de característica uint8, umbrales float32, hijos uint16 (o int32 si hay
+    más de 65536 nodos) y probabilidades de hoja cuantizadas a enteros.
+
+    Los umbrales se redondean hacia abajo al float32 más cercano. Como las métricas
+    se comparan en float32, x <= umbral da el mismo resultado que en scikit-learn y
+    cada fila llega exactamente a las mismas hojas. Las probabilidades cuantizadas se
+    suman como enteros (sin error de redondeo) y se escalan al final, así que la única
+    diferencia con el modelo original es la cuantización de las hojas.
+    """
+
+    def __init__(self, *args, leaf_scale: int = None, **kwargs):
+        """
+        Inicializa el motor compacto.
+
+        Args:
+            leaf_scale (int): Escala de las probabilidades cuantizadas (None si son float32)
+            (el resto de argumentos, como en CompiledForest)
+        """
+        super().__init__(*args, **kwargs)
+        self.leaf_scale = leaf_scale
+
+    @classmethod
+    def from_model(cls, model: Any, leaf_dtype: str = 'uint16') -> 'CompactForest':
+        """
+        Compacta un modelo entrenado o ya compilado.
+
+        Args:
+            model: RandomForestClassifier, DecisionTreeClassifier o CompiledForest
+            leaf_dtype (str): Representación de las hojas ('uint8', 'uint16' o 'float32')
+
+        Returns:
+            CompactForest: Motor compacto
+        """
+        if leaf_dtype not in LEAF_SCALES:
+            raise ValueError(f"leaf_dtype no soportado: {leaf_dtype}. Opciones: {list(LEAF_SCALES)}")
+
+        compiled = CompiledForest.from_model(model)
+        if isinstance(compiled, CompactForest):
+            raise TypeError("El modelo ya está compactado")
+        if compiled.n_features_in_ > 256:
+            raise ValueError("El formato compacto admite hasta 256 características")
+
+        # Mayor float32 <= umbral: para x en float32, x <= umbral32 equivale a x <= umbral
+        threshold = compiled.threshold.astype(np.float32)
+        rounded_up = threshold.astype(np.float64) > compiled.threshold
+        threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+
+        num_nodes = len(compiled.feature)
+        child_dtype = np.uint16 if num_nodes <= np.iinfo(np.uint16).max + 1 else np.int32
+
+        scale = LEAF_SCALES[leaf_dtype]
+        if scale is None:
+            value = compiled.value.astype(np.float32)
+        else:
+            value = np.rint(compiled.value * scale).astype(leaf_dtype)
+
+        return cls(
+            feature=compiled.feature.astype(np.uint8),
+            threshold=threshold,
+            children_left=compiled.children_left.astype(child_dtype),
+            children_right=compiled.children_right.astype(child_dtype),
+            missing_go_to_left=compiled.missing_go_to_left,
+            value=value,
+            roots=compiled.roots.astype(child_dtype),
+            max_depth=compiled.max_depth,
+            classes=compiled.classes_,
+            n_features=compiled.n_features_in_,
+            feature_names=getattr(compiled, 'feature_names_in_', None),
+            average=compiled.average,
+            leaf_scale=scale
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados por los arreglos del modelo."""
+        arrays = (self.feature, self.threshold, self.children_left, self.children_right,
+                  self.missing_go_to_left, self.value, self.roots)
+        return sum(array.nbytes for array in arrays)
+
+    def predict_proba(self, X: Any, batch_size: int = 65536) -> np.ndarray:
+        """
+        Calcula las probabilidades por clase.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+            batch_size (int): Filas recorridas a la vez, para acotar la memoria de trabajo
+
+        Returns:
+            np.ndarray: Probabilidades (n_muestras, n_clases)
+        """
+        X = self._prepare_input(X)
+        proba = np.zeros((X.shape[0], len(self.classes_)), dtype=np.float64)
+
+        for start in range(0, X.shape[0], batch_size):
+            leaves = self.apply(X[start:start + batch_size])
+            block = proba[start:start + batch_size]
+            for tree_index in range(self.n_trees):
+                block += self.value[leaves[:, tree_index]]
+
+        divisor = (self.leaf_scale or 1) * (self.n_trees if self.average else 1)
+        if divisor != 1:
+            proba /= divisor
+        return proba
+
+    def check_parity(self, model: Any, X: Any) -> Dict:
+        """
+        Compara el motor compacto con el modelo original sobre unos datos.
+
+        Args:
+            model: Modelo original (RandomForestClassifier, DecisionTreeClassifier o CompiledForest)
+            X: DataFrame o arreglo con las métricas
+
+        Returns:
+            Dict: Si las hojas alcanzadas coinciden, proporción de predicciones iguales
+                y diferencia máxima de probabilidad
+        """
+        reference = CompiledForest.from_model(model)
+        X_ready = self._prepare_input(X)
+        same_leaves = bool(np.array_equal(
+            reference.apply(X_ready).astype(np.int64), self.apply(X_ready).astype(np.int64)
+        ))
+
+        expected = model.predict_proba(X)
+        actual = self.predict_proba(X)
+        expected_labels = reference.classes_.take(np.argmax(expected, axis=1), axis=0)
+        actual_labels = self.classes_.take(np.argmax(actual, axis=1), axis=0)
+        return {
+            'same_leaves': same_leaves,
+            'prediction_agreement': float(np.mean(expected_labels == actual_labels)) if len(actual) else 1.0,
+            'max_probability_diff': float(np.max(np.abs(expected - actual))) if len(actual) else 0.0
+        }
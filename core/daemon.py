@@ -0,0 +1,391 @@
+# core/daemon.py
+
+import os
+import sys
+import json
+import time
+import fcntl
+import socket
+import asyncio
+import hashlib
+import tempfile
+import subprocess
+import numpy as np
+from typing import Any, Dict
+from core.server import InferenceServer
+
+# Segundos sin solicitudes tras los que el demonio se detiene
+DEFAULT_IDLE_TIMEOUT = 600.0
+
+# Filas por solicitud enviada al demonio y tamaño máximo de cada línea JSON que acepta
+REQUEST_ROWS = 4096
+MAX_REQUEST_BYTES = 2 ** 24
+
+RUN_SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts', 'run_server.py')
+
+
+def _file_signature(path: str) -> tuple:
+    """Devuelve (mtime_ns, tamaño) del archivo, o None si no existe."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def default_socket_path(model_path: str, backend: str = 'sklearn') -> str:
+    """
+    Calcula la ruta del socket Unix del demonio de un modelo.
+
+    Cada usuario, modelo y motor de inferencia tiene su propio demonio, así que las
+    invocaciones que usan el mismo modelo lo comparten.
+
+    Args:
+        model_path (str): Ruta al modelo guardado
+        backend (str): Motor de inferencia ('sklearn' o 'compiled')
+
+    Returns:
+        str: Ruta del socket en el directorio temporal
+    """
+    key = hashlib.blake2b(f"{os.path.abspath(model_path)}|{backend}".encode(), digest_size=8).hexdigest()
+    return os.path.join(tempfile.gettempdir(), f"joptimizer-{os.getuid()}-{key}.sock")
+
+
+def send_request(socket_path: str, payload: Dict, timeout: float = 30.0) -> Dict:
+    """
+    Envía una solicitud JSON al demonio y espera su respuesta.
+
+    Args:
+        socket_path (str): Ruta del socket Unix
+        payload (Dict): Solicitud
+        timeout (float): Segundos máximos de espera
+
+    Returns:
+        Dict: Respuesta del demonio
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as stream:
+            line = stream.readline()
+    if not line:
+        raise ConnectionError(f"El demonio cerró la conexión sin responder: {socket_path}")
+    return json.loads(line)
+
+
+class ScoringDaemon(InferenceServer):
+    """
+    Servidor de inferencia en segundo plano que mantiene un modelo cargado para invocaciones repetidas de la CLI.
+
+    Atiende el mismo protocolo que InferenceServer sobre un socket Unix, más
+        {"op": "ping"}        -> pid, modelo, clases y características
+        {"op": "shutdown"}    -> detiene el demonio
+    Se detiene solo tras idle_timeout segundos sin solicitudes y vuelve a cargar el
+    modelo cuando cambian la fecha de modificación o el tamaño del archivo (se
+    comprueba antes de cada solicitud y periódicamente). La carga se hace en un hilo
+    aparte, sin bloquear el event loop, y el modelo se sustituye después en el loop.
+    """
+
+    def __init__(self,
+                 library: Any,
+                 model_path: str,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 check_interval: float = 1.0,
+                 max_request_bytes: int = MAX_REQUEST_BYTES,
+                 **kwargs):
+        """
+        Inicializa el demonio.
+
+        Args:
+            library: Instancia de AILibrary con el modelo de model_path cargado
+            model_path (str): Ruta al modelo guardado (se vigila para recargarlo)
+            idle_timeout (float): Segundos sin solicitudes antes de detenerse (None para no detenerse)
+            check_interval (float): Segundos entre comprobaciones de inactividad y del archivo del modelo
+            max_request_bytes (int): Tamaño máximo de una línea de solicitud
+            **kwargs: Parámetros de InferenceServer (max_batch_size, max_wait_ms, backend)
+        """
+        super().__init__(library, max_request_bytes=max_request_bytes, **kwargs)
+        self.model_path = os.path.abspath(model_path)
+        self.idle_timeout = idle_timeout
+        self.check_interval = check_interval
+        self._model_signature = _file_signature(self.model_path)
+        self._failed_signature = None
+        self._reloading = None
+        self._last_activity = time.monotonic()
+        self._started_at = time.time()
+        self._stopping = None
+        self._watcher = None
+        self._stats.update({'reloads': 0, 'reload_errors': 0})
+
+    async def _maybe_reload(self):
+        """Vuelve a cargar el modelo si el archivo cambió desde la última carga (o espera a la recarga en curso)."""
+        signature = _file_signature(self.model_path)
+        if signature is None or signature in (self._model_signature, self._failed_signature):
+            return
+
+        if self._reloading is None or self._reloading.done():
+            self._reloading = asyncio.create_task(self._reload(signature))
+        # shield: si se cancela la solicitud que espera, la recarga continúa para las demás
+        await asyncio.shield(self._reloading)
+
+    async def _reload(self, signature: tuple):
+        """
+        Carga el modelo en un hilo aparte y, si la carga tiene éxito, lo sustituye en el event loop.
+
+        Args:
+            signature (tuple): Firma (mtime_ns, tamaño) del archivo que se va a cargar
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            library, model = await loop.run_in_executor(None, self._load_model)
+        except Exception as e:
+            # Un archivo a medio escribir falla al cargarse; se reintenta con la siguiente modificación
+            self._failed_signature = signature
+            self._stats['reload_errors'] += 1
+            print(f"Error al recargar {self.model_path}: {str(e)}", flush=True)
+            return
+
+        # Las solicitudes que ya están en cola se evalúan con el modelo nuevo a partir del siguiente lote
+        self.library = library
+        self.model = model
+        self.feature_names = list(model.feature_names_in_)
+        self._model_signature = signature
+        self._stats['reloads'] += 1
+        print(f"Modelo recargado desde: {self.model_path}", flush=True)
+
+    def _load_model(self) -> tuple:
+        """
+        Carga el modelo en una instancia nueva de la librería (se ejecuta fuera del event loop).
+
+        Returns:
+            tuple: (librería con el modelo cargado, modelo del motor de inferencia)
+        """
+        library = type(self.library)(config_path=self.library.config_path)
+        library.load_model(self.model_path)
+        model = library.get_inference_model(self.backend)
+        if not hasattr(model, 'feature_names_in_'):
+            raise ValueError("El modelo no tiene nombres de características (feature_names_in_)")
+        return library, model
+
+    async def _watch_loop(self):
+        """Detiene el demonio tras el tiempo de inactividad y vigila el archivo del modelo."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            if self.idle_timeout is not None and time.monotonic() - self._last_activity > self.idle_timeout:
+                print(f"Sin solicitudes durante {self.idle_timeout:g} s, deteniendo el demonio", flush=True)
+                self._stopping.set()
+                return
+            await self._maybe_reload()
+
+    async def serve_until_idle(self, unix_socket: str):
+        """
+        Atiende solicitudes en el socket Unix hasta el tiempo de inactividad o un 'shutdown'.
+
+        Args:
+            unix_socket (str): Ruta del socket Unix
+        """
+        self._stopping = asyncio.Event()
+        await self.start(unix_socket=unix_socket)
+        self._watcher = asyncio.create_task(self._watch_loop())
+        try:
+            await self._stopping.wait()
+        finally:
+            self._watcher.cancel()
+            await self.stop()
+            if os.path.exists(unix_socket):
+                os.remove(unix_socket)
+
+    def get_stats(self) -> Dict:
+        """
+        Obtiene las métricas del servidor junto con el estado del demonio.
+
+        Returns:
+            Dict: Métricas de InferenceServer, recargas, modelo y segundos de inactividad
+        """
+        stats = super().get_stats()
+        stats.update({
+            'model_path': self.model_path,
+            'idle_s': time.monotonic() - self._last_activity,
+            'uptime_s': time.time() - self._started_at
+        })
+        return stats
+
+    async def _handle_request(self, line: bytes) -> Dict:
+        """
+        Procesa una línea de solicitud, con las operaciones propias del demonio.
+
+        Args:
+            line (bytes): Solicitud JSON
+
+        Returns:
+            Dict: Respuesta JSON
+        """
+        self._last_activity = time.monotonic()
+        await self._maybe_reload()
+
+        try:
+            request = json.loads(line)
+            op = request.get('op') if isinstance(request, dict) else None
+        except ValueError:
+            op = None
+
+        if op == 'ping':
+            response = {
+                'pid': os.getpid(),
+                'model_path': self.model_path,
+                'backend': self.backend,
+                'classes': self.model.classes_.tolist(),
+                'feature_names': self.feature_names
+            }
+        elif op == 'shutdown':
+            self._stopping.set()
+            response = {'stopping': True}
+        else:
+            return await super()._handle_request(line)
+
+        if request.get('id') is not None:
+            response['id'] = request['id']
+        return response
+
+
+class DaemonClient:
+    """
+    Cliente del demonio de evaluación con la interfaz de un modelo (classes_, predict_proba).
+
+    Si no hay un demonio atendiendo el modelo, lanza uno en segundo plano
+    (scripts/run_server.py --idle-timeout) y espera a que responda; las siguientes
+    invocaciones lo reutilizan sin importar scikit-learn ni deserializar el modelo.
+    Se puede pasar a ModelTester.test_model como cualquier modelo.
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 backend: str = 'sklearn',
+                 socket_path: str = None,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 start_timeout: float = 60.0,
+                 request_timeout: float = 60.0):
+        """
+        Inicializa el cliente y se conecta al demonio (lanzándolo si hace falta).
+
+        Args:
+            model_path (str): Ruta al modelo guardado
+            backend (str): Motor de inferencia del demonio ('sklearn' o 'compiled')
+            socket_path (str): Ruta del socket Unix (por defecto, una por modelo y motor)
+            idle_timeout (float): Inactividad tras la que se detiene un demonio lanzado por este cliente
+            start_timeout (float): Segundos máximos de espera a que el demonio arranque
+            request_timeout (float): Segundos máximos de espera por respuesta
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"No se encontró el archivo del modelo: {model_path}")
+
+        self.model_path = os.path.abspath(model_path)
+        self.backend = backend
+        self.socket_path = socket_path or default_socket_path(self.model_path, backend)
+        self.idle_timeout = idle_timeout
+        self.start_timeout = start_timeout
+        self.request_timeout = request_timeout
+        self.spawned = False
+
+        info = self._ping() or self._spawn()
+        if info['model_path'] != self.model_path:
+            raise ValueError(f"El socket {self.socket_path} atiende otro modelo: {info['model_path']}")
+        self.pid = info['pid']
+        self.classes_ = np.asarray(info['classes'])
+        self.feature_names_in_ = np.asarray(info['feature_names'], dtype=object)
+        self.n_features_in_ = len(self.feature_names_in_)
+
+    def _ping(self) -> Dict:
+        """Consulta el demonio; devuelve None si no hay ninguno atendiendo el socket."""
+        try:
+            return send_request(self.socket_path, {'op': 'ping'}, self.request_timeout)
+        except (FileNotFoundError, ConnectionError, socket.timeout, OSError):
+            return None
+
+    def _spawn(self) -> Dict:
+        """Lanza el demonio en segundo plano y espera a que responda."""
+        # El cerrojo evita que dos invocaciones simultáneas lancen dos demonios para el mismo socket
+        with open(f"{self.socket_path}.lock", 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            info = self._ping()
+            if info is not None:
+                return info
+
+            command = [
+                sys.executable, RUN_SERVER_SCRIPT,
+                '--model', self.model_path,
+                '--socket', self.socket_path,
+                '--backend', self.backend,
+                '--idle-timeout', str(self.idle_timeout),
+                # Cada invocación envía sus filas de una vez: no hay nada que esperar para completar lotes
+                '--max-wait-ms', '0'
+            ]
+            with open(f"{self.socket_path}.log", 'ab') as log:
+                process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                                           start_new_session=True)
+            self.spawned = True
+
+            deadline = time.monotonic() + self.start_timeout
+            while time.monotonic() < deadline:
+                if process.poll() is not None:
+                    raise RuntimeError(f"El demonio terminó al arrancar (código {process.returncode}); "
+                                       f"ver {self.socket_path}.log")
+                info = self._ping()
+                if info is not None:
+                    return info
+                time.sleep(0.05)
+
+        raise TimeoutError(f"El demonio no respondió en {self.start_timeout:g} s; ver {self.socket_path}.log")
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Evalúa las filas en el demonio.
+
+        Args:
+            X: DataFrame con las métricas (las columnas que no son características se ignoran)
+
+        Returns:
+            np.ndarray: Probabilidades (n_muestras, n_clases)
+        """
+        records = X[list(self.feature_names_in_)].to_dict('records')
+        if not records:
+            return np.empty((0, len(self.classes_)), dtype=np.float64)
+
+        probabilities = []
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.request_timeout)
+            sock.connect(self.socket_path)
+            with sock.makefile('rwb') as stream:
+                for start in range(0, len(records), REQUEST_ROWS):
+                    stream.write(json.dumps({'rows': records[start:start + REQUEST_ROWS]}).encode('utf-8') + b'\n')
+                    stream.flush()
+                    line = stream.readline()
+                    if not line:
+                        raise ConnectionError(f"El demonio cerró la conexión sin responder: {self.socket_path}")
+                    response = json.loads(line)
+                    if 'error' in response:
+                        raise ValueError(f"Error del demonio: {response['error']}")
+                    probabilities.extend(response['probabilities'])
+
+        return np.asarray(probabilities, dtype=np.float64)
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predice la clase de cada fila en el demonio.
+
+        Args:
+            X: DataFrame con las métricas
+
+        Returns:
+            np.ndarray: Clases predichas
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def stats(self) -> Dict:
+        """Obtiene las métricas del demonio."""
+        return send_request(self.socket_path, {'op': 'stats'}, self.request_timeout)
+
+    def shutdown(self) -> Dict:
+        """Detiene el demonio."""
+        return send_request(self.socket_path, {'op': 'shutdown'}, self.request_timeout)
@@ -0,0 +1,150 @@
+# core/distillation.py
+
+import struct
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+from core.compiled_forest import CompiledForest, TREE_LEAF
+from utils.data_generation import generate_balanced_dataset
+
+
+def build_transfer_set(num_samples: int, mix_fraction: float = 0.5, random_state: int = 42) -> pd.DataFrame:
+    """
+    Genera métricas sintéticas para etiquetar con el modelo maestro.
+
+    Parte de las filas sale tal cual de las distribuciones de
+    utils/data_generation.py; en el resto cada columna se baraja por separado,
+    de modo que también aparecen combinaciones entre los dos grupos (p.ej. muchas
+    líneas con poca complejidad) donde el sustituto debe imitar la frontera del maestro.
+
+    Args:
+        num_samples (int): Número de filas
+        mix_fraction (float): Proporción de filas con columnas barajadas
+        random_state (int): Semilla (el estado global de NumPy se restaura al terminar)
+
+    Returns:
+        pd.DataFrame: Métricas sin la columna 'is_optimal'
+    """
+    # El generador usa el estado global de NumPy
+    previous_state = np.random.get_state()
+    np.random.seed(random_state)
+    try:
+        data = generate_balanced_dataset(num_samples).drop(columns=['is_optimal'])
+    finally:
+        np.random.set_state(previous_state)
+
+    rng = np.random.RandomState(random_state)
+    num_mixed = int(len(data) * mix_fraction)
+    if num_mixed:
+        mixed = rng.choice(len(data), num_mixed, replace=False)
+        for column in data.columns:
+            values = data[column].to_numpy().copy()
+            values[mixed] = values[rng.permutation(mixed)]
+            data[column] = values
+    return data
+
+
+class FastPathTree:
+    """
+    Evaluador en Python puro de un único árbol de decisión, para la ruta de una sola fila.
+
+    Un predict_proba de scikit-learn cuesta cientos de microsegundos por llamada solo en
+    validación; aquí la fila (un diccionario de métricas) se redondea a float32 como en
+    scikit-learn y el árbol se recorre sobre listas, con las mismas probabilidades.
+    """
+
+    def __init__(self,
+                 feature: List[int],
+                 threshold: List[float],
+                 children_left: List[int],
+                 children_right: List[int],
+                 value: List[Tuple[float, ...]],
+                 classes: np.ndarray,
+                 feature_names: List[str]):
+        """
+        Inicializa el evaluador a partir de los nodos ya extraídos.
+
+        Args:
+            feature: Índice de característica por nodo (-1 en las hojas)
+            threshold: Umbral por nodo
+            children_left: Hijo izquierdo por nodo
+            children_right: Hijo derecho por nodo
+            value: Probabilidades por clase en cada nodo
+            classes: Etiquetas de clase del modelo original
+            feature_names: Nombres de las características, en el orden del modelo
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children_left = children_left
+        self.children_right = children_right
+        self.value = value
+        self.classes_ = np.asarray(classes)
+        self.feature_names_in_ = np.asarray(feature_names, dtype=object)
+        self.n_features_in_ = len(feature_names)
+        self._names = list(feature_names)
+        self._labels = self.classes_.tolist()
+        self._float32 = struct.Struct(f'{len(feature_names)}f')
+
+    @classmethod
+    def from_model(cls, model: Any) -> 'FastPathTree':
+        """
+        Extrae los nodos de un DecisionTreeClassifier entrenado.
+
+        Args:
+            model: DecisionTreeClassifier con feature_names_in_
+
+        Returns:
+            FastPathTree: Evaluador de una fila
+        """
+        if not hasattr(model, 'tree_'):
+            raise TypeError(f"Modelo no soportado para la ruta rápida: {type(model).__name__}")
+        if not hasattr(model, 'feature_names_in_'):
+            raise ValueError("El modelo no tiene nombres de características (feature_names_in_)")
+
+        # CompiledForest ya normaliza los valores de hoja como predict_proba
+        compiled = CompiledForest.from_model(model)
+        tree = model.tree_
+        is_leaf = tree.children_left == TREE_LEAF
+        return cls(
+            feature=np.where(is_leaf, -1, tree.feature).tolist(),
+            threshold=tree.threshold.tolist(),
+            children_left=tree.children_left.tolist(),
+            children_right=tree.children_right.tolist(),
+            value=[tuple(row) for row in compiled.value.tolist()],
+            classes=model.classes_,
+            feature_names=list(model.feature_names_in_)
+        )
+
+    def predict_one(self, metrics: Dict[str, float]) -> Tuple[Any, Tuple[float, ...]]:
+        """
+        Evalúa una sola clase.
+
+        Args:
+            metrics (Dict[str, float]): Métricas de la clase por nombre
+
+        Returns:
+            Tuple: (clase predicha, probabilidades por clase)
+        """
+        row = self._float32.unpack(self._float32.pack(*[metrics[name] for name in self._names]))
+        feature, threshold = self.feature, self.threshold
+        left, right = self.children_left, self.children_right
+
+        node = 0
+        while feature[node] >= 0:
+            node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+
+        probabilities = self.value[node]
+        return self._labels[probabilities.index(max(probabilities))], probabilities
+
+    def predict_proba(self, X: pd.DataFrame) -> np.ndarray:
+        """
+        Calcula las probabilidades de un lote fila a fila (para comprobaciones; en lotes es mejor el modelo original).
+
+        Args:
+            X (pd.DataFrame): Métricas
+
+        Returns:
+            np.ndarray: Probabilidades (n_muestras, n_clases)
+        """
+        records = X[self._names].to_dict('records')
+        return np.array([self.predict_one(record)[1] for record in records], dtype=np.float64)
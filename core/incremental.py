@@ -0,0 +1,154 @@
+# core/incremental.py
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Tuple
+from core.prediction_cache import PredictionCache
+from utils.dataset_io import is_columnar, read_columnar, write_columnar
+
+# Columnas que identifican una clase entre ejecuciones (salida de extract_metrics.py)
+DEFAULT_KEY_COLUMNS = ['file_path', 'class_name']
+
+
+class IncrementalAnalyzer:
+    """
+    Análisis incremental: solo se evalúan las clases nuevas o cuyas métricas cambiaron.
+
+    El estado de la ejecución anterior se guarda en formato columnar (un directorio .cols)
+    con, por clase, su clave, la huella de 128 bits de sus métricas (calculada con la
+    huella del modelo, de modo que cambiar de modelo invalida todo el estado) y sus
+    probabilidades. Cada ejecución compara la entrada con ese estado, evalúa solo las
+    diferencias y reconstruye el resultado completo.
+    """
+
+    def __init__(self, library: Any, state_path: str, key_columns: List[str] = None):
+        """
+        Inicializa el analizador.
+
+        Args:
+            library: Instancia de AILibrary con un modelo cargado
+            state_path (str): Directorio .cols donde se guarda el estado entre ejecuciones
+            key_columns (List[str]): Columnas que identifican cada clase (por defecto
+                file_path y class_name si existen; si no, la posición de la fila)
+        """
+        self.library = library
+        self.state_path = str(state_path)
+        self.key_columns = key_columns
+
+    def _row_keys(self, data: pd.DataFrame) -> pd.Index:
+        """
+        Calcula la clave de cada clase.
+
+        Args:
+            data: DataFrame de entrada
+
+        Returns:
+            pd.Index: Claves únicas (las repetidas se numeran por orden de aparición)
+        """
+        columns = self.key_columns
+        if columns is None:
+            columns = [column for column in DEFAULT_KEY_COLUMNS if column in data.columns]
+
+        if columns:
+            missing = [column for column in columns if column not in data.columns]
+            if missing:
+                raise ValueError(f"Faltan las columnas de clave: {missing}")
+            keys = data[columns[0]].astype(str)
+            for column in columns[1:]:
+                keys = keys + '::' + data[column].astype(str)
+        else:
+            keys = pd.Series(np.arange(len(data)).astype(str), index=data.index)
+
+        occurrence = keys.groupby(keys, sort=False).cumcount()
+        if occurrence.any():
+            keys = keys.where(occurrence == 0, keys + '#' + occurrence.astype(str))
+        return pd.Index(keys.to_numpy())
+
+    def load_state(self) -> pd.DataFrame:
+        """
+        Carga el estado de la ejecución anterior.
+
+        Returns:
+            pd.DataFrame: Estado indexado por clave (None si no existe)
+        """
+        if not is_columnar(self.state_path):
+            return None
+        state = read_columnar(self.state_path, mmap=False)
+        return state.set_index('key')
+
+    def _save_state(self, keys: pd.Index, high: np.ndarray, low: np.ndarray, probabilities: np.ndarray):
+        """Reemplaza el estado guardado por el de la ejecución actual."""
+        state = pd.DataFrame({'key': keys.to_numpy(dtype=str), 'hash_high': high, 'hash_low': low})
+        for column in range(probabilities.shape[1]):
+            state[f'proba_{column}'] = probabilities[:, column]
+
+        tmp_path = f"{self.state_path}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        write_columnar(state, tmp_path)
+        if os.path.exists(self.state_path):
+            shutil.rmtree(self.state_path)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, data: pd.DataFrame, backend: str = 'sklearn', workers: int = None) -> Tuple[Dict, Dict]:
+        """
+        Analiza los datos evaluando solo las clases nuevas o modificadas.
+
+        Args:
+            data: DataFrame con métricas (y, opcionalmente, columnas de clave)
+            backend (str): Motor de inferencia ('sklearn' o 'compiled')
+            workers (int): Número de procesos para evaluar las filas cambiadas (opcional)
+
+        Returns:
+            Tuple[Dict, Dict]: Resultados completos (con 'changed' y 'diff') y análisis de todas las clases
+        """
+        library = self.library
+        model = library.get_inference_model(backend, workers)
+        features = data[library._feature_columns(model, data)]
+
+        keys = self._row_keys(data)
+        high, low = PredictionCache.row_hashes(features, library.get_model_fingerprint())
+        num_classes = len(model.classes_)
+
+        # Clases cuya clave y huella coinciden con la ejecución anterior
+        state = self.load_state()
+        unchanged = np.zeros(len(data), dtype=bool)
+        known = np.zeros(len(data), dtype=bool)
+        removed = 0
+        probabilities = np.empty((len(data), num_classes), dtype=np.float64)
+        if state is not None and len(state.columns) == 2 + num_classes:
+            positions = state.index.get_indexer(keys)
+            known = positions >= 0
+            previous = positions[known]
+            unchanged[known] = (
+                (state['hash_high'].to_numpy()[previous] == high[known])
+                & (state['hash_low'].to_numpy()[previous] == low[known])
+            )
+            stored = state[[f'proba_{column}' for column in range(num_classes)]].to_numpy()
+            probabilities[unchanged] = stored[positions[unchanged]]
+            removed = len(state) - int(known.sum())
+
+        # Solo las clases nuevas o modificadas pasan por el modelo
+        changed = np.flatnonzero(~unchanged)
+        if len(changed):
+            probabilities[changed] = library._score(model, features.iloc[changed])['probabilities']
+
+        self._save_state(keys, high, low, probabilities)
+
+        predictions = model.classes_.take(np.argmax(probabilities, axis=1), axis=0)
+        results = {
+            'predictions': predictions,
+            'probabilities': probabilities,
+            'num_samples': len(data),
+            'changed': changed,
+            'diff': {
+                'new': int((~known).sum()),
+                'changed': int((known & ~unchanged).sum()),
+                'unchanged': int(unchanged.sum()),
+                'removed': removed
+            }
+        }
+        analysis = library.tester.analyze_predictions(features, predictions, probabilities, full_results=False)
+
+        return results, analysis
@@ -0,0 +1,245 @@
+# core/instrumentation.py
+
+import io
+import json
+import time
+import bisect
+import cProfile
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, List
+
+# Límites superiores (en segundos) de los buckets del histograma de latencias
+LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Contexto vacío compartido: es lo único que se crea por tramo cuando la instrumentación está desactivada
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    """Tramo cronometrado; al salir registra su duración en el recolector."""
+
+    __slots__ = ('recorder', 'name', 'start')
+
+    def __init__(self, recorder: 'TimingRecorder', name: str):
+        self.recorder = recorder
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.recorder.record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class TimingRecorder:
+    """
+    Recolector de tiempos por etapa de las rutas críticas (entrenamiento, inferencia, análisis, sugerencias y E/S de modelos).
+
+    Desactivado, span() devuelve un contexto vacío compartido y el coste es una
+    comprobación de atributo. Activado, agrega por etapa el número de llamadas, la
+    suma, el mínimo, el máximo y un histograma de latencias, y avisa a los oyentes
+    registrados con cada tramo terminado.
+    """
+
+    def __init__(self, enabled: bool = False):
+        """
+        Inicializa el recolector.
+
+        Args:
+            enabled (bool): Si los tramos se miden desde el principio
+        """
+        self.enabled = enabled
+        self.last_capture = None
+        self._stages = {}
+        self._listeners = []
+        self._lock = threading.Lock()
+
+    def enable(self, listener: Callable[[str, float], None] = None):
+        """
+        Activa la medición de tramos.
+
+        Args:
+            listener: Función llamada con (etapa, segundos) al terminar cada tramo (opcional)
+        """
+        if listener is not None:
+            self._listeners.append(listener)
+        self.enabled = True
+
+    def disable(self):
+        """Desactiva la medición y elimina los oyentes (las estadísticas se conservan)."""
+        self.enabled = False
+        self._listeners = []
+
+    def reset(self):
+        """Descarta las estadísticas acumuladas."""
+        with self._lock:
+            self._stages = {}
+
+    def span(self, name: str):
+        """
+        Crea un tramo cronometrado para usar con 'with'.
+
+        Args:
+            name (str): Nombre de la etapa (p.ej. 'analyze.score')
+
+        Returns:
+            Contexto que mide la duración del bloque
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float):
+        """
+        Registra la duración de un tramo.
+
+        Args:
+            name (str): Nombre de la etapa
+            seconds (float): Duración en segundos
+        """
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = self._stages[name] = {
+                    'count': 0,
+                    'total': 0.0,
+                    'min': seconds,
+                    'max': seconds,
+                    'buckets': [0] * (len(LATENCY_BUCKETS) + 1)
+                }
+            stage['count'] += 1
+            stage['total'] += seconds
+            stage['min'] = min(stage['min'], seconds)
+            stage['max'] = max(stage['max'], seconds)
+            stage['buckets'][bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+        for listener in self._listeners:
+            listener(name, seconds)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        Obtiene las estadísticas agregadas por etapa.
+
+        Returns:
+            Dict[str, Dict]: Por etapa, llamadas, tiempos (s) e histograma de latencias
+        """
+        labels = [f"<={limit}" for limit in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}"]
+        with self._lock:
+            return {
+                name: {
+                    'count': stage['count'],
+                    'total_s': stage['total'],
+                    'mean_s': stage['total'] / stage['count'],
+                    'min_s': stage['min'],
+                    'max_s': stage['max'],
+                    'histogram': dict(zip(labels, stage['buckets']))
+                }
+                for name, stage in sorted(self._stages.items())
+            }
+
+    def dump_json(self, path: str):
+        """
+        Guarda las estadísticas en un archivo JSON.
+
+        Args:
+            path (str): Ruta del archivo
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.get_stats(), f, indent=2)
+
+    def to_prometheus(self, metric: str = 'joptimizer_stage_seconds') -> str:
+        """
+        Exporta las estadísticas en el formato de texto de Prometheus.
+
+        Args:
+            metric (str): Nombre del histograma
+
+        Returns:
+            str: Histograma por etapa (buckets acumulados, suma y cuenta)
+        """
+        lines = [
+            f"# HELP {metric} Duración de las etapas de JOptimizer-AI en segundos",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            stages = sorted((name, dict(stage, buckets=list(stage['buckets']))) for name, stage in self._stages.items())
+        for name, stage in stages:
+            cumulative = 0
+            for limit, count in zip(list(LATENCY_BUCKETS) + ['+Inf'], stage['buckets']):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{stage="{name}",le="{limit}"}} {cumulative}')
+            lines.append(f'{metric}_sum{{stage="{name}"}} {stage["total"]}')
+            lines.append(f'{metric}_count{{stage="{name}"}} {stage["count"]}')
+        return "\n".join(lines) + "\n"
+
+    @contextmanager
+    def capture(self, mode: str = 'cprofile', limit: int = 20):
+        """
+        Perfila un bloque concreto con cProfile o tracemalloc (para investigaciones puntuales).
+
+        El informe en texto queda en last_capture al salir del bloque.
+
+        Args:
+            mode (str): 'cprofile' (tiempo por función) o 'tracemalloc' (memoria por línea)
+            limit (int): Número de entradas del informe
+        """
+        if mode == 'cprofile':
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield self
+            finally:
+                profiler.disable()
+                output = io.StringIO()
+                pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(limit)
+                self.last_capture = output.getvalue()
+
+        elif mode == 'tracemalloc':
+            already_tracing = tracemalloc.is_tracing()
+            if not already_tracing:
+                tracemalloc.start()
+            try:
+                yield self
+            finally:
+                snapshot = tracemalloc.take_snapshot()
+                _, peak = tracemalloc.get_traced_memory()
+                if not already_tracing:
+                    tracemalloc.stop()
+                top: List = snapshot.statistics('lineno')[:limit]
+                report = [f"Pico de memoria: {peak / 2**20:.1f} MB"] + [str(stat) for stat in top]
+                self.last_capture = "\n".join(report)
+
+        else:
+            raise ValueError(f"Modo de captura no soportado: {mode}. Usa 'cprofile' o 'tracemalloc'")
+
+
+# Recolector compartido por AILibrary, ModelTester, ModelHandler y la lectura de datos
+timings = TimingRecorder()
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorador que mide cada llamada a la función como un tramo del recolector compartido.
+
+    Args:
+        name (str): Nombre de la etapa
+
+    Returns:
+        Callable: Decorador
+    """
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not timings.enabled:
+                return function(*args, **kwargs)
+            with _Span(timings, name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
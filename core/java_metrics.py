@@ -0,0 +1,671 @@
+# core/java_metrics.py
+
+import os
+import re
+import json
+import hashlib
+import sqlite3
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Tuple
+from core.metrics_schema import FEATURE_COLUMNS, downcast_metrics
+
+# Versión de las reglas de extracción: al cambiarla se invalidan los resultados en caché
+EXTRACTOR_VERSION = 2
+
+# Tipos de clase reconocidos por el sufijo del nombre (los mismos que simula generate_production_data.py)
+CLASS_TYPES = ('Controller', 'Service', 'Repository', 'Model', 'Util')
+
+# Columnas descriptivas que acompañan a las métricas en la salida del extractor
+SOURCE_COLUMNS = ['class_name', 'class_type', 'file_path']
+
+# Paquetes del JDK: sus imports no cuentan como dependencias externas
+JDK_PACKAGES = ('java.', 'javax.', 'jdk.')
+
+# Tipos de java.lang que no cuentan para el acoplamiento
+JAVA_LANG_TYPES = frozenset({
+    'Object', 'String', 'StringBuilder', 'StringBuffer', 'Integer', 'Long', 'Short', 'Byte',
+    'Double', 'Float', 'Boolean', 'Character', 'Number', 'Math', 'System', 'Void', 'Class',
+    'Enum', 'Record', 'Iterable', 'Comparable', 'Runnable', 'Thread', 'Override', 'Deprecated',
+    'Exception', 'RuntimeException', 'Error', 'Throwable', 'SuppressWarnings', 'FunctionalInterface'
+})
+
+_TYPE_KEYWORDS = frozenset({'class', 'interface', 'enum', 'record'})
+_DECISION_TOKENS = frozenset({'if', 'for', 'while', 'case', 'catch', '&&', '||'})
+_BRANCH_TOKENS = frozenset({'if', 'else', 'case', 'for', 'while', 'catch'})
+_BRACES = frozenset({'{', '}'})
+
+_TOKEN_RE = re.compile(r'''
+    (?P<space>\s+)
+  | (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<literal>"""(?:.|\n)*?"""|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<ident>[A-Za-z_$][A-Za-z0-9_$]*)
+  | (?P<number>\.?\d(?:[eEpP][+-]|[\w.])*)
+  | (?P<op>&&|\|\||->|::|\S)
+''', re.S | re.X)
+
+
+def tokenize(source: str) -> Tuple[List[str], List[int]]:
+    """
+    Divide código Java en tokens, descartando comentarios y espacios.
+
+    Args:
+        source (str): Código fuente
+
+    Returns:
+        Tuple[List[str], List[int]]: Tokens (los literales se sustituyen por '""') y línea de cada uno
+    """
+    tokens, lines = [], []
+    line = 1
+    for match in _TOKEN_RE.finditer(source):
+        kind = match.lastgroup
+        text = match.group()
+        if kind != 'space' and kind != 'comment':
+            tokens.append('""' if kind == 'literal' else text)
+            lines.append(line)
+        if kind != 'ident' and kind != 'op' and '\n' in text:
+            line += text.count('\n')
+    return tokens, lines
+
+
+def _match_pairs(tokens: List[str]) -> Dict[int, int]:
+    """Empareja cada '{' y '(' con su cierre (los desbalanceados se cierran al final del archivo)."""
+    pairs, stacks = {}, {'{': [], '(': []}
+    closing = {'}': '{', ')': '('}
+    for position, token in enumerate(tokens):
+        if token in stacks:
+            stacks[token].append(position)
+        elif token in closing and stacks[closing[token]]:
+            pairs[stacks[closing[token]].pop()] = position
+    for stack in stacks.values():
+        for position in stack:
+            pairs[position] = len(tokens) - 1
+    return pairs
+
+
+def _is_type_declaration(tokens: List[str], position: int) -> bool:
+    """Indica si el token en la posición abre una declaración de tipo (y no, p.ej., 'Foo.class')."""
+    token = tokens[position]
+    if token not in _TYPE_KEYWORDS or (position > 0 and tokens[position - 1] in ('.', '::')):
+        return False
+    if position + 1 >= len(tokens) or not tokens[position + 1][:1].isidentifier():
+        return False
+    # 'record' es una palabra clave contextual: record Nombre( o record Nombre<
+    if token == 'record':
+        return position + 2 < len(tokens) and tokens[position + 2] in ('(', '<')
+    return True
+
+
+def _type_body(tokens: List[str], pairs: Dict[int, int], keyword: int) -> Tuple[int, int]:
+    """Devuelve las posiciones de las llaves que abren y cierran el cuerpo de una declaración de tipo."""
+    open_brace = keyword + 2
+    while open_brace < len(tokens) and tokens[open_brace] != '{':
+        open_brace = pairs[open_brace] + 1 if tokens[open_brace] == '(' else open_brace + 1
+    if open_brace >= len(tokens):
+        open_brace = len(tokens) - 1
+    return open_brace, pairs.get(open_brace, len(tokens) - 1)
+
+
+def _skip_annotations(tokens: List[str], start: int, end: int, pairs: Dict[int, int]) -> int:
+    """Salta las anotaciones al inicio de un miembro y devuelve la posición siguiente."""
+    position = start
+    while position < end and tokens[position] == '@' and position + 1 < end and tokens[position + 1] != 'interface':
+        position += 2
+        while position + 1 < end and tokens[position] == '.':
+            position += 2
+        if position < end and tokens[position] == '(':
+            position = pairs[position] + 1
+    return position
+
+
+def _split_members(tokens: List[str], start: int, end: int, pairs: Dict[int, int]) -> List[Tuple[int, int, int]]:
+    """
+    Divide el cuerpo de un tipo en declaraciones de miembros.
+
+    Returns:
+        List[Tuple[int, int, int]]: (inicio, fin, posición del bloque '{' del miembro o -1)
+    """
+    members = []
+    position = start
+    while position < end:
+        member_start, block, assigned = position, -1, False
+        while position < end:
+            token = tokens[position]
+            if token == '(':
+                position = pairs[position] + 1
+                continue
+            if token == '=':
+                assigned = True
+            elif token == ';':
+                position += 1
+                break
+            elif token == '{':
+                close = pairs[position]
+                if not assigned:
+                    # Cuerpo de método, bloque inicializador o tipo anidado
+                    block = position
+                    position = close + 1
+                    break
+                # Inicializador de arreglo, lambda o clase anónima dentro de una asignación
+                position = close + 1
+                continue
+            position += 1
+        if position > member_start:
+            members.append((member_start, position, block))
+    return members
+
+
+def _field_names(tokens: List[str], start: int, end: int, pairs: Dict[int, int]) -> List[str]:
+    """Extrae los nombres declarados en una declaración de atributos (int a, b = 1;)."""
+    names = []
+    position, angle, in_initializer = start, 0, False
+    while position < end:
+        token = tokens[position]
+        if token in ('(', '{'):
+            position = pairs[position] + 1
+            continue
+        if in_initializer:
+            if token == ',':
+                in_initializer = False
+        elif token == '<':
+            angle += 1
+        elif token == '>':
+            angle -= 1
+        elif angle == 0 and token in ('=', ',', ';') and position > start and tokens[position - 1][:1].isidentifier():
+            names.append(tokens[position - 1])
+            in_initializer = token == '='
+        position += 1
+    if position == end and not in_initializer and tokens[end - 1][:1].isidentifier():
+        names.append(tokens[end - 1])
+    return names
+
+
+def _count_decisions(tokens: List[str], start: int, end: int) -> int:
+    """Cuenta los puntos de decisión de McCabe en un rango de tokens."""
+    count = 0
+    for position in range(start, end):
+        token = tokens[position]
+        if token in _DECISION_TOKENS or (token == '?' and tokens[position - 1] not in ('<', ',')):
+            count += 1
+    return count
+
+
+def _parse_type(tokens: List[str], lines: List[int], pairs: Dict[int, int], keyword: int) -> Dict:
+    """
+    Calcula las métricas propias de una declaración de tipo.
+
+    Args:
+        tokens: Tokens del archivo
+        lines: Línea de cada token
+        pairs: Emparejamiento de llaves y paréntesis
+        keyword: Posición de la palabra clave class/interface/enum/record
+
+    Returns:
+        Dict: Nombre, superclase y métricas sin resolver (profundidad y dependencias se resuelven después)
+    """
+    name = tokens[keyword + 1]
+    open_brace, close_brace = _type_body(tokens, pairs, keyword)
+    header = range(keyword, open_brace)
+
+    superclass, angle = None, 0
+    for position in header:
+        # Los 'extends' de los parámetros de tipo (<T extends X>) no indican herencia
+        angle += (tokens[position] == '<') - (tokens[position] == '>')
+        if angle == 0 and tokens[position] == 'extends' and position + 1 < open_brace:
+            # Nombre de la superclase tal como se escribe (cualificado o no, sin genéricos)
+            position += 1
+            parts = [tokens[position]]
+            while position + 2 < open_brace and tokens[position + 1] == '.':
+                position += 2
+                parts.append(tokens[position])
+            superclass = '.'.join(parts)
+            break
+
+    body_start = open_brace + 1
+    if tokens[keyword] == 'enum':
+        # Las constantes del enum llegan hasta el primer ';' del cuerpo
+        position = body_start
+        while position < close_brace and tokens[position] != ';':
+            position = pairs[position] + 1 if tokens[position] in ('(', '{') else position + 1
+        body_start = min(position + 1, close_brace)
+
+    own_ranges = [header, range(open_brace, body_start)]
+    nested_lines = 0
+    methods, fields = [], []
+    for start, end, block in _split_members(tokens, body_start, close_brace, pairs):
+        header_start = _skip_annotations(tokens, start, end, pairs)
+        header_end = block if block >= 0 else end
+        member_header = tokens[header_start:header_end]
+
+        if any(_is_type_declaration(tokens, position) for position in range(header_start, header_end)):
+            # Los tipos anidados se analizan por separado
+            nested_lines += lines[end - 1] - lines[start] + 1
+            continue
+
+        own_ranges.append(range(start, end))
+        paren = member_header.index('(') if '(' in member_header else -1
+        if paren > 0 and member_header[paren - 1][:1].isidentifier() and '=' not in member_header[:paren]:
+            methods.append((header_start, end, block))
+        elif block >= 0:
+            # Constructor compacto de un record (los bloques inicializadores no son métodos)
+            if member_header and member_header[-1] == name:
+                methods.append((header_start, end, block))
+        elif member_header:
+            fields.extend(_field_names(tokens, header_start, header_end, pairs))
+    own_ranges.append(range(close_brace, close_brace + 1))
+
+    # Líneas
+    lines_of_code = max(lines[close_brace] - lines[keyword] + 1 - nested_lines, 1)
+    effective_lines = len({
+        lines[position] for own in own_ranges for position in own if tokens[position] not in _BRACES
+    })
+
+    # Complejidad y ramas
+    complexities = [1 + _count_decisions(tokens, start, end) for start, end, _ in methods]
+    if complexities:
+        cyclomatic_complexity = max(complexities)
+    else:
+        cyclomatic_complexity = 1 + sum(_count_decisions(tokens, own.start, own.stop) for own in own_ranges)
+    number_of_branches = sum(
+        1 for own in own_ranges for position in own
+        if tokens[position] in _BRANCH_TOKENS or (tokens[position] == '?' and tokens[position - 1] not in ('<', ','))
+    )
+
+    # Acoplamiento: tipos distintos referenciados por la propia clase
+    referenced = set()
+    for own in own_ranges:
+        for position in own:
+            token = tokens[position]
+            if (len(token) > 1 and token[0].isupper() and not token.isupper()
+                    and tokens[position - 1] != '@' and token.isidentifier()):
+                referenced.add(token)
+    referenced -= JAVA_LANG_TYPES | {name}
+
+    # Falta de cohesión (LCOM de Henderson-Sellers) entre métodos con cuerpo y atributos
+    field_set = set(fields)
+    accesses = []
+    for _, end, block in methods:
+        if block < 0:
+            continue
+        used = set()
+        for position in range(block, end):
+            token = tokens[position]
+            if token in field_set and (tokens[position - 1] != '.' or tokens[position - 2] == 'this'):
+                used.add(token)
+        accesses.append(len(used))
+    if len(accesses) > 1 and field_set:
+        mean_access = sum(accesses) / len(field_set)
+        lack_of_cohesion = (len(accesses) - mean_access) / (len(accesses) - 1)
+        lack_of_cohesion = min(max(lack_of_cohesion, 0.0), 1.0)
+    else:
+        lack_of_cohesion = 0.0
+
+    return {
+        'class_name': name,
+        'kind': tokens[keyword],
+        'line': lines[keyword],
+        'superclass': superclass,
+        'lines_of_code': lines_of_code,
+        'effective_lines': min(effective_lines, lines_of_code),
+        'number_of_methods': len(methods),
+        'cyclomatic_complexity': cyclomatic_complexity,
+        'number_of_branches': number_of_branches,
+        'coupling_between_objects': len(referenced),
+        'lack_of_cohesion': lack_of_cohesion
+    }
+
+
+def parse_java_source(source: str) -> Dict:
+    """
+    Analiza un archivo Java y calcula las métricas de cada tipo declarado.
+
+    Args:
+        source (str): Código fuente
+
+    Returns:
+        Dict: 'package', 'imports' y 'classes' (métricas por tipo con su nombre cualificado,
+            sin resolver la profundidad de herencia ni las dependencias externas)
+    """
+    tokens, lines = tokenize(source)
+    pairs = _match_pairs(tokens)
+
+    package, imports = None, []
+    position = 0
+    while position < len(tokens):
+        token = tokens[position]
+        if token in ('package', 'import'):
+            end = position + 1
+            while end < len(tokens) and tokens[end] != ';':
+                end += 1
+            name = ''.join(token for token in tokens[position + 1:end] if token != 'static')
+            if token == 'package':
+                package = name
+            else:
+                imports.append(name)
+            position = end + 1
+        elif token == '@' or token == ';':
+            position += 1
+        else:
+            break
+
+    # Los tipos anidados se cualifican con el tipo que los contiene (paquete.Externa.Anidada)
+    classes, enclosing = [], []
+    for position, token in enumerate(tokens):
+        if token not in _TYPE_KEYWORDS or not _is_type_declaration(tokens, position):
+            continue
+        while enclosing and enclosing[-1][0] < position:
+            enclosing.pop()
+        record = _parse_type(tokens, lines, pairs, position)
+        scope = enclosing[-1][1] if enclosing else package
+        record['qualified_name'] = f"{scope}.{record['class_name']}" if scope else record['class_name']
+        classes.append(record)
+        enclosing.append((_type_body(tokens, pairs, position)[1], record['qualified_name']))
+    return {'package': package, 'imports': imports, 'classes': classes}
+
+
+def class_type_of(class_name: str) -> str:
+    """
+    Deduce el tipo de clase a partir de su nombre.
+
+    Args:
+        class_name (str): Nombre simple de la clase
+
+    Returns:
+        str: Uno de CLASS_TYPES, u 'Other' si el nombre no lo indica
+    """
+    for class_type in CLASS_TYPES:
+        if class_type in class_name:
+            return class_type
+    return 'Other'
+
+
+def _extract_file(path: str, known_digest: str = None) -> Tuple[str, str, Dict]:
+    """
+    Lee, resume y (si su contenido cambió) analiza un archivo; se ejecuta en los procesos trabajadores.
+
+    Args:
+        path (str): Ruta del archivo .java
+        known_digest (str): Huella almacenada en caché para el archivo (opcional)
+
+    Returns:
+        Tuple[str, str, Dict]: (ruta, huella del contenido, resultado o None si no cambió)
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if digest == known_digest:
+        return path, digest, None
+    return path, digest, parse_java_source(content.decode('utf-8', errors='replace'))
+
+
+class SourceMetricsCache:
+    """
+    Caché en SQLite de los resultados por archivo, indexada por ruta y validada por huella de contenido.
+
+    Si el tamaño y la fecha de modificación no cambian, el archivo ni siquiera se lee;
+    si cambian pero el contenido (SHA-256) es el mismo, no se vuelve a analizar.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre (o crea) la caché.
+
+        Args:
+            path (str): Archivo SQLite
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, version INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, digest TEXT NOT NULL, result TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def load(self) -> Dict[str, Tuple[int, int, str, Dict]]:
+        """
+        Carga las entradas válidas para la versión actual del extractor.
+
+        Returns:
+            Dict: ruta -> (mtime_ns, tamaño, huella, resultado)
+        """
+        rows = self._db.execute(
+            "SELECT path, mtime_ns, size, digest, result FROM files WHERE version = ?", (EXTRACTOR_VERSION,)
+        )
+        return {path: (mtime_ns, size, digest, result) for path, mtime_ns, size, digest, result in rows}
+
+    def store(self, entries: List[Tuple[str, int, int, str, Dict]]):
+        """
+        Guarda o actualiza las entradas de un lote de archivos.
+
+        Args:
+            entries: (ruta, mtime_ns, tamaño, huella, resultado) por archivo
+        """
+        self._db.executemany(
+            "INSERT OR REPLACE INTO files (path, version, mtime_ns, size, digest, result) VALUES (?, ?, ?, ?, ?, ?)",
+            ((path, EXTRACTOR_VERSION, mtime_ns, size, digest, json.dumps(result))
+             for path, mtime_ns, size, digest, result in entries)
+        )
+        self._db.commit()
+
+    def prune(self, paths: List[str], roots: List[str]):
+        """
+        Elimina las entradas de archivos que ya no existen bajo los directorios analizados.
+
+        Las entradas de otros árboles de código que comparten la caché se conservan.
+
+        Args:
+            paths (List[str]): Rutas vigentes
+            roots (List[str]): Directorios raíz analizados (las rutas vigentes cuelgan de ellos)
+        """
+        current = set(paths)
+        prefixes = tuple(os.path.join(root, '') for root in roots)
+        stale = [(path,) for (path,) in self._db.execute("SELECT path FROM files")
+                 if path.startswith(prefixes) and path not in current]
+        self._db.executemany("DELETE FROM files WHERE path = ?", stale)
+        self._db.commit()
+
+    def close(self):
+        """Cierra la base de datos."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+class JavaMetricsExtractor:
+    """
+    Extrae las métricas de entrada de los modelos a partir de un árbol de código Java.
+
+    Cada archivo se analiza de forma independiente en un pool de procesos y los
+    resultados se guardan en una caché por huella de contenido, de modo que en
+    ejecuciones sucesivas solo se analizan los archivos modificados. La profundidad
+    de herencia y las dependencias externas se resuelven al final sobre todo el árbol.
+
+    Métricas por clase (tipos anidados como filas propias):
+        lines_of_code: líneas físicas de la declaración (sin los tipos anidados)
+        effective_lines: líneas con código distinto de llaves
+        number_of_methods: métodos y constructores declarados
+        cyclomatic_complexity: complejidad de McCabe del método más complejo
+        inheritance_depth: niveles de 'extends' (resueltos dentro del árbol; una superclase externa cuenta 1)
+        number_of_branches: if, else, case, for, while, catch y operadores ternarios
+        coupling_between_objects: tipos distintos referenciados (sin java.lang)
+        external_dependencies: imports fuera del proyecto y del JDK
+        lack_of_cohesion: LCOM de Henderson-Sellers en [0, 1]
+    """
+
+    def __init__(self, workers: int = None, cache_path: str = None, min_files_per_worker: int = 64):
+        """
+        Inicializa el extractor.
+
+        Args:
+            workers (int): Número de procesos (por defecto, todos los núcleos)
+            cache_path (str): Archivo SQLite de la caché por archivo (opcional)
+            min_files_per_worker (int): Archivos mínimos por proceso; por debajo se analiza en el proceso actual
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.cache_path = cache_path
+        self.min_files_per_worker = min_files_per_worker
+        self.last_run = None
+
+    @staticmethod
+    def find_sources(source_dir: str) -> List[str]:
+        """
+        Busca los archivos .java de un directorio.
+
+        Args:
+            source_dir (str): Directorio raíz
+
+        Returns:
+            List[str]: Rutas ordenadas
+        """
+        if not os.path.isdir(source_dir):
+            raise FileNotFoundError(f"No se encontró el directorio de código: {source_dir}")
+        paths = []
+        for root, dirs, files in os.walk(source_dir):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            paths.extend(os.path.join(root, name) for name in files if name.endswith('.java'))
+        return sorted(paths)
+
+    def extract(self, source_dir: str) -> pd.DataFrame:
+        """
+        Calcula las métricas de todas las clases de un árbol de código.
+
+        Args:
+            source_dir (str): Directorio raíz del código Java
+
+        Returns:
+            pd.DataFrame: Una fila por clase con FEATURE_COLUMNS más 'class_name',
+                'class_type' y 'file_path', en los dtypes compactos del esquema
+        """
+        paths = self.find_sources(source_dir)
+        cache = SourceMetricsCache(self.cache_path) if self.cache_path else None
+        try:
+            cached = cache.load() if cache is not None else {}
+            results, pending, stats = {}, [], {}
+
+            for path in paths:
+                stat = os.stat(path)
+                stats[path] = (stat.st_mtime_ns, stat.st_size)
+                entry = cached.get(path)
+                if entry is not None and entry[:2] == stats[path]:
+                    results[path] = json.loads(entry[3])
+                else:
+                    pending.append(path)
+
+            updates, parsed = [], 0
+            for path, digest, result in self._run(pending, cached):
+                if result is None:
+                    result = json.loads(cached[path][3])
+                else:
+                    parsed += 1
+                results[path] = result
+                updates.append((path, *stats[path], digest, result))
+
+            if cache is not None:
+                cache.store(updates)
+                cache.prune(paths, [source_dir])
+        finally:
+            if cache is not None:
+                cache.close()
+
+        self.last_run = {
+            'files': len(paths),
+            'parsed': parsed,
+            'cached': len(paths) - parsed
+        }
+        return self._build_frame(paths, results)
+
+    def _run(self, pending: List[str], cached: Dict) -> List[Tuple[str, str, Dict]]:
+        """Analiza los archivos pendientes, en paralelo si hay suficientes."""
+        digests = [cached[path][2] if path in cached else None for path in pending]
+        num_workers = min(self.workers, len(pending) // max(self.min_files_per_worker, 1))
+        if num_workers <= 1:
+            return [_extract_file(path, digest) for path, digest in zip(pending, digests)]
+
+        chunksize = max(1, len(pending) // (num_workers * 4))
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            return list(executor.map(_extract_file, pending, digests, chunksize=chunksize))
+
+    @staticmethod
+    def _build_frame(paths: List[str], results: Dict[str, Dict]) -> pd.DataFrame:
+        """Resuelve las métricas que dependen de todo el árbol y construye el DataFrame."""
+        packages = {result['package'] for result in results.values() if result['package']}
+
+        # Las clases se identifican por su nombre cualificado: dos 'Builder' anidados en
+        # clases distintas no comparten superclase ni profundidad
+        declared, by_simple_name = {}, {}
+        for path in paths:
+            result = results[path]
+            for record in result['classes']:
+                declared.setdefault(record['qualified_name'], (record['superclass'], result))
+                by_simple_name.setdefault(record['class_name'], set()).add(record['qualified_name'])
+
+        def resolve(qualified_name: str, written: str, result: Dict) -> str:
+            """Nombre cualificado de la superclase dentro del árbol (None si es externa)."""
+            first = written.split('.', 1)[0]
+            # Tipos que la contienen, su paquete, imports simples y con comodín (como en Java)
+            scope, candidates = qualified_name, []
+            package = result['package'] or ''
+            while '.' in scope and len(scope) > len(package):
+                scope = scope.rsplit('.', 1)[0]
+                candidates.append(f"{scope}.{written}")
+            candidates.append(written)
+            for name in result['imports']:
+                if name.endswith('.*'):
+                    candidates.append(name[:-1] + written)
+                elif name == first or name.endswith('.' + first):
+                    candidates.append(name + written[len(first):])
+            for candidate in candidates:
+                if candidate in declared:
+                    return candidate
+            # Sin paquete ni imports que lo resuelvan: solo si el nombre simple es único en el árbol
+            matches = by_simple_name.get(written.rsplit('.', 1)[-1], ())
+            return next(iter(matches)) if len(matches) == 1 else None
+
+        depths = {}
+
+        def inheritance_depth(qualified_name: str, seen: frozenset = frozenset()) -> int:
+            if qualified_name in depths:
+                return depths[qualified_name]
+            written, result = declared[qualified_name]
+            if written is None or written in ('Object', 'java.lang.Object'):
+                depth = 0
+            else:
+                parent = resolve(qualified_name, written, result)
+                if parent is None or parent in seen or parent == qualified_name:
+                    depth = 1
+                else:
+                    depth = 1 + inheritance_depth(parent, seen | {qualified_name})
+            depths[qualified_name] = depth
+            return depth
+
+        external = {}
+
+        def is_external(name: str) -> bool:
+            # Cada prefijo con puntos del import se busca en el conjunto de paquetes del árbol
+            if name not in external:
+                parts = name.split('.')
+                external[name] = not name.startswith(JDK_PACKAGES) and not any(
+                    '.'.join(parts[:end]) in packages for end in range(1, len(parts) + 1)
+                )
+            return external[name]
+
+        rows = []
+        for path in paths:
+            result = results[path]
+            external_dependencies = sum(1 for name in result['imports'] if is_external(name))
+            for record in result['classes']:
+                depth = 0 if record['superclass'] is None else inheritance_depth(record['qualified_name'])
+                rows.append({
+                    **{column: record[column] for column in FEATURE_COLUMNS if column in record},
+                    'inheritance_depth': depth,
+                    'external_dependencies': external_dependencies,
+                    'class_name': record['class_name'],
+                    'class_type': class_type_of(record['class_name']),
+                    'file_path': path
+                })
+
+        columns = FEATURE_COLUMNS + SOURCE_COLUMNS
+        return downcast_metrics(pd.DataFrame(rows, columns=columns))
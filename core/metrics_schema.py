@@ -0,0 +1,152 @@
+# core/metrics_schema.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+# Esquema de las métricas de entrada, en el orden que usan los modelos, con el dtype
+# compacto de cada una. Los conteos son enteros sin signo (las clases más grandes de
+# los datos del repositorio tienen menos de 1000 líneas); lack_of_cohesion usa float32,
+# la misma precisión con la que evalúan los árboles. El dtype lo fija el esquema y no
+# el rango de cada archivo o bloque, de modo que todos los bloques de un mismo conjunto
+# de datos comparten dtypes (salvo un bloque con una clase de más de 65535 líneas, que
+# usa el dtype de WIDE_DTYPES).
+METRICS_SCHEMA = {
+    'lines_of_code': np.dtype(np.uint16),
+    'effective_lines': np.dtype(np.uint16),
+    'number_of_methods': np.dtype(np.uint16),
+    'cyclomatic_complexity': np.dtype(np.uint16),
+    'inheritance_depth': np.dtype(np.uint8),
+    'number_of_branches': np.dtype(np.uint16),
+    'coupling_between_objects': np.dtype(np.uint16),
+    'external_dependencies': np.dtype(np.uint16),
+    'lack_of_cohesion': np.dtype(np.float32)
+}
+
+# dtype más ancho para los conteos de líneas que no caben en el del esquema (más de 65535 líneas)
+WIDE_DTYPES = {
+    'lines_of_code': np.dtype(np.uint32),
+    'effective_lines': np.dtype(np.uint32)
+}
+
+FEATURE_COLUMNS = list(METRICS_SCHEMA.keys())
+TARGET_COLUMN = 'is_optimal'
+TARGET_DTYPE = np.dtype(np.uint8)
+
+
+def validate_metrics(data: pd.DataFrame, require_target: bool = False):
+    """
+    Verifica que el DataFrame contenga todas las métricas del esquema.
+
+    Args:
+        data (pd.DataFrame): Datos a validar
+        require_target (bool): Si también se exige la columna 'is_optimal'
+
+    Raises:
+        ValueError: Si faltan columnas
+    """
+    missing = [column for column in FEATURE_COLUMNS if column not in data.columns]
+    if require_target and TARGET_COLUMN not in data.columns:
+        missing.append(TARGET_COLUMN)
+    if missing:
+        raise ValueError(f"Faltan las siguientes características en los datos: {missing}")
+
+
+def _check_fits(column: str, values: np.ndarray, dtype: np.dtype):
+    """
+    Comprueba que los valores de una columna de conteo se representen sin pérdida en su dtype.
+
+    Args:
+        column (str): Nombre de la columna
+        values (np.ndarray): Valores de la columna
+        dtype (np.dtype): dtype entero del esquema
+
+    Raises:
+        ValueError: Si hay valores no enteros, no finitos o fuera del rango del dtype
+    """
+    if len(values) == 0 or values.dtype.kind == 'b':
+        return
+    if values.dtype.kind not in 'iuf':
+        raise ValueError(f"La columna '{column}' debe ser numérica (dtype {values.dtype})")
+    if values.dtype.kind == 'f':
+        # Los conteos leídos como float (p.ej. '145.0') solo se aceptan si son enteros exactos
+        if not np.all(np.isfinite(values)) or not np.array_equal(values, np.floor(values)):
+            raise ValueError(f"La columna '{column}' debe contener enteros (hay valores decimales o vacíos)")
+    info = np.iinfo(dtype)
+    low, high = values.min(), values.max()
+    if low < info.min or high > info.max:
+        raise ValueError(f"La columna '{column}' tiene valores fuera del rango de {dtype} "
+                         f"[{info.min}, {info.max}]: mínimo {low}, máximo {high}")
+
+
+def _fitting_dtype(column: str, values: np.ndarray, dtype: np.dtype) -> np.dtype:
+    """
+    Elige el dtype de una columna de conteo: el del esquema o, si no cabe, el de WIDE_DTYPES.
+
+    Args:
+        column (str): Nombre de la columna
+        values (np.ndarray): Valores de la columna
+        dtype (np.dtype): dtype entero del esquema
+
+    Returns:
+        np.dtype: dtype en el que los valores se representan sin pérdida
+
+    Raises:
+        ValueError: Si hay valores no enteros, no finitos o fuera del rango de ambos dtypes
+    """
+    try:
+        _check_fits(column, values, dtype)
+    except ValueError:
+        if column not in WIDE_DTYPES:
+            raise
+        dtype = WIDE_DTYPES[column]
+        _check_fits(column, values, dtype)
+    return dtype
+
+
+def downcast_metrics(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte las métricas del esquema (y 'is_optimal') a sus dtypes compactos.
+
+    Las columnas que ya están en su dtype no se copian; las columnas fuera del
+    esquema se conservan sin cambios. Un conteo de líneas que no cabe en el dtype
+    del esquema usa el de WIDE_DTYPES.
+
+    Args:
+        data (pd.DataFrame): Datos con métricas
+
+    Returns:
+        pd.DataFrame: Datos con los dtypes del esquema
+
+    Raises:
+        ValueError: Si un conteo no es entero o no cabe en el dtype del esquema
+    """
+    dtypes = {}
+    for column, dtype in [*METRICS_SCHEMA.items(), (TARGET_COLUMN, TARGET_DTYPE)]:
+        if column in data.columns and data[column].dtype != dtype:
+            if dtype.kind == 'u':
+                dtype = _fitting_dtype(column, data[column].to_numpy(), dtype)
+            if data[column].dtype != dtype:
+                dtypes[column] = dtype
+
+    if not dtypes:
+        return data
+    return data.astype(dtypes)
+
+
+def memory_footprint(data: pd.DataFrame) -> Dict[str, int]:
+    """
+    Calcula la memoria ocupada por las columnas del esquema.
+
+    Args:
+        data (pd.DataFrame): Datos con métricas
+
+    Returns:
+        Dict[str, int]: Bytes totales y bytes por fila
+    """
+    columns: List[str] = [column for column in FEATURE_COLUMNS + [TARGET_COLUMN] if column in data.columns]
+    total = int(data[columns].memory_usage(index=False, deep=True).sum())
+    return {
+        'total_bytes': total,
+        'bytes_per_row': total / len(data) if len(data) else 0.0
+    }
@@ -1,24 +1,167 @@
+import os
+import io
+import json
+import fcntl
+import pickle
+import hashlib
+import tempfile
 import joblib
+import numpy as np
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Any, Dict
+from core.instrumentation import timed
+
+INDEX_FILENAME = "index.json"
+INDEX_LOCK_FILENAME = ".index.lock"
+OBJECTS_DIRNAME = "objects"
+
+# Tipo de modelo para artefactos antiguos sin 'model_type' en los metadatos
+MODEL_CLASS_TYPES = {
+    'RandomForestClassifier': 'random_forest',
+    'DecisionTreeClassifier': 'decision_tree',
+    'BinnedHistGradientBoosting': 'hist_gradient_boosting'
+}
+
+
+def _to_json_safe(value: Any) -> Any:
+    """
+    Convierte metadatos con tipos de NumPy a valores serializables en JSON.
+
+    Args:
+        value: Valor a convertir
+
+    Returns:
+        Any: Valor equivalente con tipos nativos de Python
+    """
+    if isinstance(value, dict):
+        return {str(key): _to_json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json_safe(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class _CanonicalPickler(pickle.Pickler):
+    """
+    Pickler usado solo para calcular el hash de un modelo.
+
+    Pone a cero los bytes de relleno de los arreglos estructurados (los nodos de los
+    árboles de scikit-learn tienen 7 bytes sin inicializar por nodo), y se usa sin
+    memo, de modo que dos objetos que comparten un arreglo y dos que tienen copias
+    iguales serializan lo mismo. Así un modelo recién entrenado y el mismo modelo
+    cargado de disco tienen el mismo hash.
+    """
+
+    def reducer_override(self, obj):
+        if isinstance(obj, np.ndarray) and obj.dtype.fields:
+            covered = np.zeros(obj.dtype.itemsize, dtype=bool)
+            for field_dtype, offset, *_ in obj.dtype.fields.values():
+                covered[offset:offset + field_dtype.itemsize] = True
+            if not covered.all():
+                raw = np.ascontiguousarray(obj).reshape(-1).view(np.uint8).reshape(-1, obj.dtype.itemsize).copy()
+                raw[:, ~covered] = 0
+                return raw.view(obj.dtype).reshape(obj.shape).__reduce__()
+        return NotImplemented
+
+
+def model_digest(model: Any) -> str:
+    """
+    Calcula el hash SHA-256 del contenido de un modelo, estable entre guardados y cargas.
+
+    Args:
+        model: Modelo a identificar
+
+    Returns:
+        str: Hash hexadecimal
+    """
+    buffer = io.BytesIO()
+    pickler = _CanonicalPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.fast = True
+    try:
+        pickler.dump(model)
+    except (RecursionError, ValueError):
+        # Objetos con referencias circulares: se usa la serialización de joblib tal cual
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
+def read_model_data(filepath: Path, mmap_mode: str = None) -> Dict:
+    """
+    Lee un artefacto guardado por ModelHandler, resolviendo las referencias del almacén por contenido.
+
+    Args:
+        filepath (Path): Ruta al archivo .joblib (artefacto completo o referencia)
+        mmap_mode (str): Modo de memory-mapping de joblib (opcional)
+
+    Returns:
+        Dict: Diccionario con 'model', 'metadata' y 'nbytes' (tamaño en disco del modelo:
+            el del objeto referenciado en el almacén por contenido)
+    """
+    filepath = Path(filepath)
+    model_data = joblib.load(filepath, mmap_mode=mmap_mode)
+
+    if isinstance(model_data, dict) and 'model_ref' in model_data:
+        blob_path = filepath.parent / model_data['model_ref']
+        if not blob_path.exists():
+            raise FileNotFoundError(f"No se encontró el objeto referenciado por {filepath.name}: {blob_path}")
+        model_data = {
+            'model': joblib.load(blob_path, mmap_mode=mmap_mode),
+            'metadata': model_data['metadata'],
+            'nbytes': blob_path.stat().st_size
+        }
+    else:
+        model_data['nbytes'] = filepath.stat().st_size
+
+    return model_data
 
 class ModelHandler:
     """
     Clase para manejar el guardado y carga de modelos de machine learning.
     """
 
-    def __init__(self, models_dir: str = "models"):
+    def __init__(self,
+                 models_dir: str = "models",
+                 cache_size: int = 0,
+                 cache_bytes: int = None,
+                 verbose: bool = True,
+                 content_addressed: bool = False):
         """
         Inicializa el ModelHandler.
 
         Args:
             models_dir (str): Directorio donde se guardarán/cargarán los modelos
+            cache_size (int): Número máximo de modelos en la caché LRU (0 la desactiva)
+            cache_bytes (int): Presupuesto máximo de la caché en bytes de modelo en disco (opcional)
+            verbose (bool): Si se muestran la ruta y los metadatos al cargar/guardar
+            content_addressed (bool): Si los modelos se guardan una sola vez bajo su hash
+                (models/objects/) y cada guardado escribe solo una referencia ligera
         """
         self.models_dir = Path(models_dir).resolve()
         self.models_dir.mkdir(parents=True, exist_ok=True)
+        self.objects_dir = self.models_dir / OBJECTS_DIRNAME
+        self.content_addressed = content_addressed
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self.verbose = verbose
+        self._cache = OrderedDict()
+        self._cache_hits = 0
+        self._cache_misses = 0
 
-    def save_model(self, model: Any, model_name: str, metadata: Dict = None) -> str:
+    @timed('model_handler.save')
+    def save_model(self,
+                   model: Any,
+                   model_name: str,
+                   metadata: Dict = None,
+                   compress: int = 0) -> str:
         """
         Guarda un modelo entrenado junto con sus metadatos.
 
@@ -26,6 +169,12 @@ class ModelHandler:
             model: Modelo de machine learning entrenado
             model_name (str): Nombre base para el modelo
             metadata (Dict): Información adicional sobre el modelo (opcional)
+            compress (int): Nivel de compresión de joblib (0-9). Con 0, los artefactos
+                compilados o compactos se pueden cargar con load_model(..., mmap_mode='r')
+
+        En modo content_addressed, el modelo se serializa en memoria y solo se escribe
+        en models/objects/<sha256>.joblib si ese contenido no existía; el archivo con
+        nombre y timestamp es una referencia que guarda el hash y los metadatos.
 
         Returns:
             str: Ruta donde se guardó el modelo
@@ -43,59 +192,408 @@ class ModelHandler:
             'saved_at': str(datetime.now())
         })
 
-        model_data = {
-            'model': model,
-            'metadata': metadata
-        }
+        # El cerrojo cubre el objeto, la referencia y el índice: otro guardado no pierde
+        # entradas y collect_garbage no puede borrar un objeto recién referenciado
+        with self._index_lock():
+            if self.content_addressed:
+                blob_path = self._store_object(model, compress)
+                model_data = {
+                    'model_ref': os.path.relpath(blob_path, filepath.parent),
+                    'model_class': type(model).__name__,
+                    'metadata': metadata
+                }
+            else:
+                model_data = {
+                    'model': model,
+                    'metadata': metadata
+                }
+
+            joblib.dump(model_data, filepath)
+            if self.verbose:
+                print(f"Modelo guardado en: {filepath}")
+
+            index = self._read_index()
+            index[self._index_key(filepath)] = self._index_entry(filepath, model, metadata, model_data.get('model_ref'))
+            self._write_index(index)
 
-        joblib.dump(model_data, filepath)
-        print(f"Modelo guardado en: {filepath}")
         return str(filepath)
 
-    def load_model(self, filepath: str) -> tuple:
+    def export_compact(self,
+                       model: Any,
+                       model_name: str,
+                       metadata: Dict = None,
+                       leaf_dtype: str = 'uint16',
+                       parity_data: Any = None) -> str:
+        """
+        Guarda un modelo en formato compacto (CompactForest: solo los arreglos que usa la inferencia).
+
+        El artefacto se guarda y se carga como cualquier otro (load_model devuelve el
+        CompactForest, que se evalúa con predict_proba igual que el modelo original).
+
+        Args:
+            model: RandomForestClassifier o DecisionTreeClassifier entrenado
+            model_name (str): Nombre base para el modelo
+            metadata (Dict): Metadatos del modelo original (opcional)
+            leaf_dtype (str): Representación de las hojas ('uint8', 'uint16' o 'float32')
+            parity_data: Métricas con las que comprobar la paridad con el modelo original (opcional)
+
+        Returns:
+            str: Ruta donde se guardó el modelo
+        """
+        # Importación diferida: listar y cargar modelos no necesita pandas
+        from core.compiled_forest import CompactForest
+        compact = CompactForest.from_model(model, leaf_dtype=leaf_dtype)
+
+        metadata = dict(metadata or {})
+        metadata['compact'] = {'leaf_dtype': leaf_dtype, 'nbytes': compact.nbytes}
+        if parity_data is not None:
+            parity = compact.check_parity(model, parity_data)
+            if not parity['same_leaves']:
+                raise ValueError("El modelo compacto no recorre las mismas hojas que el original")
+            metadata['compact']['parity'] = parity
+
+        return self.save_model(compact, model_name, metadata)
+
+    @timed('model_handler.load')
+    def load_model(self, filepath: str, mmap_mode: str = None) -> tuple:
         """
         Carga un modelo guardado junto con sus metadatos.
 
+        Si la caché está activa, el modelo se reutiliza mientras el archivo no cambie
+        (la clave incluye ruta, fecha de modificación y tamaño). Cada acierto devuelve
+        el mismo objeto que la carga original, así que el modelo debe tratarse como de
+        solo lectura: para modificarlo (p.ej. warm start) hay que trabajar sobre una
+        copia (sklearn.base.clone o copy.deepcopy). Los metadatos sí son una copia.
+
         Args:
             filepath (str): Ruta al archivo del modelo
+            mmap_mode (str): Modo de memory-mapping de joblib ('r', 'c'...) para
+                artefactos CompiledForest/CompactForest guardados sin compresión, cuyos
+                arreglos quedan en disco y se comparten entre procesos (opcional)
 
         Returns:
             tuple: (modelo, metadatos)
+
+        Raises:
+            ValueError: Si se pide mmap_mode para un modelo de scikit-learn: Tree copia
+                sus nodos a memoria propia al deserializarse, así que no se puede mapear
         """
         filepath = Path(filepath).resolve()
         if not filepath.exists():
             raise FileNotFoundError(f"No se encontró el archivo del modelo: {filepath}")
 
-        model_data = joblib.load(filepath)
+        stat = filepath.stat()
+        cache_key = (str(filepath), stat.st_mtime_ns, stat.st_size, mmap_mode)
+
+        if self.cache_size > 0 and cache_key in self._cache:
+            self._cache_hits += 1
+            self._cache.move_to_end(cache_key)
+            model, metadata, _ = self._cache[cache_key]
+            return model, dict(metadata)
+
+        model_data = read_model_data(filepath, mmap_mode=mmap_mode)
         model = model_data['model']
         metadata = model_data['metadata']
 
-        print(f"Modelo cargado desde: {filepath}")
-        print("Metadatos:", metadata)
+        if mmap_mode is not None:
+            # Ya importado al deserializar un artefacto compilado
+            from core.compiled_forest import CompiledForest
+            if not isinstance(model, CompiledForest):
+                raise ValueError(
+                    f"mmap_mode solo se aplica a artefactos compilados o compactos, no a {type(model).__name__}; "
+                    "usa export_compact o CompiledForest.save_arrays"
+                )
+
+        if self.verbose:
+            print(f"Modelo cargado desde: {filepath}")
+            print("Metadatos:", metadata)
+
+        if self.cache_size > 0:
+            self._cache_misses += 1
+            self._cache_put(cache_key, model, metadata, model_data['nbytes'])
+
+        return model, dict(metadata)
+
+    def _cache_put(self, cache_key: tuple, model: Any, metadata: Dict, size: int):
+        """
+        Inserta un modelo en la caché LRU y desaloja los menos usados si se excede el límite.
+
+        Args:
+            cache_key (tuple): Clave (ruta, mtime, tamaño, mmap_mode)
+            model: Modelo cargado
+            metadata (Dict): Metadatos del modelo
+            size (int): Tamaño del modelo en disco (el del objeto si el artefacto es una referencia)
+        """
+        # Descartar versiones anteriores del mismo archivo
+        for stale_key in [key for key in self._cache if key[0] == cache_key[0]]:
+            del self._cache[stale_key]
+
+        self._cache[cache_key] = (model, metadata, size)
+
+        while len(self._cache) > self.cache_size or (
+                self.cache_bytes is not None
+                and len(self._cache) > 1
+                and sum(entry[2] for entry in self._cache.values()) > self.cache_bytes):
+            self._cache.popitem(last=False)
+
+    def cache_info(self) -> Dict:
+        """
+        Obtiene las estadísticas de la caché de modelos.
+
+        Returns:
+            Dict: Aciertos, fallos, número de modelos y bytes en caché
+        """
+        return {
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'entries': len(self._cache),
+            'bytes': sum(entry[2] for entry in self._cache.values())
+        }
 
-        return model, metadata
+    def clear_cache(self):
+        """Vacía la caché de modelos."""
+        self._cache.clear()
 
-    def list_models(self) -> list:
+    def list_models(self,
+                    model_type: str = None,
+                    min_test_score: float = None,
+                    since: Any = None) -> list:
         """
         Lista todos los modelos guardados en el directorio.
 
+        Los metadatos se leen del índice (models/index.json) sin deserializar los modelos.
+        Los artefactos sin entrada en el índice, o modificados desde que se indexaron,
+        se cargan una única vez para reconstruir su entrada. También se listan los
+        modelos que este ModelHandler guardó fuera de models_dir mientras sigan existiendo.
+        Si models_dir es de solo lectura, el índice se reconstruye en memoria sin
+        tomar el cerrojo ni escribirlo.
+
+        Args:
+            model_type (str): Filtrar por tipo de modelo ('random_forest', 'decision_tree'...)
+            min_test_score (float): Filtrar por precisión mínima en pruebas
+            since: Filtrar modelos guardados desde esta fecha (datetime o 'YYYYmmdd_HHMMSS')
+
         Returns:
             list: Lista de archivos de modelos disponibles
         """
+        if os.access(self.models_dir, os.W_OK):
+            with self._index_lock():
+                index, _ = self._refresh_index()
+        else:
+            index, _ = self._refresh_index(write=False)
+
+        if isinstance(since, datetime):
+            since = since.strftime("%Y%m%d_%H%M%S")
+
         models = []
-        for filepath in self.models_dir.glob("*.joblib"):
-            try:
-                model_data = joblib.load(filepath)
-                metadata = model_data['metadata']
-                models.append({
-                    'filename': filepath.name,
-                    'filepath': str(filepath),
-                    'metadata': metadata
-                })
-            except Exception as e:
-                print(f"Error al cargar {filepath.name}: {str(e)}")
+        for key, entry in index.items():
+            metadata = entry['metadata']
+
+            if model_type is not None and entry.get('model_type') != model_type:
+                continue
+            if min_test_score is not None and not (metadata.get('test_score') or 0) >= min_test_score:
+                continue
+            if since is not None and str(metadata.get('timestamp', '')) < since:
+                continue
+
+            filepath = self._index_path(key)
+            models.append({
+                'filename': filepath.name,
+                'filepath': str(filepath),
+                'metadata': metadata
+            })
         return models
 
+    def _refresh_index(self, write: bool = True) -> tuple:
+        """
+        Sincroniza el índice con los artefactos en disco (requiere el cerrojo del índice si se escribe).
+
+        Args:
+            write (bool): Si el índice actualizado se guarda en disco
+
+        Returns:
+            tuple: (índice actualizado, claves de los artefactos que no se pudieron leer)
+        """
+        index = self._read_index()
+        paths = {filepath.name: filepath for filepath in sorted(self.models_dir.glob("*.joblib"))}
+        # Los modelos guardados fuera de models_dir se indexan por ruta absoluta y se conservan mientras existan
+        paths.update({key: Path(key) for key in index if os.path.isabs(key) and Path(key).exists()})
+
+        updated = {}
+        failed = []
+        changed = False
+
+        for key, filepath in paths.items():
+            entry = index.get(key)
+            stat = filepath.stat()
+
+            if entry is None or (entry.get('mtime_ns'), entry.get('size')) != (stat.st_mtime_ns, stat.st_size):
+                try:
+                    model_data = joblib.load(filepath)
+                    # Las referencias guardan la clase del modelo, no hace falta cargar el objeto
+                    model = model_data['model'] if 'model' in model_data else model_data['model_class']
+                    entry = self._index_entry(filepath, model, model_data['metadata'], model_data.get('model_ref'))
+                    changed = True
+                except Exception as e:
+                    print(f"Error al cargar {filepath.name}: {str(e)}")
+                    failed.append(key)
+                    continue
+
+            updated[key] = entry
+
+        if write and (changed or set(updated) != set(index)):
+            self._write_index(updated)
+
+        return updated, failed
+
+    def _index_key(self, filepath: Path) -> str:
+        """Clave del índice: el nombre dentro de models_dir, la ruta absoluta fuera de él."""
+        filepath = Path(filepath).resolve()
+        return filepath.name if filepath.parent == self.models_dir else str(filepath)
+
+    def _index_path(self, key: str) -> Path:
+        """Ruta del artefacto de una clave del índice."""
+        return Path(key) if os.path.isabs(key) else self.models_dir / key
+
+    @contextmanager
+    def _index_lock(self):
+        """Cerrojo exclusivo (fcntl) para leer, modificar y escribir el índice entre procesos."""
+        with open(self.models_dir / INDEX_LOCK_FILENAME, 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _index_entry(self, filepath: Path, model: Any, metadata: Dict, model_ref: str = None) -> Dict:
+        """
+        Construye la entrada del índice para un artefacto.
+
+        Args:
+            filepath (Path): Ruta del artefacto
+            model: Modelo guardado (o el nombre de su clase)
+            metadata (Dict): Metadatos del modelo
+            model_ref (str): Objeto referenciado en el almacén por contenido (opcional)
+
+        Returns:
+            Dict: Entrada con fecha/tamaño del archivo, tipo de modelo y metadatos serializables
+        """
+        stat = filepath.stat()
+        model_class = model if isinstance(model, str) else type(model).__name__
+        entry = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'model_class': model_class,
+            'model_type': metadata.get('model_type', MODEL_CLASS_TYPES.get(model_class, model_class)),
+            'metadata': _to_json_safe(metadata)
+        }
+        if model_ref is not None:
+            entry['model_ref'] = model_ref
+        return entry
+
+    def _store_object(self, model: Any, compress: int = 0) -> Path:
+        """
+        Guarda el modelo en el almacén por contenido si no existe ya.
+
+        El nombre del objeto es model_digest(model), que no depende de si el modelo se
+        acaba de entrenar o se cargó de disco: volver a guardar un modelo cargado
+        reutiliza el objeto existente (el nivel de compresión no forma parte del hash).
+
+        Args:
+            model: Modelo a guardar
+            compress (int): Nivel de compresión de joblib
+
+        Returns:
+            Path: Ruta del objeto models/objects/<sha256>.joblib
+        """
+        blob_path = self.objects_dir / f"{model_digest(model)}.joblib"
+        if blob_path.exists():
+            return blob_path
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, prefix=".object_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                joblib.dump(model, f, compress=compress)
+            os.replace(tmp_path, blob_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return blob_path
+
+    def collect_garbage(self, dry_run: bool = False) -> list:
+        """
+        Elimina los objetos del almacén que ninguna referencia usa.
+
+        Se consideran todas las referencias del índice, también las de modelos guardados
+        fuera de models_dir (indexadas por ruta absoluta).
+
+        Args:
+            dry_run (bool): Si es True solo informa qué objetos se eliminarían
+
+        Returns:
+            list: Rutas de los objetos eliminados (o a eliminar)
+        """
+        if not self.objects_dir.exists():
+            return []
+
+        with self._index_lock():
+            # Refrescar el índice y leer las referencias desde él
+            index, failed = self._refresh_index()
+            if failed:
+                # Ante artefactos ilegibles no se elimina nada
+                raise RuntimeError(f"No se pudieron indexar {failed}, recolección cancelada")
+
+            referenced = {
+                (self._index_path(key).parent / entry['model_ref']).resolve()
+                for key, entry in index.items() if 'model_ref' in entry
+            }
+
+            removed = []
+            for blob_path in self.objects_dir.glob("*.joblib"):
+                if blob_path.resolve() not in referenced:
+                    removed.append(str(blob_path))
+                    if not dry_run:
+                        blob_path.unlink()
+
+        return removed
+
+    def _read_index(self) -> Dict:
+        """
+        Lee el índice de metadatos.
+
+        Returns:
+            Dict: Entradas por nombre de archivo (vacío si no existe o está dañado)
+        """
+        index_path = self.models_dir / INDEX_FILENAME
+        if not index_path.exists():
+            return {}
+
+        try:
+            with open(index_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict):
+        """
+        Escribe el índice de metadatos de forma atómica (archivo temporal + reemplazo).
+
+        Args:
+            index (Dict): Entradas por nombre de archivo
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.models_dir, prefix=".index_", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.models_dir / INDEX_FILENAME)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
 # Ejemplo de uso
 if __name__ == "__main__":
     handler = ModelHandler()
@@ -0,0 +1,160 @@
+# core/out_of_core.py
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+# Constantes de splitmix64 para repartir filas entre entrenamiento y holdout
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def holdout_mask(row_index: np.ndarray, test_size: float, seed: int = 0) -> np.ndarray:
+    """
+    Decide qué filas van al holdout a partir de su posición global en el archivo.
+
+    La decisión solo depende del índice de la fila y de la semilla, de modo que
+    es la misma en cada pasada sobre los datos y no requiere guardar nada.
+
+    Args:
+        row_index (np.ndarray): Posición global de cada fila
+        test_size (float): Proporción de filas reservadas para evaluación
+        seed (int): Semilla del reparto
+
+    Returns:
+        np.ndarray: Máscara booleana (True para las filas del holdout)
+    """
+    with np.errstate(over='ignore'):
+        z = np.asarray(row_index, dtype=np.uint64) + np.uint64(seed) * _GOLDEN_GAMMA + _GOLDEN_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        z = z ^ (z >> np.uint64(31))
+    # 53 bits superiores como uniforme en [0, 1)
+    return (z >> np.uint64(11)) * (1.0 / 2**53) < test_size
+
+
+class ReservoirSampler:
+    """
+    Muestras uniformes de tamaño acotado de un flujo de filas (algoritmo R, vectorizado por bloque).
+
+    Mantiene varios depósitos independientes; cada uno es una muestra uniforme sin
+    reemplazo de todas las filas vistas. Las métricas se guardan en float32 (la
+    precisión con la que evalúan los árboles), así que la memoria es
+    num_reservoirs * sample_size * (4 * num_features + 1) bytes sea cual sea el
+    tamaño del flujo.
+    """
+
+    def __init__(self, feature_columns: List[str], sample_size: int, num_reservoirs: int = 1, seed: int = 0):
+        """
+        Inicializa los depósitos.
+
+        Args:
+            feature_columns (List[str]): Columnas de métricas, en el orden del modelo
+            sample_size (int): Filas por depósito
+            num_reservoirs (int): Número de depósitos independientes
+            seed (int): Semilla del muestreo
+        """
+        if sample_size < 1 or num_reservoirs < 1:
+            raise ValueError("sample_size y num_reservoirs deben ser al menos 1")
+        self.feature_columns = list(feature_columns)
+        self.sample_size = sample_size
+        self.num_reservoirs = num_reservoirs
+        self.rows_seen = 0
+        self._rng = np.random.default_rng(seed)
+        self._features = np.empty((num_reservoirs, sample_size, len(self.feature_columns)), dtype=np.float32)
+        self._labels = np.empty((num_reservoirs, sample_size), dtype=np.uint8)
+
+    def add(self, X: pd.DataFrame, y: pd.Series):
+        """
+        Ofrece un bloque de filas a todos los depósitos.
+
+        Args:
+            X (pd.DataFrame): Métricas del bloque
+            y (pd.Series): Etiquetas del bloque
+        """
+        features = X[self.feature_columns].to_numpy(dtype=np.float32)
+        labels = y.to_numpy(dtype=np.uint8)
+        num_rows = len(labels)
+        if num_rows == 0:
+            return
+
+        # Posición de cada fila en el flujo; las primeras llenan los depósitos directamente
+        positions = self.rows_seen + np.arange(num_rows, dtype=np.int64)
+        filling = positions < self.sample_size
+        if filling.any():
+            slots = positions[filling]
+            self._features[:, slots] = features[filling]
+            self._labels[:, slots] = labels[filling]
+
+        candidates = np.flatnonzero(~filling)
+        if len(candidates):
+            for reservoir in range(self.num_reservoirs):
+                # La fila en la posición t sustituye al hueco j ~ U[0, t] si j < sample_size
+                slots = (self._rng.random(len(candidates)) * (positions[candidates] + 1)).astype(np.int64)
+                accepted = slots < self.sample_size
+                rows, slots = candidates[accepted], slots[accepted]
+                # Si varias filas caen en el mismo hueco, gana la última (como en el algoritmo secuencial)
+                _, last = np.unique(slots[::-1], return_index=True)
+                keep = len(slots) - 1 - last
+                self._features[reservoir, slots[keep]] = features[rows[keep]]
+                self._labels[reservoir, slots[keep]] = labels[rows[keep]]
+
+        self.rows_seen += num_rows
+
+    def sample(self, reservoir: int) -> tuple:
+        """
+        Devuelve el contenido de un depósito.
+
+        Args:
+            reservoir (int): Índice del depósito
+
+        Returns:
+            tuple: (métricas como DataFrame, etiquetas como Series)
+        """
+        size = min(self.rows_seen, self.sample_size)
+        X = pd.DataFrame(self._features[reservoir, :size], columns=self.feature_columns, copy=False)
+        y = pd.Series(self._labels[reservoir, :size], name='is_optimal')
+        return X, y
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria reservada por los depósitos en bytes."""
+        return self._features.nbytes + self._labels.nbytes
+
+
+def report_from_confusion(matrix: np.ndarray, classes: List) -> Dict:
+    """
+    Calcula el informe de clasificación a partir de una matriz de confusión acumulada.
+
+    Args:
+        matrix (np.ndarray): Matriz de confusión (filas: clase real, columnas: predicha)
+        classes (List): Etiquetas de las clases, en el orden de la matriz
+
+    Returns:
+        Dict: Mismo formato que classification_report(..., output_dict=True)
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    true_positives = np.diag(matrix)
+    support = matrix.sum(axis=1)
+    predicted = matrix.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        precision = np.nan_to_num(true_positives / predicted)
+        recall = np.nan_to_num(true_positives / support)
+        f1 = np.nan_to_num(2 * precision * recall / (precision + recall))
+
+    total = support.sum()
+    report = {
+        str(label): {'precision': precision[i], 'recall': recall[i], 'f1-score': f1[i], 'support': support[i]}
+        for i, label in enumerate(classes)
+    }
+    report['accuracy'] = true_positives.sum() / total if total else 0.0
+    weights = support / total if total else np.zeros_like(support)
+    report['macro avg'] = {
+        'precision': precision.mean(), 'recall': recall.mean(), 'f1-score': f1.mean(), 'support': total
+    }
+    report['weighted avg'] = {
+        'precision': (precision * weights).sum(), 'recall': (recall * weights).sum(),
+        'f1-score': (f1 * weights).sum(), 'support': total
+    }
+    return report
@@ -0,0 +1,216 @@
+# core/parallel.py
+
+import os
+import shutil
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+from core.model_handler import read_model_data
+from core.compiled_forest import CompiledForest
+
+# Modelo abierto una sola vez por proceso trabajador
+_worker_model = None
+_worker_features = None
+
+
+def load_model_for_scoring(model_path: str, backend: str = 'sklearn') -> Any:
+    """
+    Carga un modelo guardado por ModelHandler para evaluarlo.
+
+    Args:
+        model_path (str): Ruta al archivo .joblib
+        backend (str): Motor de inferencia ('sklearn' o 'compiled')
+
+    Returns:
+        Any: Modelo listo para predict_proba
+    """
+    model = read_model_data(model_path)['model']
+    if backend == 'compiled':
+        model = CompiledForest.from_model(model)
+    return model
+
+
+def _init_worker(source: str, backend: str, feature_names: list):
+    """
+    Inicializa un proceso trabajador.
+
+    Args:
+        source (str): Directorio con los arreglos compilados (se abren con memory-mapping)
+            o ruta al .joblib si el modelo no se puede compilar (se carga en el proceso)
+        backend (str): Motor de inferencia para los modelos cargados desde .joblib
+        feature_names (list): Columnas de entrada del modelo (opcional)
+    """
+    global _worker_model, _worker_features
+    if os.path.isdir(source):
+        _worker_model = CompiledForest.load_arrays(source, mmap_mode='r')
+    else:
+        _worker_model = load_model_for_scoring(source, backend)
+    _worker_features = feature_names
+
+
+def _score_shard(data_path: str, start: int, stop: int) -> tuple:
+    """
+    Evalúa un fragmento de filas del lote compartido.
+
+    Args:
+        data_path (str): Ruta al .npy con la matriz de entrada
+        start (int): Primera fila del fragmento
+        stop (int): Fila siguiente a la última del fragmento
+
+    Returns:
+        tuple: (start, probabilidades del fragmento)
+    """
+    X = np.load(data_path, mmap_mode='r')[start:stop]
+    if _worker_features is not None:
+        X = pd.DataFrame(X, columns=_worker_features, copy=False)
+    return start, _worker_model.predict_proba(X)
+
+
+class ParallelScorer:
+    """
+    Evalúa lotes grandes repartiendo las filas entre un pool de procesos.
+
+    Los Random Forest y árboles de decisión se compilan una vez en el proceso actual y
+    sus arreglos de nodos se guardan como archivos .npy en un directorio temporal; cada
+    trabajador los abre con np.load(mmap_mode='r'), así que todos comparten las mismas
+    páginas en lugar de tener su propia copia del modelo. El recorrido compilado da
+    los mismos bits que predict_proba de scikit-learn, sea cual sea el backend. Los
+    modelos que no se pueden compilar (p.ej. hist_gradient_boosting) se cargan una vez
+    en cada trabajador.
+
+    La matriz de entrada también se comparte como un .npy mapeado en memoria, de modo
+    que solo viajan entre procesos los límites de cada fragmento y sus probabilidades.
+    """
+
+    def __init__(self,
+                 model_path: str,
+                 workers: int = None,
+                 backend: str = 'sklearn',
+                 min_rows_per_worker: int = 10000):
+        """
+        Inicializa el evaluador paralelo.
+
+        Args:
+            model_path (str): Ruta al modelo guardado por ModelHandler
+            workers (int): Número de procesos (por defecto, todos los núcleos)
+            backend (str): Motor de inferencia de cada trabajador ('sklearn' o 'compiled')
+            min_rows_per_worker (int): Filas mínimas por proceso; los lotes pequeños
+                se evalúan en el proceso actual
+        """
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"No se encontró el archivo del modelo: {model_path}")
+
+        self.model_path = str(model_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.backend = backend
+        self.min_rows_per_worker = min_rows_per_worker
+
+        self.model = load_model_for_scoring(self.model_path, backend)
+        self.classes_ = self.model.classes_
+        self.n_features_in_ = self.model.n_features_in_
+        if hasattr(self.model, 'feature_names_in_'):
+            self.feature_names_in_ = self.model.feature_names_in_
+
+        self._executor = None
+        self._arrays_dir = None
+
+    def _worker_source(self) -> str:
+        """
+        Prepara lo que abre cada trabajador al arrancar.
+
+        Returns:
+            str: Directorio con los arreglos compilados o, si el modelo no se puede
+                compilar, la ruta al modelo guardado
+        """
+        if self._arrays_dir is None:
+            try:
+                compiled = CompiledForest.from_model(self.model)
+            except TypeError:
+                return self.model_path
+            self._arrays_dir = tempfile.mkdtemp(prefix='joptimizer_model_')
+            # El directorio se borra también si el evaluador se descarta sin close()
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self._arrays_dir, True)
+            compiled.save_arrays(self._arrays_dir)
+        return self._arrays_dir
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Crea el pool de procesos la primera vez y lo reutiliza después."""
+        if self._executor is None:
+            feature_names = list(self.feature_names_in_) if hasattr(self, 'feature_names_in_') else None
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._worker_source(), self.backend, feature_names)
+            )
+        return self._executor
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        """
+        Calcula las probabilidades por clase repartiendo las filas entre los procesos.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+
+        Returns:
+            np.ndarray: Probabilidades (n_muestras, n_clases) en el orden original
+        """
+        num_rows = len(X)
+        num_shards = min(self.workers, num_rows // max(self.min_rows_per_worker, 1))
+        if num_shards <= 1:
+            return self.model.predict_proba(X)
+
+        if isinstance(X, pd.DataFrame) and hasattr(self, 'feature_names_in_'):
+            X = X[list(self.feature_names_in_)]
+        # scikit-learn evalúa en float32, convertir aquí no altera los resultados
+        matrix = np.ascontiguousarray(np.asarray(X, dtype=np.float32))
+
+        tmp_dir = tempfile.mkdtemp(prefix='joptimizer_')
+        try:
+            data_path = os.path.join(tmp_dir, 'batch.npy')
+            np.save(data_path, matrix)
+            del matrix
+
+            bounds = np.linspace(0, num_rows, num_shards + 1, dtype=np.int64)
+            futures = [
+                self._get_executor().submit(_score_shard, data_path, int(start), int(stop))
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+
+            probabilities = np.empty((num_rows, len(self.classes_)), dtype=np.float64)
+            for future in futures:
+                start, shard_proba = future.result()
+                probabilities[start:start + len(shard_proba)] = shard_proba
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        return probabilities
+
+    def predict(self, X: Any) -> np.ndarray:
+        """
+        Predice la clase de cada muestra.
+
+        Args:
+            X: DataFrame o arreglo con las métricas
+
+        Returns:
+            np.ndarray: Clases predichas
+        """
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+    def close(self):
+        """Detiene el pool de procesos y borra los arreglos compartidos."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._arrays_dir is not None:
+            self._cleanup()
+            self._arrays_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,204 @@
+# core/prediction_cache.py
+
+import sqlite3
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Número máximo de parámetros por consulta SQL
+_SQL_BATCH = 500
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """Finalizador de SplitMix64 sobre un vector uint64 (aritmética módulo 2^64)."""
+    values = values + np.uint64(0x9E3779B97F4A7C15)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class PredictionCache:
+    """
+    Caché de predicciones por fila, con clave derivada del vector de métricas y la huella del modelo.
+
+    La clave es un hash de 128 bits del vector de características (en float32, que es
+    lo que evalúa el modelo) calculado con la huella del modelo como semilla, de modo
+    que un cambio de modelo invalida todas las entradas. La memoria está acotada con
+    desalojo LRU y, opcionalmente, las entradas se persisten en SQLite para reutilizarlas
+    entre ejecuciones.
+    """
+
+    def __init__(self, max_size: int = 100000, path: str = None):
+        """
+        Inicializa la caché.
+
+        Args:
+            max_size (int): Número máximo de filas en memoria
+            path (str): Archivo SQLite para persistir la caché entre ejecuciones (opcional)
+        """
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._db = None
+
+        if path is not None:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions (key BLOB PRIMARY KEY, probabilities BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    @staticmethod
+    def row_hashes(features: pd.DataFrame, model_fingerprint: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calcula el hash de 128 bits de cada fila como dos mitades de 64 bits.
+
+        Cada mitad recorre las columnas (los bits del valor en float32) con el
+        finalizador de SplitMix64, partiendo de una semilla distinta tomada de la
+        huella del modelo. hash_pandas_object no sirve aquí: ignora hash_key en las
+        columnas numéricas, así que ni la huella cambiaría la clave ni las dos
+        mitades serían independientes.
+
+        Args:
+            features: DataFrame con las características en el orden del modelo
+            model_fingerprint (str): Huella hexadecimal del modelo (al menos 32 caracteres)
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Mitades alta y baja (uint64) por fila
+        """
+        # Sumar 0.0 unifica -0.0 y 0.0, que el modelo evalúa igual
+        canonical = np.ascontiguousarray(features.to_numpy(dtype=np.float32) + np.float32(0.0))
+        columns = canonical.view(np.uint32).astype(np.uint64).T
+        halves = []
+        for seed in (model_fingerprint[:16], model_fingerprint[16:32]):
+            state = np.full(len(canonical), int(seed, 16), dtype=np.uint64)
+            for column in columns:
+                state = _mix64(state ^ column)
+            halves.append(state)
+        return halves[0], halves[1]
+
+    @staticmethod
+    def row_keys(features: pd.DataFrame, model_fingerprint: str) -> List[bytes]:
+        """
+        Calcula la clave de cada fila.
+
+        Args:
+            features: DataFrame con las características en el orden del modelo
+            model_fingerprint (str): Huella hexadecimal del modelo (al menos 32 caracteres)
+
+        Returns:
+            List[bytes]: Clave de 16 bytes por fila
+        """
+        high, low = PredictionCache.row_hashes(features, model_fingerprint)
+        return np.column_stack([high, low]).view('V16').ravel().tolist()
+
+    def get_many(self, keys: List[bytes]) -> Tuple[np.ndarray, List[np.ndarray], np.ndarray]:
+        """
+        Busca un lote de claves en memoria y, si hay backend en disco, en SQLite.
+
+        Args:
+            keys (List[bytes]): Claves de las filas
+
+        Returns:
+            Tuple: (posiciones con acierto, probabilidades de los aciertos, posiciones sin acierto)
+        """
+        found = {}
+        pending = []
+        for position, key in enumerate(keys):
+            probabilities = self._entries.get(key)
+            if probabilities is not None:
+                self._entries.move_to_end(key)
+                found[position] = probabilities
+            else:
+                pending.append(position)
+
+        if self._db is not None and pending:
+            stored = self._read_disk([keys[position] for position in pending])
+            still_pending = []
+            for position in pending:
+                probabilities = stored.get(keys[position])
+                if probabilities is not None:
+                    found[position] = probabilities
+                    self._remember(keys[position], probabilities)
+                else:
+                    still_pending.append(position)
+            pending = still_pending
+
+        hit_positions = np.fromiter(found.keys(), dtype=np.int64, count=len(found))
+        self.hits += len(found)
+        self.misses += len(pending)
+
+        return hit_positions, list(found.values()), np.asarray(pending, dtype=np.int64)
+
+    def put_many(self, keys: List[bytes], probabilities: np.ndarray):
+        """
+        Guarda las probabilidades de un lote de filas.
+
+        Args:
+            keys (List[bytes]): Claves de las filas
+            probabilities (np.ndarray): Probabilidades (n_filas, n_clases)
+        """
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        # Cada entrada guarda una copia de su fila: una vista mantendría vivo el lote completo
+        for key, row in zip(keys, probabilities):
+            self._remember(key, row.copy())
+
+        if self._db is not None:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO predictions (key, probabilities) VALUES (?, ?)",
+                ((key, row.tobytes()) for key, row in zip(keys, probabilities))
+            )
+            self._db.commit()
+
+    def _remember(self, key: bytes, probabilities: np.ndarray):
+        """Inserta una entrada en memoria y desaloja las menos usadas."""
+        self._entries[key] = probabilities
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self, keys: List[bytes]) -> Dict[bytes, np.ndarray]:
+        """Lee de SQLite las entradas de un lote de claves."""
+        stored = {}
+        for start in range(0, len(keys), _SQL_BATCH):
+            batch = keys[start:start + _SQL_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = self._db.execute(
+                f"SELECT key, probabilities FROM predictions WHERE key IN ({placeholders})", batch
+            )
+            for key, blob in rows:
+                stored[bytes(key)] = np.frombuffer(blob, dtype=np.float64)
+        return stored
+
+    def get_stats(self) -> Dict:
+        """
+        Obtiene los contadores de la caché.
+
+        Returns:
+            Dict: Aciertos, fallos, tasa de acierto y filas en memoria
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._entries)
+        }
+
+    def clear(self):
+        """Vacía la caché en memoria y en disco."""
+        self._entries.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM predictions")
+            self._db.commit()
+
+    def close(self):
+        """Cierra el backend en disco."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
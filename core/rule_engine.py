@@ -0,0 +1,208 @@
+# core/rule_engine.py
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List
+
+# Configuración de la que se leen las reglas ('optimization_rules'): es la única definición de los umbrales
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parent.parent / 'config' / 'parameters.json'
+
+OPERATORS = {
+    '>': np.greater,
+    '>=': np.greater_equal,
+    '<': np.less,
+    '<=': np.less_equal,
+    '==': np.equal,
+    '!=': np.not_equal
+}
+
+MAX_RULES = 64
+
+
+class RuleEngine:
+    """
+    Motor de reglas vectorizado para generar sugerencias de optimización.
+
+    Cada regla se evalúa como una máscara booleana sobre la columna completa,
+    y el resultado por fila se codifica como una máscara de bits (bit i = regla i).
+    """
+
+    def __init__(self, rules: List[Dict] = None):
+        """
+        Inicializa el motor de reglas.
+
+        Args:
+            rules (List[Dict]): Tabla de reglas con las claves 'metric', 'operator',
+                'threshold', 'issue' y 'suggestion' (opcional, por defecto las de
+                config/parameters.json)
+        """
+        if rules is None:
+            rules = self.load_rules(DEFAULT_CONFIG_PATH)
+
+        if len(rules) > MAX_RULES:
+            raise ValueError(f"Se admiten como máximo {MAX_RULES} reglas")
+
+        required_keys = ('metric', 'operator', 'threshold', 'issue', 'suggestion')
+        for rule in rules:
+            missing = [key for key in required_keys if key not in rule]
+            if missing:
+                raise ValueError(f"Regla incompleta, faltan las claves: {missing}")
+            if rule['operator'] not in OPERATORS:
+                raise ValueError(f"Operador no válido: {rule['operator']}. Opciones: {list(OPERATORS.keys())}")
+
+        self.rules = [dict(rule) for rule in rules]
+        self.mask_dtype = np.min_scalar_type((1 << max(len(self.rules) - 1, 0)))
+
+    @staticmethod
+    def load_rules(config_path: str) -> List[Dict]:
+        """
+        Lee la sección 'optimization_rules' del archivo de configuración.
+
+        Args:
+            config_path (str): Ruta al archivo parameters.json
+
+        Returns:
+            List[Dict]: Tabla de reglas
+
+        Raises:
+            FileNotFoundError: Si no existe el archivo
+            ValueError: Si el archivo no tiene la sección 'optimization_rules'
+        """
+        config_path = Path(config_path)
+        if not config_path.exists():
+            raise FileNotFoundError(f"No se encontró el archivo de configuración: {config_path}")
+
+        with open(config_path, encoding='utf-8') as f:
+            config = json.load(f)
+
+        if 'optimization_rules' not in config:
+            raise ValueError(f"El archivo de configuración no define 'optimization_rules': {config_path}")
+        return config['optimization_rules']
+
+    @classmethod
+    def from_config(cls, config_path: str) -> 'RuleEngine':
+        """
+        Crea el motor de reglas a partir de la sección 'optimization_rules' del archivo de configuración.
+
+        Args:
+            config_path (str): Ruta al archivo parameters.json
+
+        Returns:
+            RuleEngine: Motor con las reglas configuradas
+        """
+        return cls(cls.load_rules(config_path))
+
+    def evaluate(self, metrics_data: pd.DataFrame, predictions: np.ndarray = None) -> Dict:
+        """
+        Evalúa todas las reglas sobre el lote completo.
+
+        Args:
+            metrics_data: DataFrame con métricas de código
+            predictions: Predicciones del modelo (opcional). Si se indican, solo
+                se marcan problemas en las filas clasificadas como subóptimas (0).
+                Una Serie se alinea por índice con metrics_data; un arreglo se toma
+                en el orden de las filas
+
+        Returns:
+            Dict: Resultados columnares con 'issue_mask' (máscara de bits por fila),
+                'issue_index' (índice de las filas con algún problema), 'suboptimal_index'
+                (índice de todas las filas subóptimas, o None sin predicciones) e 'index'
+        """
+        num_rows = len(metrics_data)
+        issue_mask = np.zeros(num_rows, dtype=self.mask_dtype)
+        suboptimal_index = None
+
+        for bit, rule in enumerate(self.rules):
+            if rule['metric'] not in metrics_data.columns:
+                raise ValueError(f"Falta la métrica requerida por la regla: {rule['metric']}")
+
+            values = metrics_data[rule['metric']].to_numpy()
+            hits = OPERATORS[rule['operator']](values, rule['threshold'])
+            issue_mask[hits] |= self.mask_dtype.type(1 << bit)
+
+        if predictions is not None:
+            predictions = self._align_predictions(metrics_data, predictions)
+            issue_mask[predictions != 0] = 0
+            suboptimal_index = metrics_data.index[predictions == 0]
+
+        return {
+            'issue_mask': issue_mask,
+            'issue_index': metrics_data.index[issue_mask != 0],
+            'suboptimal_index': suboptimal_index,
+            'index': metrics_data.index
+        }
+
+    @staticmethod
+    def _align_predictions(metrics_data: pd.DataFrame, predictions) -> np.ndarray:
+        """
+        Ordena las predicciones como las filas de metrics_data.
+
+        Args:
+            metrics_data: DataFrame con métricas de código
+            predictions: Serie (se alinea por índice) o arreglo (en el orden de las filas)
+
+        Returns:
+            np.ndarray: Predicciones en el orden de las filas de metrics_data
+        """
+        if isinstance(predictions, pd.Series):
+            if not predictions.index.equals(metrics_data.index):
+                if predictions.index.has_duplicates:
+                    raise ValueError("El índice de las predicciones tiene valores repetidos")
+                predictions = predictions.reindex(metrics_data.index)
+                if predictions.isna().any():
+                    raise ValueError("Faltan predicciones para algunas filas del índice de los datos")
+            return predictions.to_numpy()
+
+        predictions = np.asarray(predictions)
+        if len(predictions) != len(metrics_data):
+            raise ValueError("El número de predicciones no coincide con el número de filas")
+        return predictions
+
+    def to_suggestions(self, evaluation: Dict) -> List[Dict]:
+        """
+        Construye el formato de lista de diccionarios a partir de los resultados columnares.
+
+        Args:
+            evaluation: Resultado devuelto por evaluate()
+
+        Returns:
+            List[Dict]: Sugerencias con las claves 'index', 'issues' y 'suggestions'
+        """
+        issue_mask = evaluation['issue_mask']
+        positions = np.flatnonzero(issue_mask)
+        index = evaluation['index']
+
+        # Cachear combinaciones repetidas de problemas
+        combinations = {}
+        suggestions = []
+        for position in positions:
+            mask = int(issue_mask[position])
+            if mask not in combinations:
+                active = [rule for bit, rule in enumerate(self.rules) if mask & (1 << bit)]
+                combinations[mask] = (
+                    [rule['issue'] for rule in active],
+                    [rule['suggestion'] for rule in active]
+                )
+
+            issues, rule_suggestions = combinations[mask]
+            suggestions.append({
+                'index': index[position],
+                'issues': list(issues),
+                'suggestions': list(rule_suggestions)
+            })
+
+        return suggestions
+
+    def decode(self, mask: int) -> List[str]:
+        """
+        Traduce una máscara de bits a la lista de problemas detectados.
+
+        Args:
+            mask (int): Máscara de bits de una fila
+
+        Returns:
+            List[str]: Problemas correspondientes a los bits activos
+        """
+        return [rule['issue'] for bit, rule in enumerate(self.rules) if int(mask) & (1 << bit)]
@@ -0,0 +1,355 @@
+# core/server.py
+
+import json
+import time
+import asyncio
+import numpy as np
+import pandas as pd
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+# Límites superiores de los buckets del histograma de tamaños de lote
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+
+class _PendingRequest:
+    """Solicitud en cola: filas ya validadas (matriz numérica) y el futuro donde se publica el resultado."""
+
+    __slots__ = ('rows', 'future', 'enqueued_at')
+
+    def __init__(self, rows: np.ndarray, future: asyncio.Future):
+        self.rows = rows
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class InferenceServer:
+    """
+    Servidor asyncio que mantiene el modelo en memoria y agrupa solicitudes concurrentes en micro-lotes.
+
+    Protocolo: una solicitud JSON por línea sobre TCP o socket Unix.
+        {"id": 1, "metrics": {"lines_of_code": 120, ...}}      -> una clase
+        {"id": 2, "rows": [{...}, {...}]}                      -> varias clases
+        {"op": "stats"}                                        -> métricas del servidor
+    Cada respuesta es una línea JSON con 'predictions', 'probabilities' y 'confidence'
+    (o 'error'), y repite el 'id' de la solicitud.
+
+    Las solicitudes se acumulan hasta max_batch_size filas o hasta max_wait_ms desde
+    la primera, se evalúan en un único predict_proba fuera del event loop y los
+    resultados se reparten a cada cliente. Cada solicitud se valida y convierte a
+    números antes de encolarse, de modo que una fila inválida solo afecta a su
+    solicitud; si aun así falla un lote, sus solicitudes se reintentan por separado.
+    """
+
+    def __init__(self,
+                 library: Any,
+                 max_batch_size: int = 256,
+                 max_wait_ms: float = 5.0,
+                 backend: str = 'sklearn',
+                 latency_window: int = 10000,
+                 max_request_bytes: int = 2 ** 16):
+        """
+        Inicializa el servidor.
+
+        Args:
+            library: Instancia de AILibrary con un modelo cargado
+            max_batch_size (int): Número máximo de filas por micro-lote
+            max_wait_ms (float): Espera máxima para completar un lote desde la primera solicitud
+            backend (str): Motor de inferencia ('sklearn' o 'compiled')
+            latency_window (int): Número de latencias recientes usadas para los percentiles
+            max_request_bytes (int): Tamaño máximo de una línea de solicitud (búfer de lectura de asyncio)
+        """
+        self.library = library
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.backend = backend
+        self.max_request_bytes = max_request_bytes
+
+        self.model = library.get_inference_model(backend)
+        if not hasattr(self.model, 'feature_names_in_'):
+            raise ValueError("El modelo no tiene nombres de características (feature_names_in_)")
+        self.feature_names = list(self.model.feature_names_in_)
+
+        self._queue = None
+        self._batcher = None
+        self._server = None
+        self._connections = set()
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+        self._latencies = deque(maxlen=latency_window)
+        self._batch_histogram = [0] * (len(BATCH_SIZE_BUCKETS) + 1)
+        self._stats = {
+            'requests': 0,
+            'rows': 0,
+            'batches': 0,
+            'errors': 0,
+            'max_queue_depth': 0
+        }
+
+    async def start(self, host: str = '127.0.0.1', port: int = 8765, unix_socket: str = None):
+        """
+        Abre el socket y arranca el agrupador de lotes.
+
+        Args:
+            host (str): Dirección TCP
+            port (int): Puerto TCP
+            unix_socket (str): Ruta de socket Unix (si se indica, se usa en lugar de TCP)
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+
+        if unix_socket:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_socket,
+                                                           limit=self.max_request_bytes)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                      limit=self.max_request_bytes)
+
+    async def serve_forever(self, host: str = '127.0.0.1', port: int = 8765, unix_socket: str = None):
+        """
+        Arranca el servidor y atiende solicitudes hasta que se cancele.
+
+        Args:
+            host (str): Dirección TCP
+            port (int): Puerto TCP
+            unix_socket (str): Ruta de socket Unix (opcional)
+        """
+        await self.start(host, port, unix_socket)
+        try:
+            async with self._server:
+                await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Cierra el socket, detiene el agrupador y libera el hilo de inferencia."""
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+            self._batcher = None
+        self._executor.shutdown(wait=False)
+
+    async def predict(self, rows: List[Dict]) -> Dict:
+        """
+        Encola filas para el siguiente micro-lote y espera su resultado.
+
+        Args:
+            rows (List[Dict]): Métricas de cada clase
+
+        Returns:
+            Dict: 'predictions', 'probabilities' y 'confidence' de las filas
+        """
+        values = self._to_matrix(rows)
+
+        self._stats['requests'] += 1
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(values, future))
+        self._stats['max_queue_depth'] = max(self._stats['max_queue_depth'], self._queue.qsize())
+        return await future
+
+    def _to_matrix(self, rows: List[Dict]) -> np.ndarray:
+        """
+        Valida las filas de una solicitud y las convierte a una matriz en el orden de las características.
+
+        Args:
+            rows (List[Dict]): Métricas de cada clase
+
+        Returns:
+            np.ndarray: Matriz float64 (filas x características)
+
+        Raises:
+            ValueError: Si no hay filas, falta alguna característica o algún valor no es numérico
+        """
+        if not isinstance(rows, list) or not rows:
+            raise ValueError("La solicitud no contiene filas")
+        if not all(isinstance(row, dict) for row in rows):
+            raise ValueError("Cada fila debe ser un objeto con las métricas de una clase")
+
+        missing = [name for name in self.feature_names if any(name not in row for row in rows)]
+        if missing:
+            raise ValueError(f"Faltan las siguientes características: {missing}")
+
+        values = np.empty((len(rows), len(self.feature_names)), dtype=np.float64)
+        for i, row in enumerate(rows):
+            for j, name in enumerate(self.feature_names):
+                value = row[name]
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    raise ValueError(f"Fila {i}: '{name}' debe ser numérico (recibido {value!r})")
+                values[i, j] = value
+        return values
+
+    async def _batch_loop(self):
+        """Agrupa solicitudes en micro-lotes y los evalúa fuera del event loop."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            num_rows = len(batch[0].rows)
+            deadline = loop.time() + self.max_wait
+
+            while num_rows < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                num_rows += len(request.rows)
+
+            rows = np.concatenate([request.rows for request in batch]) if len(batch) > 1 else batch[0].rows
+            try:
+                probabilities = await loop.run_in_executor(self._executor, self._score, rows)
+            except Exception as e:
+                if len(batch) == 1:
+                    self._fail(batch[0], e)
+                    continue
+                # Reintentar cada solicitud por separado para aislar la que falla
+                for request in batch:
+                    try:
+                        probabilities = await loop.run_in_executor(self._executor, self._score, request.rows)
+                    except Exception as request_error:
+                        self._fail(request, request_error)
+                        continue
+                    self._record_batch(len(request.rows))
+                    self._publish([request], probabilities)
+                continue
+
+            self._record_batch(num_rows)
+            self._publish(batch, probabilities)
+
+    def _publish(self, batch: List[_PendingRequest], probabilities: np.ndarray):
+        """Reparte las probabilidades de un lote evaluado entre sus solicitudes."""
+        predictions = self.model.classes_.take(np.argmax(probabilities, axis=1), axis=0)
+        confidence = np.max(probabilities, axis=1)
+
+        finished_at = time.perf_counter()
+        start = 0
+        for request in batch:
+            stop = start + len(request.rows)
+            if not request.future.done():
+                request.future.set_result({
+                    'predictions': predictions[start:stop].tolist(),
+                    'probabilities': probabilities[start:stop].tolist(),
+                    'confidence': confidence[start:stop].tolist()
+                })
+            self._latencies.append(finished_at - request.enqueued_at)
+            start = stop
+
+    def _fail(self, request: _PendingRequest, error: Exception):
+        """Publica el error de una solicitud que no se pudo evaluar."""
+        self._stats['errors'] += 1
+        if not request.future.done():
+            request.future.set_exception(error)
+
+    def _score(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Evalúa un micro-lote con el modelo en memoria.
+
+        Args:
+            rows (np.ndarray): Filas del lote (matriz validada por _to_matrix)
+
+        Returns:
+            np.ndarray: Probabilidades por clase
+        """
+        frame = pd.DataFrame(rows, columns=self.feature_names)
+        return self.library.tester.test_model(self.model, frame)['probabilities']
+
+    def _record_batch(self, num_rows: int):
+        """Actualiza los contadores con un lote evaluado."""
+        self._stats['batches'] += 1
+        self._stats['rows'] += num_rows
+        bucket = int(np.searchsorted(BATCH_SIZE_BUCKETS, num_rows))
+        self._batch_histogram[bucket] += 1
+
+    def get_stats(self) -> Dict:
+        """
+        Obtiene las métricas del servidor para ajustar el rendimiento frente a la latencia.
+
+        Returns:
+            Dict: Profundidad de cola, contadores, histograma de tamaños de lote y latencias (ms)
+        """
+        latencies = np.asarray(self._latencies) * 1000.0
+        batches = self._stats['batches']
+        labels = [f"<={limit}" for limit in BATCH_SIZE_BUCKETS] + [f">{BATCH_SIZE_BUCKETS[-1]}"]
+
+        return {
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            **self._stats,
+            'mean_batch_size': self._stats['rows'] / batches if batches else 0.0,
+            'batch_size_histogram': dict(zip(labels, self._batch_histogram)),
+            'latency_ms': {
+                'p50': float(np.percentile(latencies, 50)) if len(latencies) else None,
+                'p99': float(np.percentile(latencies, 99)) if len(latencies) else None,
+                'max': float(latencies.max()) if len(latencies) else None
+            }
+        }
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Atiende una conexión: una solicitud JSON por línea, una respuesta por línea."""
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # Línea más larga que el búfer: el resto de la conexión ya no se puede delimitar
+                    error = {'error': f"La solicitud supera el tamaño máximo de {self.max_request_bytes} bytes"}
+                    writer.write(json.dumps(error).encode('utf-8') + b'\n')
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                response = await self._handle_request(line)
+                writer.write(json.dumps(response).encode('utf-8') + b'\n')
+                await writer.drain()
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _handle_request(self, line: bytes) -> Dict:
+        """
+        Procesa una línea de solicitud.
+
+        Args:
+            line (bytes): Solicitud JSON
+
+        Returns:
+            Dict: Respuesta JSON
+        """
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+
+            if request.get('op') == 'stats':
+                response = self.get_stats()
+            elif 'metrics' in request:
+                response = await self.predict([request['metrics']])
+            elif 'rows' in request:
+                response = await self.predict(request['rows'])
+            else:
+                raise ValueError("La solicitud debe incluir 'metrics', 'rows' u 'op'")
+
+        except Exception as e:
+            response = {'error': str(e)}
+
+        if request_id is not None:
+            response['id'] = request_id
+        return response
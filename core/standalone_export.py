@@ -0,0 +1,222 @@
+# core/standalone_export.py
+
+import os
+import base64
+import importlib.util
+import numpy as np
+from datetime import datetime
+from typing import Any, Dict
+from core.compiled_forest import CompiledForest, CompactForest
+
+# Caracteres de base64 por línea en el módulo generado
+_LINE_WIDTH = 100
+
+_MODULE_TEMPLATE = '''# Predictor autónomo generado por JOptimizer-AI (core/standalone_export.py). No editar a mano.
+# Modelo: {model_name}
+# Generado: {generated_at}
+#
+# Solo usa la biblioteca estándar: no importa scikit-learn, pandas, joblib ni NumPy.
+# Las métricas se redondean a float32 y los árboles se recorren y promedian en el mismo
+# orden que scikit-learn, así que las probabilidades coinciden con las del modelo original.
+#
+# Uso:
+#     import {module_name}
+#     {module_name}.predict_proba([{{"lines_of_code": 120, ...}}])
+#     python {module_name}.py metricas.csv   (escribe prediccion,confianza por fila)
+
+import sys
+import struct
+import base64
+from array import array
+
+FEATURES = {features!r}
+CLASSES = {classes!r}
+N_TREES = {n_trees}
+AVERAGE = {average!r}
+
+
+def _load(typecode, encoded):
+    values = array(typecode)
+    values.frombytes(base64.b64decode(encoded))
+    if sys.byteorder != 'little':
+        values.byteswap()
+    return values.tolist()
+
+
+_FEATURE = _load('B', (
+{feature}
+))
+_THRESHOLD = _load('f', (
+{threshold}
+))
+_LEFT = _load('i', (
+{left}
+))
+_RIGHT = _load('i', (
+{right}
+))
+_VALUE = _load('d', (
+{value}
+))
+_ROOTS = {roots!r}
+_N_CLASSES = len(CLASSES)
+_ROW = struct.Struct('<{n_features}f')
+
+
+def _as_float32(row):
+    """Ordena una fila (diccionario o secuencia) según FEATURES y la redondea a float32."""
+    if isinstance(row, dict):
+        row = [row[name] for name in FEATURES]
+    return _ROW.unpack(_ROW.pack(*row))
+
+
+def predict_proba(rows):
+    """Probabilidades por clase de cada fila (diccionarios por nombre o secuencias en el orden de FEATURES)."""
+    feature, threshold, left, right, value = _FEATURE, _THRESHOLD, _LEFT, _RIGHT, _VALUE
+    n_classes = _N_CLASSES
+    results = []
+    for row in rows:
+        x = _as_float32(row)
+        totals = [0.0] * n_classes
+        for node in _ROOTS:
+            while left[node] >= 0:
+                node = left[node] if x[feature[node]] <= threshold[node] else right[node]
+            offset = node * n_classes
+            for k in range(n_classes):
+                totals[k] += value[offset + k]
+        if AVERAGE:
+            totals = [total / N_TREES for total in totals]
+        results.append(totals)
+    return results
+
+
+def predict(rows):
+    """Clase predicha de cada fila."""
+    return [CLASSES[probabilities.index(max(probabilities))] for probabilities in predict_proba(rows)]
+
+
+def main(argv):
+    import csv
+    if len(argv) != 2:
+        sys.stderr.write("Uso: python {module_name}.py metricas.csv\\n")
+        return 2
+    with open(argv[1], newline='', encoding='utf-8') as f:
+        rows = [{{name: float(record[name]) for name in FEATURES}} for record in csv.DictReader(f)]
+    writer = csv.writer(sys.stdout)
+    writer.writerow(['prediction', 'confidence'])
+    for probabilities in predict_proba(rows):
+        confidence = max(probabilities)
+        writer.writerow([CLASSES[probabilities.index(confidence)], confidence])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
+'''
+
+
+def _encode(values: np.ndarray, dtype: str) -> str:
+    """Codifica un arreglo en base64 (little-endian) partido en líneas de cadena de Python."""
+    encoded = base64.b64encode(np.ascontiguousarray(values, dtype=np.dtype(dtype).newbyteorder('<')).tobytes()).decode()
+    lines = [encoded[start:start + _LINE_WIDTH] for start in range(0, len(encoded), _LINE_WIDTH)] or ['']
+    return "\n".join(f"    '{line}'" for line in lines)
+
+
+def export_standalone(model: Any, output_path: str, model_name: str = None) -> str:
+    """
+    Genera un módulo de Python autónomo (solo biblioteca estándar) que evalúa el modelo.
+
+    Args:
+        model: RandomForestClassifier, DecisionTreeClassifier o CompiledForest/CompactForest
+            con nombres de características
+        output_path (str): Ruta del .py a generar (el nombre debe ser un identificador válido)
+        model_name (str): Descripción del modelo para la cabecera (opcional)
+
+    Returns:
+        str: Ruta del módulo generado
+    """
+    module_name = os.path.splitext(os.path.basename(output_path))[0]
+    if not module_name.isidentifier():
+        raise ValueError(f"El nombre del módulo no es un identificador de Python válido: {module_name}")
+
+    compiled = CompiledForest.from_model(model)
+    if not hasattr(compiled, 'feature_names_in_'):
+        raise ValueError("El modelo no tiene nombres de características (feature_names_in_)")
+
+    # Umbrales redondeados hacia abajo a float32 (mismas decisiones que scikit-learn para entradas float32)
+    compact = compiled if isinstance(compiled, CompactForest) else CompactForest.from_model(compiled, leaf_dtype='float32')
+
+    value = np.asarray(compiled.value, dtype=np.float64)
+    if isinstance(compiled, CompactForest) and compiled.leaf_scale:
+        value = value / compiled.leaf_scale
+
+    # Las hojas se marcan con -1 (en CompiledForest apuntan a sí mismas)
+    left = np.asarray(compiled.children_left, dtype=np.int64)
+    right = np.asarray(compiled.children_right, dtype=np.int64)
+    is_leaf = left == np.arange(len(left))
+    left = np.where(is_leaf, -1, left).astype(np.int32)
+    right = np.where(is_leaf, -1, right).astype(np.int32)
+
+    source = _MODULE_TEMPLATE.format(
+        model_name=model_name or type(model).__name__,
+        generated_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        module_name=module_name,
+        features=tuple(str(name) for name in compiled.feature_names_in_),
+        classes=tuple(compiled.classes_.tolist()),
+        n_trees=compiled.n_trees,
+        average=bool(compiled.average),
+        n_features=compiled.n_features_in_,
+        feature=_encode(compiled.feature, 'u1'),
+        threshold=_encode(compact.threshold, 'f4'),
+        left=_encode(left, 'i4'),
+        right=_encode(right, 'i4'),
+        value=_encode(value.ravel(), 'f8'),
+        roots=tuple(int(root) for root in compiled.roots)
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(source)
+    return output_path
+
+
+def load_standalone(module_path: str) -> Any:
+    """
+    Importa un módulo generado por export_standalone.
+
+    Args:
+        module_path (str): Ruta del .py generado
+
+    Returns:
+        Módulo con FEATURES, CLASSES, predict_proba y predict
+    """
+    if not os.path.exists(module_path):
+        raise FileNotFoundError(f"No se encontró el módulo: {module_path}")
+    module_name = os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(module_name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def check_standalone_parity(module: Any, model: Any, X: Any) -> Dict:
+    """
+    Compara el módulo autónomo con el modelo original.
+
+    Args:
+        module: Módulo cargado con load_standalone
+        model: Modelo original
+        X: DataFrame con las métricas (las columnas que no son características se ignoran)
+
+    Returns:
+        Dict: Si las probabilidades son idénticas, diferencia máxima y proporción de predicciones iguales
+    """
+    X = X[list(module.FEATURES)]
+    rows = X.to_numpy(dtype=np.float64).tolist()
+    actual = np.array(module.predict_proba(rows), dtype=np.float64).reshape(len(rows), len(module.CLASSES))
+    expected = model.predict_proba(X)
+    return {
+        'identical': bool(np.array_equal(expected, actual)),
+        'max_probability_diff': float(np.max(np.abs(expected - actual))) if len(rows) else 0.0,
+        'prediction_agreement': float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1))) if len(rows) else 1.0
+    }
@@ -0,0 +1,102 @@
+# core/streaming.py
+
+import numpy as np
+from typing import Dict
+
+
+class StreamingSummary:
+    """
+    Acumula de forma incremental el resumen de predicciones de un análisis por bloques.
+
+    Las estadísticas de confianza se combinan bloque a bloque (media y varianza con
+    el algoritmo de Chan), por lo que la memoria es constante sin importar el tamaño
+    de la entrada.
+    """
+
+    def __init__(self):
+        """Inicializa el acumulador vacío."""
+        self.num_samples = 0
+        self.optimal_count = 0
+        self.suboptimal_count = 0
+        self.num_chunks = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._min = np.inf
+        self._max = -np.inf
+
+    def update(self, predictions: np.ndarray, probabilities: np.ndarray):
+        """
+        Incorpora las predicciones de un bloque.
+
+        Args:
+            predictions: Predicciones del bloque
+            probabilities: Probabilidades del bloque
+        """
+        predictions = np.asarray(predictions)
+        count = len(predictions)
+        if count == 0:
+            return
+
+        confidence = np.max(probabilities, axis=1)
+        chunk_mean = float(confidence.mean())
+        chunk_m2 = float(np.square(confidence - chunk_mean).sum())
+
+        total = self.num_samples + count
+        delta = chunk_mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += chunk_m2 + delta * delta * self.num_samples * count / total
+
+        self._min = min(self._min, float(confidence.min()))
+        self._max = max(self._max, float(confidence.max()))
+        self.num_samples = total
+        self.optimal_count += int(np.count_nonzero(predictions == 1))
+        self.suboptimal_count += int(np.count_nonzero(predictions == 0))
+        self.num_chunks += 1
+
+    def merge(self, other: 'StreamingSummary') -> 'StreamingSummary':
+        """
+        Combina otro acumulador (por ejemplo, de otro proceso) con este.
+
+        Args:
+            other: Acumulador a combinar
+
+        Returns:
+            StreamingSummary: Este mismo acumulador actualizado
+        """
+        if other.num_samples == 0:
+            return self
+
+        total = self.num_samples + other.num_samples
+        delta = other._mean - self._mean
+        self._mean += delta * other.num_samples / total
+        self._m2 += other._m2 + delta * delta * self.num_samples * other.num_samples / total
+
+        self._min = min(self._min, other._min)
+        self._max = max(self._max, other._max)
+        self.num_samples = total
+        self.optimal_count += other.optimal_count
+        self.suboptimal_count += other.suboptimal_count
+        self.num_chunks += other.num_chunks
+        return self
+
+    def to_dict(self) -> Dict:
+        """
+        Devuelve el resumen con el mismo formato que ModelTester.analyze_predictions.
+
+        Returns:
+            Dict: 'confidence_analysis', 'prediction_counts' y 'num_samples'
+        """
+        empty = self.num_samples == 0
+        return {
+            'confidence_analysis': {
+                'mean_confidence': np.nan if empty else self._mean,
+                'min_confidence': np.nan if empty else self._min,
+                'max_confidence': np.nan if empty else self._max,
+                'std_confidence': np.sqrt(self._m2 / (self.num_samples - 1)) if self.num_samples > 1 else np.nan
+            },
+            'prediction_counts': {
+                'optimal_count': self.optimal_count,
+                'suboptimal_count': self.suboptimal_count
+            },
+            'num_samples': self.num_samples
+        }
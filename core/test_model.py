@@ -3,7 +3,7 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, Any
-from sklearn.metrics import classification_report, confusion_matrix
+from core.instrumentation import timings, timed
 
 class ModelTester:
     """
@@ -37,9 +37,13 @@ class ModelTester:
         if len(expected_columns) == 0:
             raise ValueError("El DataFrame de prueba no contiene las métricas necesarias")
 
-        # Hacer predicciones
-        predictions = model.predict(test_data)
-        probabilities = model.predict_proba(test_data)
+        # Recorrer el modelo una sola vez y derivar las etiquetas de las probabilidades
+        with timings.span('test_model.predict'):
+            probabilities = model.predict_proba(test_data)
+            if hasattr(model, 'classes_'):
+                predictions = model.classes_.take(np.argmax(probabilities, axis=1), axis=0)
+            else:
+                predictions = model.predict(test_data)
 
         results = {
             'predictions': predictions,
@@ -49,8 +53,9 @@ class ModelTester:
 
         # Si tenemos etiquetas reales, calcular métricas
         if true_labels is not None:
+            from sklearn.metrics import classification_report, confusion_matrix
             results.update({
-                'accuracy': model.score(test_data, true_labels),
+                'accuracy': float(np.mean(predictions == np.asarray(true_labels))),
                 'classification_report': classification_report(
                     true_labels,
                     predictions,
@@ -64,10 +69,12 @@ class ModelTester:
 
         return results
 
+    @timed('analyze_predictions')
     def analyze_predictions(self,
                           test_data: pd.DataFrame,
                           predictions: np.ndarray,
-                          probabilities: np.ndarray) -> Dict:
+                          probabilities: np.ndarray,
+                          full_results: bool = True) -> Dict:
         """
         Analiza las predicciones en detalle.
 
@@ -75,57 +82,66 @@ class ModelTester:
             test_data: Datos de prueba
             predictions: Predicciones del modelo
             probabilities: Probabilidades de las predicciones
+            full_results: Si es True incluye una copia completa de los datos con las
+                predicciones ('full_results'); si es False se omite para no duplicar la memoria
 
         Returns:
             Dict: Análisis detallado de las predicciones
         """
-        # Combinar datos con predicciones
-        results_df = test_data.copy()
-        results_df['predicted_label'] = predictions
-        results_df['confidence'] = np.max(probabilities, axis=1)
+        predictions = np.asarray(predictions)
+        confidence = pd.Series(np.max(probabilities, axis=1), index=test_data.index)
 
         # Análisis de confianza
         confidence_analysis = {
-            'mean_confidence': results_df['confidence'].mean(),
-            'min_confidence': results_df['confidence'].min(),
-            'max_confidence': results_df['confidence'].max(),
-            'std_confidence': results_df['confidence'].std()
+            'mean_confidence': confidence.mean(),
+            'min_confidence': confidence.min(),
+            'max_confidence': confidence.max(),
+            'std_confidence': confidence.std()
         }
 
         # Contar predicciones por clase
         prediction_counts = {
-            'optimal_count': sum(predictions == 1),
-            'suboptimal_count': sum(predictions == 0)
+            'optimal_count': int(np.count_nonzero(predictions == 1)),
+            'suboptimal_count': int(np.count_nonzero(predictions == 0))
         }
 
-        # Identificar casos de baja confianza
+        # Identificar casos de baja confianza (solo se copian esas filas)
         low_confidence_threshold = 0.7
-        low_confidence_cases = results_df[
-            results_df['confidence'] < low_confidence_threshold
-        ]
+        low_confidence_mask = (confidence < low_confidence_threshold).to_numpy()
+        low_confidence_cases = test_data[low_confidence_mask].assign(
+            predicted_label=predictions[low_confidence_mask],
+            confidence=confidence[low_confidence_mask]
+        )
+
+        # Análisis por característica: medias y desviaciones por clase en una sola pasada agrupada
+        features = [feature for feature in test_data.columns if feature != 'is_optimal']
+        moments = test_data[features].groupby(predictions).agg(['mean', 'std']).reindex([1, 0])
 
-        # Análisis por característica
         feature_analysis = {}
-        for feature in test_data.columns:
-            if feature != 'is_optimal':
-                optimal_values = results_df[results_df['predicted_label'] == 1][feature]
-                suboptimal_values = results_df[results_df['predicted_label'] == 0][feature]
-
-                feature_analysis[feature] = {
-                    'optimal_mean': optimal_values.mean(),
-                    'optimal_std': optimal_values.std(),
-                    'suboptimal_mean': suboptimal_values.mean(),
-                    'suboptimal_std': suboptimal_values.std()
-                }
-
-        return {
+        for feature in features:
+            feature_analysis[feature] = {
+                'optimal_mean': moments.at[1, (feature, 'mean')],
+                'optimal_std': moments.at[1, (feature, 'std')],
+                'suboptimal_mean': moments.at[0, (feature, 'mean')],
+                'suboptimal_std': moments.at[0, (feature, 'std')]
+            }
+
+        analysis = {
             'confidence_analysis': confidence_analysis,
             'prediction_counts': prediction_counts,
             'low_confidence_cases': low_confidence_cases,
             'feature_analysis': feature_analysis,
-            'full_results': results_df
+            'full_results': None
         }
 
+        if full_results:
+            analysis['full_results'] = test_data.assign(
+                predicted_label=predictions,
+                confidence=confidence
+            )
+
+        return analysis
+
 if __name__ == "__main__":
     # Ejemplo de uso
     from sklearn.ensemble import RandomForestClassifier
@@ -2,11 +2,52 @@
 
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.tree import DecisionTreeClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split, ParameterGrid, ParameterSampler
 from sklearn.metrics import confusion_matrix, classification_report
+from concurrent.futures import ProcessPoolExecutor
+import os
+import copy
+import json
+import math
+import time
+from datetime import datetime
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple, Any
+from typing import Dict, List, Tuple, Any
+from core.metrics_schema import downcast_metrics, TARGET_COLUMN
+from core.binned_boosting import BinnedHistGradientBoosting
+from core.distillation import FastPathTree, build_transfer_set
+from core.out_of_core import ReservoirSampler, holdout_mask, report_from_confusion
+from utils.dataset_io import iter_metrics
+
+# Datos de la búsqueda cargados una sola vez por proceso trabajador
+_search_data = None
+
+
+def _init_search_worker(estimator: Any, X_fit: np.ndarray, y_fit: np.ndarray, X_val: np.ndarray, y_val: np.ndarray):
+    """Inicializa un proceso de la búsqueda con el estimador base y los datos de ajuste y validación."""
+    global _search_data
+    _search_data = (estimator, X_fit, y_fit, X_val, y_val)
+
+
+def _evaluate_candidate(params: Dict, num_rows: int) -> Tuple[float, float]:
+    """
+    Entrena un candidato con las primeras filas del conjunto de ajuste y lo puntúa en validación.
+
+    Args:
+        params (Dict): Hiperparámetros del candidato
+        num_rows (int): Número de filas de entrenamiento de esta ronda
+
+    Returns:
+        Tuple[float, float]: (precisión en validación, segundos de entrenamiento)
+    """
+    estimator, X_fit, y_fit, X_val, y_val = _search_data
+    model = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    model.fit(X_fit[:num_rows], y_fit[:num_rows])
+    fit_time = time.perf_counter() - start
+    return float(model.score(X_val, y_val)), fit_time
 
 class ModelTrainer:
     """
@@ -23,8 +64,36 @@ class ModelTrainer:
         self.random_state = random_state
         self.models = {
             'random_forest': RandomForestClassifier(random_state=random_state),
-            'decision_tree': DecisionTreeClassifier(random_state=random_state)
+            'decision_tree': DecisionTreeClassifier(random_state=random_state),
+            'hist_gradient_boosting': BinnedHistGradientBoosting(random_state=random_state)
         }
+        self.search_spaces = {}
+        self.tuning_config = {}
+
+    @classmethod
+    def from_config(cls, config_path: str) -> 'ModelTrainer':
+        """
+        Crea un entrenador con los hiperparámetros y espacios de búsqueda de config/parameters.json.
+
+        Args:
+            config_path (str): Ruta al archivo JSON de configuración
+
+        Returns:
+            ModelTrainer: Entrenador configurado
+        """
+        if not os.path.exists(config_path):
+            raise FileNotFoundError(f"No se encontró el archivo de configuración: {config_path}")
+
+        with open(config_path, encoding='utf-8') as f:
+            config = json.load(f)
+
+        trainer = cls(random_state=config.get('training', {}).get('random_state', 42))
+        for model_type, params in config.get('models', {}).items():
+            if model_type in trainer.models:
+                trainer.set_model_params(model_type, params)
+        trainer.search_spaces = config.get('search_spaces', {})
+        trainer.tuning_config = config.get('tuning', {})
+        return trainer
 
     def train_model(self,
                    data: pd.DataFrame,
@@ -35,7 +104,7 @@ class ModelTrainer:
 
         Args:
             data (pd.DataFrame): DataFrame con las métricas y etiquetas
-            model_type (str): Tipo de modelo ('random_forest' o 'decision_tree')
+            model_type (str): Tipo de modelo ('random_forest', 'decision_tree' o 'hist_gradient_boosting')
             test_size (float): Proporción de datos para pruebas
 
         Returns:
@@ -52,6 +121,9 @@ class ModelTrainer:
         if 'is_optimal' not in data.columns:
             raise ValueError("El DataFrame debe contener la columna 'is_optimal'")
 
+        # Entrenar sobre la representación compacta (sin copia si ya lo está)
+        data = downcast_metrics(data)
+
         X = data.drop(['is_optimal'], axis=1)
         y = data['is_optimal']
 
@@ -73,6 +145,7 @@ class ModelTrainer:
 
         # Métricas de evaluación
         metrics = {
+            'model_type': model_type,
             'train_score': train_score,
             'test_score': test_score,
             'confusion_matrix': confusion_matrix(y_test, y_pred),
@@ -83,9 +156,310 @@ class ModelTrainer:
             # Importancia de características para Random Forest
             feature_importance = dict(zip(X.columns, model.feature_importances_))
             metrics['feature_importance'] = feature_importance
+        elif model_type == 'hist_gradient_boosting':
+            # El boosting no tiene importancias por impureza: se estiman por permutación
+            metrics['feature_importance'] = model.permutation_importance(X_test, y_test)
 
         return model, metrics
 
+    def train_out_of_core(self,
+                          data_path: str,
+                          model_type: str = 'random_forest',
+                          chunksize: int = 100000,
+                          sample_size: int = 200000,
+                          num_reservoirs: int = None,
+                          test_size: float = 0.2) -> Tuple[Any, Dict]:
+        """
+        Entrena un modelo leyendo los datos por bloques, con un consumo de memoria acotado.
+
+        Primera pasada: cada fila se asigna al holdout o a entrenamiento según un hash
+        de su posición, y las de entrenamiento alimentan varios depósitos de muestreo
+        uniforme (ReservoirSampler). Los árboles del bosque se reparten entre los
+        depósitos y se entrenan por tandas con warm start (un árbol de decisión usa un
+        único depósito). Segunda pasada: se evalúa el holdout acumulando la matriz de
+        confusión bloque a bloque.
+
+        La memoria depende de chunksize, sample_size y num_reservoirs, no del tamaño del archivo.
+
+        Args:
+            data_path (str): Ruta a un .csv, un directorio .cols o un .parquet
+            model_type (str): Tipo de modelo ('random_forest', 'decision_tree' o 'hist_gradient_boosting')
+            chunksize (int): Filas por bloque leído
+            sample_size (int): Filas de cada depósito
+            num_reservoirs (int): Número de depósitos (por defecto, hasta 10 para random_forest)
+            test_size (float): Proporción de filas reservadas para evaluación
+
+        Returns:
+            Tuple[Any, Dict]: Modelo entrenado y métricas de evaluación (detalle en 'out_of_core')
+        """
+        if model_type not in self.models:
+            raise ValueError(f"Tipo de modelo no válido. Opciones: {list(self.models.keys())}")
+
+        model = clone(self.models[model_type])
+        if model_type == 'random_forest':
+            num_reservoirs = min(num_reservoirs or 10, model.n_estimators)
+        else:
+            num_reservoirs = 1
+
+        # Primera pasada: reparto entrenamiento/holdout y muestreo de las filas de entrenamiento
+        sampler = None
+        holdout_rows = 0
+        for chunk in iter_metrics(data_path, chunksize, require_target=True):
+            if sampler is None:
+                feature_columns = [column for column in chunk.columns if column != TARGET_COLUMN]
+                sampler = ReservoirSampler(feature_columns, sample_size, num_reservoirs, seed=self.random_state)
+
+            in_holdout = holdout_mask(chunk.index.to_numpy(), test_size, seed=self.random_state)
+            holdout_rows += int(in_holdout.sum())
+            train_chunk = chunk[~in_holdout]
+            sampler.add(train_chunk[feature_columns], train_chunk[TARGET_COLUMN])
+
+        if sampler is None or sampler.rows_seen == 0:
+            raise ValueError(f"No hay filas de entrenamiento en {data_path}")
+
+        # Entrenamiento: cada depósito aporta su tanda de árboles
+        trees_per_reservoir = [len(part) for part in np.array_split(np.arange(getattr(model, 'n_estimators', 1)), num_reservoirs)]
+        classes = None
+        for reservoir, num_trees in enumerate(trees_per_reservoir):
+            X_sample, y_sample = sampler.sample(reservoir)
+            sample_classes = np.unique(y_sample)
+            if classes is None:
+                classes = sample_classes
+            elif not np.array_equal(sample_classes, classes):
+                raise ValueError("Todos los depósitos deben contener las mismas clases; aumenta sample_size")
+
+            if model_type == 'random_forest':
+                grown = len(model.estimators_) if reservoir else 0
+                model.set_params(warm_start=reservoir > 0, n_estimators=grown + num_trees)
+            model.fit(X_sample, y_sample)
+        if model_type == 'random_forest':
+            model.set_params(warm_start=False)
+
+        X_sample, y_sample = sampler.sample(0)
+        train_score = model.score(X_sample, y_sample)
+
+        # Segunda pasada: evaluación del holdout sin guardar sus predicciones
+        matrix = np.zeros((len(model.classes_), len(model.classes_)), dtype=np.int64)
+        for chunk in iter_metrics(data_path, chunksize, require_target=True):
+            in_holdout = holdout_mask(chunk.index.to_numpy(), test_size, seed=self.random_state)
+            if in_holdout.any():
+                holdout = chunk[in_holdout]
+                y_pred = model.predict(holdout[feature_columns])
+                matrix += confusion_matrix(holdout[TARGET_COLUMN], y_pred, labels=model.classes_)
+
+        metrics = {
+            'model_type': model_type,
+            'train_score': train_score,
+            'test_score': np.trace(matrix) / matrix.sum() if matrix.sum() else float('nan'),
+            'confusion_matrix': matrix,
+            'classification_report': report_from_confusion(matrix, model.classes_.tolist()),
+            'out_of_core': {
+                'rows_seen': sampler.rows_seen + holdout_rows,
+                'train_rows': sampler.rows_seen,
+                'holdout_rows': holdout_rows,
+                'sample_size': sample_size,
+                'num_reservoirs': num_reservoirs,
+                'trees_per_reservoir': trees_per_reservoir,
+                'chunksize': chunksize,
+                'reservoir_bytes': sampler.nbytes
+            }
+        }
+
+        if model_type == 'random_forest':
+            metrics['feature_importance'] = dict(zip(feature_columns, model.feature_importances_))
+
+        return model, metrics
+
+    def grow_model(self,
+                   model: Any,
+                   data: pd.DataFrame,
+                   previous_metadata: Dict = None,
+                   n_new_trees: int = 10,
+                   max_trees: int = None,
+                   batch_id: str = None,
+                   test_size: float = 0.2) -> Tuple[Any, Dict]:
+        """
+        Añade árboles a un Random Forest existente entrenándolos solo con un lote de datos nuevos (warm start).
+
+        El modelo recibido no se modifica: se devuelve una copia que comparte los
+        árboles ya entrenados y añade los nuevos. Si se indica max_trees, se
+        descartan los árboles más antiguos. Los metadatos registran qué lote
+        aportó cada árbol que sigue en el ensamble.
+
+        Args:
+            model: RandomForestClassifier entrenado
+            data (pd.DataFrame): Lote nuevo con las métricas y 'is_optimal'
+            previous_metadata (Dict): Metadatos guardados del modelo (opcional)
+            n_new_trees (int): Número de árboles a añadir
+            max_trees (int): Tamaño máximo del ensamble (opcional)
+            batch_id (str): Identificador del lote (por defecto, la fecha y hora)
+            test_size (float): Proporción del lote reservada para evaluar el modelo resultante
+
+        Returns:
+            Tuple[Any, Dict]: Modelo ampliado y métricas con el historial en 'training_batches'
+        """
+        if not isinstance(model, RandomForestClassifier):
+            raise TypeError("El crecimiento incremental solo está disponible para modelos random_forest")
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError("Los datos deben ser un DataFrame de pandas")
+        if 'is_optimal' not in data.columns:
+            raise ValueError("El DataFrame debe contener la columna 'is_optimal'")
+        if n_new_trees < 1:
+            raise ValueError("n_new_trees debe ser al menos 1")
+
+        data = downcast_metrics(data)
+        X = data.drop(['is_optimal'], axis=1)
+        y = data['is_optimal']
+
+        if hasattr(model, 'feature_names_in_') and list(X.columns) != list(model.feature_names_in_):
+            raise ValueError(f"Las columnas del lote no coinciden con las del modelo: {list(model.feature_names_in_)}")
+        if not np.array_equal(np.unique(y), model.classes_):
+            raise ValueError(f"El lote debe contener todas las clases del modelo: {model.classes_.tolist()}")
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=self.random_state
+        )
+
+        previous_metadata = previous_metadata or {}
+        # Árboles entrenados en toda la historia del modelo, incluidos los ya descartados por max_trees
+        trees_grown = previous_metadata.get('trees_grown') or len(model.estimators_)
+
+        # Copia superficial: los árboles existentes se comparten y solo se entrenan los nuevos
+        grown = copy.copy(model)
+        grown.estimators_ = list(model.estimators_)
+        grown.set_params(warm_start=True, n_estimators=len(grown.estimators_) + n_new_trees)
+        seed = model.random_state
+        if isinstance(seed, (int, np.integer)):
+            # Con warm start, scikit-learn salta una semilla por árbol conservado y usa las siguientes;
+            # tras descartar árboles eso repetiría las semillas de árboles que siguen en el ensamble.
+            # Se saltan también las de los descartados para que cada árbol nuevo tenga una semilla nueva
+            random_state = np.random.RandomState(seed)
+            random_state.randint(np.iinfo(np.int32).max, size=trees_grown - len(model.estimators_))
+            grown.set_params(random_state=random_state)
+        grown.fit(X_train, y_train)
+        grown.set_params(warm_start=False, random_state=seed)
+
+        # Lote que aportó cada árbol (el modelo inicial cuenta como un lote)
+        tree_batches = list(previous_metadata.get('tree_batches') or ['initial'] * len(model.estimators_))
+        batches = [dict(batch) for batch in previous_metadata.get('training_batches') or [
+            {'batch_id': 'initial', 'num_rows': None, 'added_at': previous_metadata.get('saved_at')}
+        ]]
+
+        batch_id = batch_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        tree_batches.extend([batch_id] * n_new_trees)
+        batches.append({'batch_id': batch_id, 'num_rows': len(X_train), 'added_at': str(datetime.now())})
+
+        # Descartar los árboles más antiguos para acotar el ensamble
+        if max_trees is not None and len(grown.estimators_) > max_trees:
+            grown.estimators_ = grown.estimators_[-max_trees:]
+            grown.n_estimators = max_trees
+            tree_batches = tree_batches[-max_trees:]
+
+        for batch in batches:
+            batch['num_trees'] = tree_batches.count(batch['batch_id'])
+
+        y_pred = grown.predict(X_test)
+        metrics = {
+            'model_type': 'random_forest',
+            'train_score': grown.score(X_train, y_train),
+            'test_score': grown.score(X_test, y_test),
+            'confusion_matrix': confusion_matrix(y_test, y_pred),
+            'classification_report': classification_report(y_test, y_pred, output_dict=True),
+            'feature_importance': dict(zip(X.columns, grown.feature_importances_)),
+            'tree_batches': tree_batches,
+            'training_batches': batches,
+            'trees_grown': trees_grown + n_new_trees
+        }
+
+        return grown, metrics
+
+    def distill_model(self,
+                      teacher: Any,
+                      num_samples: int = 200000,
+                      max_depth: int = 8,
+                      min_samples_leaf: int = 20,
+                      mix_fraction: float = 0.5,
+                      eval_data: pd.DataFrame = None,
+                      test_size: float = 0.2) -> Tuple[Any, Dict]:
+        """
+        Destila un modelo (p.ej. un Random Forest) en un árbol de decisión pequeño y rápido.
+
+        El sustituto se entrena con métricas sintéticas (build_transfer_set) etiquetadas
+        por el maestro. La fidelidad es la proporción de filas en las que ambos
+        coinciden: en una partición sintética reservada y, si se indica, en datos reales
+        (con 'is_optimal' también se informa la precisión de ambos).
+
+        Args:
+            teacher: Modelo entrenado con feature_names_in_
+            num_samples (int): Filas sintéticas generadas
+            max_depth (int): Profundidad máxima del árbol sustituto
+            min_samples_leaf (int): Mínimo de filas por hoja del sustituto
+            mix_fraction (float): Proporción de filas sintéticas con columnas barajadas
+            eval_data (pd.DataFrame): Datos reales para medir la fidelidad (opcional)
+            test_size (float): Proporción sintética reservada para medir la fidelidad
+
+        Returns:
+            Tuple[Any, Dict]: Árbol sustituto y métricas con el detalle en 'distillation'
+        """
+        if not hasattr(teacher, 'feature_names_in_'):
+            raise ValueError("El modelo maestro no tiene nombres de características (feature_names_in_)")
+
+        feature_names = list(teacher.feature_names_in_)
+        transfer = downcast_metrics(build_transfer_set(num_samples, mix_fraction, self.random_state))[feature_names]
+        labels = teacher.predict(transfer)
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            transfer, labels, test_size=test_size, random_state=self.random_state
+        )
+        surrogate = DecisionTreeClassifier(
+            max_depth=max_depth, min_samples_leaf=min_samples_leaf, random_state=self.random_state
+        )
+        surrogate.fit(X_train, y_train)
+        y_pred = surrogate.predict(X_test)
+
+        distillation = {
+            'teacher_class': type(teacher).__name__,
+            'num_samples': len(transfer),
+            'mix_fraction': mix_fraction,
+            'max_depth': surrogate.get_depth(),
+            'num_leaves': int(surrogate.get_n_leaves()),
+            'fidelity_synthetic': float(np.mean(y_pred == y_test))
+        }
+
+        if eval_data is not None:
+            eval_data = downcast_metrics(eval_data)
+            X_eval = eval_data[feature_names]
+            teacher_eval = teacher.predict(X_eval)
+            surrogate_eval = surrogate.predict(X_eval)
+            distillation['fidelity_data'] = float(np.mean(teacher_eval == surrogate_eval))
+            if 'is_optimal' in eval_data.columns:
+                distillation['teacher_accuracy'] = float(np.mean(teacher_eval == eval_data['is_optimal'].to_numpy()))
+                distillation['surrogate_accuracy'] = float(np.mean(surrogate_eval == eval_data['is_optimal'].to_numpy()))
+
+        # Latencia de una fila por la ruta rápida (mediana sobre filas de la partición reservada)
+        fast_path = FastPathTree.from_model(surrogate)
+        records = X_test.iloc[:1000].to_dict('records')
+        latencies = []
+        for record in records:
+            start = time.perf_counter()
+            fast_path.predict_one(record)
+            latencies.append(time.perf_counter() - start)
+        distillation['fast_path_latency_us'] = float(np.median(latencies) * 1e6) if latencies else None
+
+        # Las métricas comparan el sustituto con las etiquetas del maestro
+        metrics = {
+            'model_type': 'decision_tree',
+            'role': 'fast_path',
+            'train_score': surrogate.score(X_train, y_train),
+            'test_score': distillation['fidelity_synthetic'],
+            'confusion_matrix': confusion_matrix(y_test, y_pred),
+            'classification_report': classification_report(y_test, y_pred, output_dict=True),
+            'feature_importance': dict(zip(feature_names, surrogate.feature_importances_)),
+            'distillation': distillation
+        }
+
+        return surrogate, metrics
+
     def get_model_params(self, model_type: str) -> Dict:
         """
         Obtiene los parámetros actuales del modelo.
@@ -112,4 +486,159 @@ class ModelTrainer:
         if model_type not in self.models:
             raise ValueError(f"Tipo de modelo no válido. Opciones: {list(self.models.keys())}")
 
-        self.models[model_type].set_params(**params)
\ No newline at end of file
+        self.models[model_type].set_params(**params)
+
+    def tune_model(self,
+                   data: pd.DataFrame,
+                   model_type: str = 'random_forest',
+                   search_space: Dict[str, List] = None,
+                   factor: int = None,
+                   max_candidates: int = None,
+                   min_resources: int = None,
+                   workers: int = None,
+                   test_size: float = 0.2) -> Tuple[Any, Dict]:
+        """
+        Busca los mejores hiperparámetros con successive halving y entrena el modelo ganador.
+
+        Todos los candidatos se evalúan primero con pocas filas; en cada ronda solo
+        sobrevive 1/factor de ellos y el número de filas se multiplica por factor,
+        hasta usar todo el conjunto de ajuste. Los candidatos de cada ronda se
+        reparten entre un pool de procesos. La partición de prueba es la misma que
+        en train_model y no interviene en la búsqueda (se valida sobre una partición
+        interna del conjunto de entrenamiento).
+
+        Args:
+            data (pd.DataFrame): DataFrame con las métricas y etiquetas
+            model_type (str): Tipo de modelo ('random_forest', 'decision_tree' o 'hist_gradient_boosting')
+            search_space (Dict[str, List]): Valores por hiperparámetro (por defecto, los de la configuración)
+            factor (int): Proporción de candidatos descartados por ronda (por defecto 3)
+            max_candidates (int): Número máximo de combinaciones (se muestrean si hay más)
+            min_resources (int): Filas de la primera ronda (por defecto, las necesarias para
+                llegar al conjunto completo en la última)
+            workers (int): Número de procesos (por defecto, todos los núcleos)
+            test_size (float): Proporción de datos para pruebas
+
+        Returns:
+            Tuple[Any, Dict]: Modelo ganador y métricas de evaluación con el detalle de la búsqueda en 'search'
+        """
+        if model_type not in self.models:
+            raise ValueError(f"Tipo de modelo no válido. Opciones: {list(self.models.keys())}")
+        if not isinstance(data, pd.DataFrame):
+            raise TypeError("Los datos deben ser un DataFrame de pandas")
+        if 'is_optimal' not in data.columns:
+            raise ValueError("El DataFrame debe contener la columna 'is_optimal'")
+
+        search_space = search_space or self.search_spaces.get(model_type)
+        if not search_space:
+            raise ValueError(f"No hay espacio de búsqueda definido para el modelo: {model_type}")
+        factor = factor or self.tuning_config.get('factor', 3)
+        if factor < 2:
+            raise ValueError("El factor de successive halving debe ser al menos 2")
+        max_candidates = max_candidates or self.tuning_config.get('max_candidates')
+        validation_size = self.tuning_config.get('validation_size', 0.2)
+
+        # Candidatos: la malla completa o una muestra reproducible si es demasiado grande
+        grid = ParameterGrid(search_space)
+        if max_candidates and len(grid) > max_candidates:
+            candidates = list(ParameterSampler(search_space, max_candidates, random_state=self.random_state))
+        else:
+            candidates = list(grid)
+
+        # Misma partición de prueba que train_model; la validación sale del conjunto de entrenamiento
+        data = downcast_metrics(data)
+        X = data.drop(['is_optimal'], axis=1)
+        y = data['is_optimal']
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=test_size, random_state=self.random_state
+        )
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X_train, y_train, test_size=validation_size, random_state=self.random_state
+        )
+
+        # Las rondas toman prefijos de una permutación fija del conjunto de ajuste
+        order = np.random.RandomState(self.random_state).permutation(len(X_fit))
+        X_fit_rows = X_fit.to_numpy(dtype=np.float32)[order]
+        y_fit_rows = y_fit.to_numpy()[order]
+
+        num_rounds = 1 + int(math.floor(math.log(len(candidates)) / math.log(factor))) if len(candidates) > 1 else 1
+        if min_resources is None:
+            min_resources = max(len(X_fit_rows) // factor ** (num_rounds - 1), 50)
+        min_resources = min(min_resources, len(X_fit_rows))
+
+        workers = workers or os.cpu_count() or 1
+        history = []
+        survivors = list(range(len(candidates)))
+        executor = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=min(workers, len(candidates)),
+                initializer=_init_search_worker,
+                initargs=(self.models[model_type], X_fit_rows, y_fit_rows,
+                          X_val.to_numpy(dtype=np.float32), y_val.to_numpy())
+            )
+        else:
+            _init_search_worker(self.models[model_type], X_fit_rows, y_fit_rows,
+                                X_val.to_numpy(dtype=np.float32), y_val.to_numpy())
+
+        try:
+            round_index = 0
+            while True:
+                num_rows = min(min_resources * factor ** round_index, len(X_fit_rows))
+                params = [candidates[i] for i in survivors]
+                if executor is not None:
+                    scores = list(executor.map(_evaluate_candidate, params, [num_rows] * len(params)))
+                else:
+                    scores = [_evaluate_candidate(p, num_rows) for p in params]
+
+                for candidate, (score, fit_time) in zip(survivors, scores):
+                    history.append({
+                        'round': round_index,
+                        'candidate': candidate,
+                        'params': candidates[candidate],
+                        'num_rows': num_rows,
+                        'score': score,
+                        'fit_time': fit_time
+                    })
+
+                # Orden estable: ante empate gana el candidato anterior
+                ranking = sorted(range(len(survivors)), key=lambda i: -scores[i][0])
+                if len(survivors) == 1 or num_rows == len(X_fit_rows):
+                    best = survivors[ranking[0]]
+                    best_score = scores[ranking[0]][0]
+                    break
+                survivors = [survivors[i] for i in ranking[:max(1, math.ceil(len(survivors) / factor))]]
+                round_index += 1
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # Entrenar el ganador con todo el conjunto de entrenamiento y evaluarlo en la partición de prueba
+        best_params = candidates[best]
+        model = clone(self.models[model_type]).set_params(**best_params)
+        model.fit(X_train, y_train)
+        y_pred = model.predict(X_test)
+
+        metrics = {
+            'model_type': model_type,
+            'train_score': model.score(X_train, y_train),
+            'test_score': model.score(X_test, y_test),
+            'confusion_matrix': confusion_matrix(y_test, y_pred),
+            'classification_report': classification_report(y_test, y_pred, output_dict=True),
+            'search': {
+                'method': 'successive_halving',
+                'best_params': best_params,
+                'best_validation_score': best_score,
+                'num_candidates': len(candidates),
+                'num_rounds': round_index + 1,
+                'factor': factor,
+                'min_resources': min_resources,
+                'fits': len(history),
+                'history': history
+            }
+        }
+        if model_type == 'random_forest':
+            metrics['feature_importance'] = dict(zip(X.columns, model.feature_importances_))
+        elif model_type == 'hist_gradient_boosting':
+            metrics['feature_importance'] = model.permutation_importance(X_test, y_test)
+
+        return model, metrics
\ No newline at end of file
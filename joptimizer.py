@@ -0,0 +1,123 @@
+# joptimizer.py Punto de entrada único de la línea de comandos de JOptimizer-AI
+#
+# Uso:
+#     python joptimizer.py <subcomando> [opciones]
+#     python joptimizer.py train --data data/train/code_metrics.csv
+#     python joptimizer.py list-models --type random_forest
+#
+# Cada subcomando importa su módulo solo cuando se ejecuta, de modo que list-models
+# o la evaluación de un modelo no cargan scikit-learn ni el código de entrenamiento.
+
+import os
+import sys
+import argparse
+import importlib
+
+PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+# Subcomando -> (módulo con main(), descripción)
+SUBCOMMANDS = {
+    'train': ('scripts.run_training', 'Entrenar, ajustar o hacer crecer un modelo'),
+    'test': ('scripts.run_testing', 'Evaluar un modelo con datos etiquetados'),
+    'analyze': ('scripts.run_production_test', 'Analizar métricas de producción con un modelo'),
+    'generate': ('scripts.generate_balanced_data', 'Generar un conjunto de datos balanceado'),
+    'extract': ('scripts.extract_metrics', 'Extraer métricas de un árbol de código Java'),
+    'convert': ('scripts.convert_dataset', 'Convertir un CSV al formato columnar binario'),
+    'serve': ('scripts.run_server', 'Iniciar el servidor de inferencia'),
+    'benchmark': ('scripts.run_benchmarks', 'Medir el rendimiento'),
+    'distill': ('scripts.distill_model', 'Destilar un modelo en un árbol rápido'),
+    'export-compact': ('scripts.export_compact', 'Exportar un modelo al formato compacto'),
+    'export-standalone': ('scripts.export_standalone', 'Exportar un predictor autónomo en Python puro')
+}
+
+LIST_MODELS_DESCRIPTION = 'Listar los modelos guardados (lee el índice sin cargar los modelos)'
+
+
+def list_models(argv):
+    """
+    Lista los modelos guardados a partir de models/index.json.
+
+    Args:
+        argv: Argumentos del subcomando
+
+    Returns:
+        int: Código de salida
+    """
+    parser = argparse.ArgumentParser(prog='joptimizer list-models', description=LIST_MODELS_DESCRIPTION)
+    parser.add_argument('--models-dir', type=str, default=os.path.join(PROJECT_ROOT, 'models'),
+                        help='Directorio de modelos')
+    parser.add_argument('--type', type=str, default=None,
+                        help='Filtrar por tipo de modelo (random_forest, decision_tree, hist_gradient_boosting)')
+    parser.add_argument('--min-score', type=float, default=None, help='Precisión mínima en pruebas')
+    parser.add_argument('--since', type=str, default=None, help='Guardados desde esta fecha (YYYYmmdd_HHMMSS)')
+    args = parser.parse_args(argv)
+
+    # ModelHandler no importa scikit-learn ni pandas
+    from core.model_handler import ModelHandler
+
+    handler = ModelHandler(args.models_dir, verbose=False)
+    models = handler.list_models(model_type=args.type, min_test_score=args.min_score, since=args.since)
+    if not models:
+        print(f"No hay modelos en {handler.models_dir}")
+        return 0
+
+    print(f"{'Modelo':<60} {'Precisión':>10}  Guardado")
+    for model_info in models:
+        metadata = model_info['metadata']
+        score = metadata.get('test_score')
+        score = f"{score:.4f}" if isinstance(score, (int, float)) else '-'
+        saved_at = metadata.get('saved_at') or metadata.get('timestamp') or '-'
+        print(f"{model_info['filename']:<60} {score:>10}  {saved_at}")
+    print(f"\nTotal: {len(models)} modelos")
+    return 0
+
+
+def run_subcommand(command, argv):
+    """
+    Ejecuta el main() del script de un subcomando con sus argumentos.
+
+    Args:
+        command: Nombre del subcomando
+        argv: Argumentos del subcomando
+
+    Returns:
+        int: Código de salida
+    """
+    module_name, _ = SUBCOMMANDS[command]
+    module = importlib.import_module(module_name)
+
+    # Los scripts leen sys.argv con argparse; el nombre del programa incluye el subcomando
+    previous_argv = sys.argv
+    sys.argv = [f"joptimizer {command}"] + list(argv)
+    try:
+        result = module.main()
+    finally:
+        sys.argv = previous_argv
+    return result if isinstance(result, int) else 0
+
+
+def main(argv=None):
+    commands = ['list-models'] + list(SUBCOMMANDS)
+    epilog = "\n".join(
+        [f"  {'list-models':<18} {LIST_MODELS_DESCRIPTION}"] +
+        [f"  {command:<18} {description}" for command, (_, description) in SUBCOMMANDS.items()]
+    )
+    parser = argparse.ArgumentParser(
+        prog='joptimizer',
+        description='JOptimizer-AI: análisis y optimización de código Java',
+        epilog=f"subcomandos:\n{epilog}\n\nUsa 'joptimizer <subcomando> --help' para ver sus opciones.",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('command', choices=commands, metavar='subcomando', help='Subcomando a ejecutar')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.command == 'list-models':
+        return list_models(args.args)
+    return run_subcommand(args.command, args.args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+# scripts/convert_dataset.py
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dataset_io import convert_csv, read_schema
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description='Convertir un CSV de métricas al formato columnar binario')
+    parser.add_argument('--data', type=str, required=True, help='Ruta al archivo CSV')
+    parser.add_argument('--output', type=str, default=None,
+                       help='Directorio de salida (por defecto, el CSV con extensión .cols)')
+
+    args = parser.parse_args()
+
+    print(f"Convirtiendo {args.data}...")
+    output_path = convert_csv(args.data, args.output)
+
+    schema = read_schema(output_path)
+    print(f"\nDatos guardados en: {output_path}")
+    print(f"Filas: {schema['num_rows']}")
+    print("Columnas:")
+    for column in schema['columns']:
+        print(f"- {column['name']}: {column['dtype']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#Script para destilar un modelo en un árbol sustituto rápido
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AIlibrary import AILibrary
+import argparse
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Destilar un modelo en un árbol de decisión pequeño para la ruta rápida')
+    parser.add_argument('--model', type=str, required=True, help='Ruta al modelo maestro (p.ej. un Random Forest)')
+    parser.add_argument('--output', type=str, required=True, help='Nombre con el que guardar el sustituto en models/')
+    parser.add_argument('--samples', type=int, default=200000, help='Filas sintéticas etiquetadas por el maestro')
+    parser.add_argument('--max-depth', type=int, default=8, help='Profundidad máxima del árbol sustituto')
+    parser.add_argument('--eval-data', type=str, default=None,
+                        help='Datos reales para medir la fidelidad (CSV, .cols o .parquet, opcional)')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.model):
+        raise FileNotFoundError(f"No se encontró el modelo: {args.model}")
+
+    library = AILibrary(args.model)
+    print(f"Destilando con {args.samples} filas sintéticas (profundidad máxima {args.max_depth})...")
+    metrics = library.distill(num_samples=args.samples, max_depth=args.max_depth, eval_data_path=args.eval_data)
+
+    distillation = metrics['distillation']
+    print(f"Hojas del sustituto: {distillation['num_leaves']} (profundidad {distillation['max_depth']})")
+    print(f"Fidelidad en datos sintéticos: {distillation['fidelity_synthetic']:.2%}")
+    if 'fidelity_data' in distillation:
+        print(f"Fidelidad en {args.eval_data}: {distillation['fidelity_data']:.2%}")
+    if 'teacher_accuracy' in distillation:
+        print(f"Precisión maestro/sustituto: {distillation['teacher_accuracy']:.2%} / {distillation['surrogate_accuracy']:.2%}")
+    print(f"Latencia por fila (ruta rápida): {distillation['fast_path_latency_us']:.1f} µs")
+
+    path = library.save_fast_model(args.output)
+    print(f"Sustituto guardado en {path}")
+
+
+if __name__ == "__main__":
+    main()
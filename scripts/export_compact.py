@@ -0,0 +1,54 @@
+#Script para exportar un modelo al formato compacto
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_handler import ModelHandler
+from utils.dataset_io import read_metrics
+import argparse
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportar un Random Forest o árbol de decisión al formato compacto')
+    parser.add_argument('--model', type=str, required=True, help='Ruta al modelo guardado')
+    parser.add_argument('--output', type=str, required=True, help='Nombre con el que guardar el modelo compacto en models/')
+    parser.add_argument('--leaf-dtype', type=str, default='uint16', choices=['uint8', 'uint16', 'float32'],
+                        help='Representación de las probabilidades de hoja')
+    parser.add_argument('--parity-data', type=str, default=None,
+                        help='Métricas para comprobar la paridad con el modelo original (CSV, .cols o .parquet)')
+
+    args = parser.parse_args()
+
+    handler = ModelHandler()
+    handler.verbose = False
+    model, metadata = handler.load_model(args.model)
+
+    parity_data = None
+    if args.parity_data:
+        parity_data = read_metrics(args.parity_data)
+        parity_data = parity_data[list(model.feature_names_in_)]
+
+    path = handler.export_compact(model, args.output, metadata, leaf_dtype=args.leaf_dtype, parity_data=parity_data)
+
+    original_size = os.path.getsize(args.model)
+    compact_size = os.path.getsize(path)
+    print(f"Modelo compacto guardado en {path}")
+    print(f"Tamaño: {original_size / 1024:.1f} KB -> {compact_size / 1024:.1f} KB ({original_size / compact_size:.1f}x)")
+
+    start = time.perf_counter()
+    _, compact_metadata = handler.load_model(path)
+    print(f"Carga del modelo compacto: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    compact = compact_metadata['compact']
+
+    if 'parity' in compact:
+        parity = compact['parity']
+        print(f"Mismas hojas que el original: {parity['same_leaves']}")
+        print(f"Predicciones iguales: {parity['prediction_agreement']:.2%}")
+        print(f"Diferencia máxima de probabilidad: {parity['max_probability_diff']:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#Script para exportar un modelo como módulo de Python autónomo (sin scikit-learn)
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_handler import ModelHandler
+from core.standalone_export import export_standalone, load_standalone, check_standalone_parity
+from utils.dataset_io import read_metrics
+import argparse
+import subprocess
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exportar un modelo guardado como predictor autónomo en Python puro')
+    parser.add_argument('--model', type=str, required=True, help='Ruta al modelo guardado por ModelHandler')
+    parser.add_argument('--output', type=str, required=True, help='Ruta del módulo .py a generar (p.ej. predictor.py)')
+    parser.add_argument('--check-data', type=str, default=None,
+                        help='Métricas para comprobar la paridad con el modelo original (CSV, .cols o .parquet)')
+
+    args = parser.parse_args()
+
+    handler = ModelHandler()
+    handler.verbose = False
+    model, metadata = handler.load_model(args.model)
+
+    path = export_standalone(model, args.output, model_name=os.path.basename(args.model))
+    print(f"Predictor autónomo generado en {path} ({os.path.getsize(path) / 1024:.1f} KB)")
+
+    # Arranque de un proceso que solo importa el predictor
+    module_dir, module_file = os.path.split(os.path.abspath(path))
+    command = [sys.executable, '-c', f"import sys; sys.path.insert(0, {module_dir!r}); import {module_file[:-3]}"]
+    start = time.perf_counter()
+    subprocess.run(command, check=True)
+    print(f"Arranque del intérprete e importación: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    if args.check_data:
+        data = read_metrics(args.check_data)
+        parity = check_standalone_parity(load_standalone(path), model, data)
+        print(f"Probabilidades idénticas: {parity['identical']}")
+        print(f"Predicciones iguales: {parity['prediction_agreement']:.2%}")
+        print(f"Diferencia máxima de probabilidad: {parity['max_probability_diff']:.2e}")
+        if parity['prediction_agreement'] < 1.0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# scripts/extract_metrics.py
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.java_metrics import JavaMetricsExtractor
+from utils.dataset_io import write_columnar
+import argparse
+import time
+
+def main():
+    parser = argparse.ArgumentParser(description='Extraer las métricas de las clases de un árbol de código Java')
+    parser.add_argument('--source', type=str, required=True, help='Directorio raíz del código Java')
+    parser.add_argument('--output', type=str, default='data/test/source_metrics.csv',
+                       help='Archivo de salida (.csv) o directorio columnar (.cols)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Número de procesos (por defecto, todos los núcleos)')
+    parser.add_argument('--cache', type=str, default=None,
+                       help='Archivo SQLite para no volver a analizar los archivos sin cambios')
+
+    args = parser.parse_args()
+
+    print(f"Analizando código en {args.source}...")
+    extractor = JavaMetricsExtractor(workers=args.workers, cache_path=args.cache)
+    start = time.perf_counter()
+    metrics = extractor.extract(args.source)
+    elapsed = time.perf_counter() - start
+
+    run = extractor.last_run
+    print(f"\nArchivos: {run['files']} (analizados: {run['parsed']}, desde caché: {run['cached']})")
+    print(f"Clases: {len(metrics)}")
+    print(f"Tiempo: {elapsed:.2f} s")
+
+    if args.output.endswith('.cols'):
+        write_columnar(metrics, args.output)
+    else:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        metrics.to_csv(args.output, index=False)
+    print(f"\nMétricas guardadas en: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+# scripts/run_benchmarks.py
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.train_model import ModelTrainer
+from core.test_model import ModelTester
+from core.model_handler import ModelHandler
+from core.metrics_schema import FEATURE_COLUMNS, downcast_metrics
+from core.binned_boosting import BinCache, apply_bins, compute_bin_edges
+from AIlibrary import AILibrary
+from utils.data_generation import generate_balanced_dataset
+import numpy as np
+import sklearn
+import pandas as pd
+import argparse
+import contextlib
+import io
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+
+DEFAULT_SIZES = '1000,10000,100000,1000000,10000000'
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'baseline.json')
+
+def generate_data(num_rows, seed):
+    """
+    Genera un conjunto reproducible con los generadores de utils/data_generation.py.
+
+    Args:
+        num_rows: Número de filas
+        seed: Semilla del generador aleatorio
+    """
+    np.random.seed(seed)
+    return downcast_metrics(generate_balanced_dataset(num_rows))
+
+def measure(function, repeats):
+    """
+    Mide una función: mediana del tiempo de pared y pico de memoria.
+
+    El pico se mide en una ejecución aparte con tracemalloc (que registra también
+    las reservas de numpy) para que su sobrecoste no altere los tiempos.
+
+    Args:
+        function: Función sin argumentos a medir
+        repeats: Número de ejecuciones cronometradas
+    """
+    times = []
+    for _ in range(repeats):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            function()
+            times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'wall_time_s': float(np.median(times)),
+        'min_time_s': float(np.min(times)),
+        'repeats': repeats,
+        'peak_memory_mb': peak / 2**20
+    }
+
+def record(results, benchmark, rows, measurement):
+    """Añade una medición a los resultados y la muestra."""
+    entry = {'benchmark': benchmark, 'rows': rows, **measurement}
+    entry['throughput_rows_s'] = rows / entry['wall_time_s'] if rows and entry['wall_time_s'] > 0 else None
+    results.append(entry)
+
+    throughput = f"{entry['throughput_rows_s']:,.0f} filas/s" if entry['throughput_rows_s'] else "-"
+    print(f"{benchmark:<28} {rows:>10,} {entry['wall_time_s']:>10.4f} s {throughput:>20} "
+          f"{entry['peak_memory_mb']:>10.1f} MB")
+
+def run_benchmarks(args):
+    """
+    Ejecuta la batería de benchmarks.
+
+    Args:
+        args: Argumentos de línea de comandos
+    """
+    sizes = [int(size) for size in args.sizes.split(',')]
+    results = []
+
+    # Modelo de referencia para los benchmarks de inferencia, entrenado siempre con los mismos datos
+    trainer = ModelTrainer(random_state=42)
+    with contextlib.redirect_stdout(io.StringIO()):
+        model, metrics = trainer.train_model(generate_data(args.model_rows, args.seed), args.model_type)
+
+    tester = ModelTester()
+    library = AILibrary()
+    library.model = model
+
+    print(f"{'benchmark':<28} {'filas':>10} {'tiempo':>12} {'throughput':>20} {'pico mem.':>13}")
+
+    for rows in sizes:
+        data = generate_data(rows, args.seed)
+        features = data[FEATURE_COLUMNS]
+
+        if rows <= args.max_train_rows:
+            record(results, 'train_model', rows,
+                   measure(lambda: trainer.train_model(data, args.model_type), args.repeats))
+
+            # Lo que ahorra la caché de discretización de hist_gradient_boosting frente a un fit completo
+            values = features.to_numpy(dtype=np.float32)
+            record(results, 'bin_features', rows,
+                   measure(lambda: apply_bins(values, compute_bin_edges(values, random_state=42)), args.repeats))
+            with tempfile.TemporaryDirectory() as cache_dir:
+                cache = BinCache(cache_dir)
+                cache.get_or_compute(values, 255, 42)
+                record(results, 'bin_features_cached', rows,
+                       measure(lambda: cache.get_or_compute(values, 255, 42), args.repeats))
+            del values
+
+        record(results, 'test_model', rows, measure(lambda: tester.test_model(model, features), args.repeats))
+
+        test_results = tester.test_model(model, features)
+        record(results, 'analyze_predictions', rows, measure(
+            lambda: tester.analyze_predictions(features, test_results['predictions'], test_results['probabilities'],
+                                               full_results=False),
+            args.repeats))
+
+        record(results, 'get_optimization_suggestions', rows, measure(
+            lambda: library.get_optimization_suggestions(features, test_results), args.repeats))
+
+        del data, features, test_results
+
+    # Guardado y carga: el coste depende del modelo, no del número de filas
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        handler = ModelHandler(models_dir=tmp_dir, verbose=False)
+        saved = {}
+
+        def save():
+            saved['path'] = handler.save_model(model, 'benchmark', metrics)
+
+        record(results, 'save_model', 0, measure(save, args.repeats))
+        record(results, 'load_model', 0, measure(lambda: handler.load_model(saved['path']), args.repeats))
+
+    return {
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'scikit-learn': sklearn.__version__
+        },
+        'config': {
+            'sizes': sizes,
+            'seed': args.seed,
+            'repeats': args.repeats,
+            'model_type': args.model_type,
+            'model_rows': args.model_rows,
+            'max_train_rows': args.max_train_rows
+        },
+        'results': results
+    }
+
+def compare_with_baseline(report, baseline, threshold):
+    """
+    Compara los resultados con una línea base.
+
+    Args:
+        report: Resultados de la ejecución actual
+        baseline: Resultados de referencia
+        threshold: Empeoramiento relativo máximo permitido (0.2 = 20%)
+
+    Returns:
+        list: Regresiones encontradas
+    """
+    reference = {(entry['benchmark'], entry['rows']): entry for entry in baseline['results']}
+    regressions = []
+
+    print(f"\n=== Comparación con la línea base (umbral {threshold:.0%}) ===")
+    for entry in report['results']:
+        previous = reference.get((entry['benchmark'], entry['rows']))
+        if previous is None:
+            continue
+
+        time_ratio = entry['wall_time_s'] / previous['wall_time_s'] if previous['wall_time_s'] > 0 else 1.0
+        memory_ratio = (entry['peak_memory_mb'] / previous['peak_memory_mb']
+                        if previous['peak_memory_mb'] > 0 else 1.0)
+
+        status = "OK"
+        if time_ratio > 1 + threshold:
+            status = "REGRESIÓN (tiempo)"
+        elif memory_ratio > 1 + threshold:
+            status = "REGRESIÓN (memoria)"
+        if status != "OK":
+            regressions.append({**entry, 'time_ratio': time_ratio, 'memory_ratio': memory_ratio})
+
+        print(f"{entry['benchmark']:<28} {entry['rows']:>10,}  tiempo x{time_ratio:.2f}  memoria x{memory_ratio:.2f}  {status}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Medir el rendimiento de entrenamiento, inferencia, análisis y sugerencias')
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SIZES,
+                       help='Tamaños de entrada separados por comas')
+    parser.add_argument('--repeats', type=int, default=3, help='Ejecuciones cronometradas por medición')
+    parser.add_argument('--seed', type=int, default=42, help='Semilla para generar los datos')
+    parser.add_argument('--model-type', type=str, default='random_forest',
+                       choices=['random_forest', 'decision_tree', 'hist_gradient_boosting'], help='Tipo de modelo')
+    parser.add_argument('--model-rows', type=int, default=10000,
+                       help='Filas con las que se entrena el modelo de los benchmarks de inferencia')
+    parser.add_argument('--max-train-rows', type=int, default=100000,
+                       help='Tamaño máximo para el benchmark de entrenamiento')
+    parser.add_argument('--output', type=str, default='benchmarks/results.json', help='Archivo JSON de resultados')
+    parser.add_argument('--baseline', type=str, default=DEFAULT_BASELINE, help='Archivo JSON de la línea base')
+    parser.add_argument('--save-baseline', action='store_true',
+                       help='Guardar los resultados como nueva línea base')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                       help='Empeoramiento relativo máximo permitido frente a la línea base')
+
+    args = parser.parse_args()
+
+    print("=== Benchmarks de JOptimizer-AI ===\n")
+    report = run_benchmarks(args)
+
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResultados guardados en: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline) or '.', exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Línea base guardada en: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No hay línea base en {args.baseline}; ejecuta con --save-baseline para crearla")
+        return
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(report, baseline, args.threshold)
+
+    if regressions:
+        print(f"\n{len(regressions)} regresiones superan el umbral")
+        sys.exit(1)
+    print("\nSin regresiones")
+
+if __name__ == "__main__":
+    main()
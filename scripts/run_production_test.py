@@ -4,40 +4,195 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.model_handler import ModelHandler
 from core.test_model import ModelTester
+from core.instrumentation import timings
+from utils.dataset_io import read_metrics
 import pandas as pd
 import argparse
+from contextlib import nullcontext
 
-def main():
-    parser = argparse.ArgumentParser(description='Probar modelo con datos de producción')
-    parser.add_argument('--model', type=str, required=True, help='Ruta al modelo guardado')
-    parser.add_argument('--data', type=str, required=True, help='Ruta al archivo CSV con datos para probar')
+# AILibrary, el evaluador paralelo, el cliente del demonio y el extractor de código Java se
+# importan en la rama que los usa: con --daemon no se carga nada que no haga falta para mostrar resultados
 
-    args = parser.parse_args()
+def print_class_results(data, class_types, results, offset=0, class_names=None):
+    """
+    Muestra la clasificación de cada clase y sus métricas problemáticas.
+
+    Args:
+        data: DataFrame con las métricas evaluadas
+        class_types: Serie con el tipo de cada clase (opcional)
+        results: Resultados de ModelTester.test_model
+        offset: Número de clases mostradas en bloques anteriores
+        class_names: Serie con el nombre de cada clase (opcional, salida de extract_metrics.py)
+    """
+    for i in range(len(data)):
+        prediction = "ÓPTIMO" if results['predictions'][i] == 1 else "SUBÓPTIMO"
+        confidence = results['probabilities'][i][1] if results['predictions'][i] == 1 else results['probabilities'][i][0]
+
+        print(f"\nClase {offset+i+1}:")
+        if class_names is not None:
+            print(f"Nombre: {class_names.iloc[i]}")
+        if class_types is not None:
+            print(f"Tipo: {class_types.iloc[i]}")
+        print(f"Clasificación: {prediction}")
+        print(f"Confianza: {confidence:.2%}")
+
+        # Si es subóptimo, mostrar métricas problemáticas
+        if results['predictions'][i] == 0:
+            print("Métricas problemáticas:")
+            row = data.iloc[i]
+            if row['cyclomatic_complexity'] > 15:
+                print(f"- Complejidad ciclomática alta: {row['cyclomatic_complexity']}")
+            if row['coupling_between_objects'] > 8:
+                print(f"- Alto acoplamiento: {row['coupling_between_objects']}")
+            if row['lack_of_cohesion'] > 0.5:
+                print(f"- Baja cohesión: {row['lack_of_cohesion']:.2f}")
+            if row['number_of_methods'] > 15:
+                print(f"- Demasiados métodos: {row['number_of_methods']}")
+
+def print_summary(analysis, total):
+    """
+    Muestra el resumen general del análisis.
+
+    Args:
+        analysis: Diccionario con 'prediction_counts' y 'confidence_analysis'
+        total: Número total de clases analizadas
+    """
+    print("\n=== Resumen General ===")
+    counts = analysis['prediction_counts']
+    print(f"Total de clases analizadas: {total}")
+    print(f"Clases óptimas: {counts['optimal_count']} ({counts['optimal_count']/total:.1%})")
+    print(f"Clases subóptimas: {counts['suboptimal_count']} ({counts['suboptimal_count']/total:.1%})")
+
+    conf = analysis['confidence_analysis']
+    print(f"\nConfianza promedio: {conf['mean_confidence']:.1%}")
+
+def run_streaming(args):
+    """
+    Analiza el archivo por bloques de --chunksize filas, con memoria acotada.
+
+    Args:
+        args: Argumentos de línea de comandos
+    """
+    from AIlibrary import AILibrary
+    from core.streaming import StreamingSummary
+    from core.java_metrics import SOURCE_COLUMNS
+
+    library = AILibrary(args.model)
+    summary = StreamingSummary()
+
+    print(f"\nAnalizando clases Java en bloques de {args.chunksize} filas...")
+    print("\n=== Resultados del Análisis ===")
+
+    offset = 0
+    chunks = library.analyze_file(args.data, chunksize=args.chunksize, summary=summary, workers=args.workers)
+    for chunk, results, _ in chunks:
+        class_types = chunk['class_type'] if 'class_type' in chunk.columns else None
+        class_names = chunk['class_name'] if 'class_name' in chunk.columns else None
+        print_class_results(chunk.drop(columns=SOURCE_COLUMNS, errors='ignore'), class_types, results, offset, class_names)
+        offset += len(chunk)
+
+    summary_data = summary.to_dict()
+    print_summary(summary_data, summary_data['num_samples'])
+
+def run_incremental(args):
+    """
+    Analiza el archivo evaluando solo las clases nuevas o modificadas desde la ejecución anterior.
+
+    Args:
+        args: Argumentos de línea de comandos
+    """
+    from AIlibrary import AILibrary
+    from core.java_metrics import SOURCE_COLUMNS
+
+    library = AILibrary(args.model)
+    data = read_metrics(args.data)
+
+    results, analysis = library.analyze_incremental(data, args.state, workers=args.workers)
+    diff = results['diff']
+    print(f"\nClases nuevas: {diff['new']}, modificadas: {diff['changed']}, "
+          f"sin cambios: {diff['unchanged']}, eliminadas: {diff['removed']}")
+
+    # Solo se detallan las clases evaluadas en esta ejecución
+    changed = results['changed']
+    print("\n=== Resultados del Análisis (clases nuevas o modificadas) ===")
+    for position in changed:
+        row = data.iloc[[position]]
+        row_results = {
+            'predictions': results['predictions'][[position]],
+            'probabilities': results['probabilities'][[position]]
+        }
+        class_types = row['class_type'] if 'class_type' in row.columns else None
+        class_names = row['class_name'] if 'class_name' in row.columns else None
+        print_class_results(row.drop(columns=SOURCE_COLUMNS, errors='ignore'), class_types, row_results,
+                            offset=int(position), class_names=class_names)
 
+    print_summary(analysis, len(data))
+
+def print_timings(stats):
+    """
+    Muestra los tiempos agregados por etapa.
+
+    Args:
+        stats: Estadísticas de TimingRecorder.get_stats
+    """
+    print("\n=== Tiempos por Etapa ===")
+    for stage, values in sorted(stats.items(), key=lambda item: item[1]['total_s'], reverse=True):
+        print(f"{stage:<28} {values['count']:>6} llamadas {values['total_s']*1000:>12.2f} ms "
+              f"(media {values['mean_s']*1000:.3f} ms)")
+
+def run_analysis(args):
+    """
+    Ejecuta el análisis completo, por bloques o incremental según los argumentos.
+
+    Args:
+        args: Argumentos de línea de comandos
+    """
     print("=== Análisis de Código Java ===")
     print("\nCargando modelo y datos...")
 
     try:
-        # Cargar modelo
-        handler = ModelHandler()
-        model, metadata = handler.load_model(args.model)
+        if args.state:
+            run_incremental(args)
+            return
+
+        if args.chunksize:
+            run_streaming(args)
+            return
+
+        from core.java_metrics import SOURCE_COLUMNS
+
+        # Cargar modelo (o conectarse al demonio que ya lo tiene cargado). Con --workers el
+        # evaluador paralelo carga el modelo y no hace falta cargarlo aquí
+        parallel = args.workers is not None and args.workers > 1
+        if args.daemon:
+            from core.daemon import DaemonClient, DEFAULT_IDLE_TIMEOUT
+            idle_timeout = DEFAULT_IDLE_TIMEOUT if args.idle_timeout is None else args.idle_timeout
+            model = DaemonClient(args.model, idle_timeout=idle_timeout)
+        elif not parallel:
+            from core.model_handler import ModelHandler
+            handler = ModelHandler()
+            model, metadata = handler.load_model(args.model)
 
         # Cargar datos
-        data = pd.read_csv(args.data)
+        data = read_metrics(args.data)
         print(f"\nAnalizando {len(data)} clases Java...")
 
-        # Guardar tipo de clase si existe
+        # Guardar tipo y nombre de clase si existen
         class_types = data['class_type'] if 'class_type' in data.columns else None
+        class_names = data['class_name'] if 'class_name' in data.columns else None
 
         # Preparar datos para predicción
-        if 'class_type' in data.columns:
-            data = data.drop('class_type', axis=1)
+        data = data.drop(columns=SOURCE_COLUMNS, errors='ignore')
 
-        # Crear tester y probar modelo
+        # Crear tester y probar modelo (en paralelo si se indicó --workers)
         tester = ModelTester()
-        results = tester.test_model(model, data)
+        if parallel:
+            from core.parallel import ParallelScorer
+            with ParallelScorer(args.model, workers=args.workers) as scorer:
+                results = tester.test_model(scorer, data)
+        else:
+            results = tester.test_model(model, data)
 
         # Análisis detallado
         analysis = tester.analyze_predictions(
@@ -48,44 +203,59 @@ def main():
 
         # Mostrar resultados
         print("\n=== Resultados del Análisis ===")
-
-        for i in range(len(data)):
-            prediction = "ÓPTIMO" if results['predictions'][i] == 1 else "SUBÓPTIMO"
-            confidence = results['probabilities'][i][1] if results['predictions'][i] == 1 else results['probabilities'][i][0]
-
-            print(f"\nClase {i+1}:")
-            if class_types is not None:
-                print(f"Tipo: {class_types.iloc[i]}")
-            print(f"Clasificación: {prediction}")
-            print(f"Confianza: {confidence:.2%}")
-
-            # Si es subóptimo, mostrar métricas problemáticas
-            if results['predictions'][i] == 0:
-                print("Métricas problemáticas:")
-                row = data.iloc[i]
-                if row['cyclomatic_complexity'] > 15:
-                    print(f"- Complejidad ciclomática alta: {row['cyclomatic_complexity']}")
-                if row['coupling_between_objects'] > 8:
-                    print(f"- Alto acoplamiento: {row['coupling_between_objects']}")
-                if row['lack_of_cohesion'] > 0.5:
-                    print(f"- Baja cohesión: {row['lack_of_cohesion']:.2f}")
-                if row['number_of_methods'] > 15:
-                    print(f"- Demasiados métodos: {row['number_of_methods']}")
+        print_class_results(data, class_types, results, class_names=class_names)
 
         # Resumen general
-        print("\n=== Resumen General ===")
-        counts = analysis['prediction_counts']
-        total = len(data)
-        print(f"Total de clases analizadas: {total}")
-        print(f"Clases óptimas: {counts['optimal_count']} ({counts['optimal_count']/total:.1%})")
-        print(f"Clases subóptimas: {counts['suboptimal_count']} ({counts['suboptimal_count']/total:.1%})")
-
-        conf = analysis['confidence_analysis']
-        print(f"\nConfianza promedio: {conf['mean_confidence']:.1%}")
+        print_summary(analysis, len(data))
 
     except Exception as e:
         print(f"Error durante el análisis: {str(e)}")
         raise
 
+def main():
+    parser = argparse.ArgumentParser(description='Probar modelo con datos de producción')
+    parser.add_argument('--model', type=str, required=True, help='Ruta al modelo guardado')
+    parser.add_argument('--data', type=str, required=True, help='Ruta a los datos para probar (CSV, .cols o .parquet)')
+    parser.add_argument('--chunksize', type=int, default=None,
+                       help='Analizar el archivo por bloques de este número de filas (memoria acotada)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Número de procesos para evaluar las filas en paralelo')
+    parser.add_argument('--state', type=str, default=None,
+                       help='Directorio .cols con el estado de la ejecución anterior: solo se evalúan las clases nuevas o modificadas')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Evaluar en un demonio en segundo plano que mantiene el modelo cargado entre invocaciones')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                       help='Segundos sin solicitudes tras los que se detiene el demonio (por defecto 600)')
+
+    parser.add_argument('--timings', type=str, default=None,
+                       help='Medir los tiempos por etapa y guardarlos en este archivo (.json o .prom para Prometheus)')
+    parser.add_argument('--profile', type=str, default=None, choices=['cprofile', 'tracemalloc'],
+                       help='Perfilar la ejecución completa con cProfile o tracemalloc')
+
+    args = parser.parse_args()
+
+    if args.daemon and (args.chunksize or args.workers or args.state):
+        parser.error("--daemon no se puede combinar con --chunksize, --workers ni --state")
+
+    if args.timings:
+        timings.enable()
+
+    try:
+        with timings.capture(args.profile) if args.profile else nullcontext():
+            run_analysis(args)
+    finally:
+        if args.profile and timings.last_capture:
+            print(f"\n=== Perfil ({args.profile}) ===")
+            print(timings.last_capture)
+
+        if args.timings:
+            print_timings(timings.get_stats())
+            if args.timings.endswith('.prom'):
+                with open(args.timings, 'w', encoding='utf-8') as f:
+                    f.write(timings.to_prometheus())
+            else:
+                timings.dump_json(args.timings)
+            print(f"\nTiempos guardados en: {args.timings}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
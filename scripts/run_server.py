@@ -0,0 +1,53 @@
+# scripts/run_server.py
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from AIlibrary import AILibrary
+from core.server import InferenceServer
+from core.daemon import ScoringDaemon
+import asyncio
+import argparse
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor de inferencia con micro-lotes')
+    parser.add_argument('--model', type=str, required=True, help='Ruta al modelo guardado')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Dirección TCP')
+    parser.add_argument('--port', type=int, default=8765, help='Puerto TCP')
+    parser.add_argument('--socket', type=str, default=None, help='Ruta de socket Unix (en lugar de TCP)')
+    parser.add_argument('--max-batch-size', type=int, default=256, help='Filas máximas por micro-lote')
+    parser.add_argument('--max-wait-ms', type=float, default=5.0, help='Espera máxima para completar un lote (ms)')
+    parser.add_argument('--backend', type=str, default='sklearn', choices=['sklearn', 'compiled'],
+                       help='Motor de inferencia')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                       help='Modo demonio (requiere --socket): detenerse tras estos segundos sin solicitudes '
+                            'y recargar el modelo cuando cambie el archivo')
+
+    args = parser.parse_args()
+
+    if args.idle_timeout is not None and not args.socket:
+        parser.error("--idle-timeout requiere --socket")
+
+    if not os.path.exists(args.model):
+        raise FileNotFoundError(f"No se encontró el archivo del modelo: {args.model}")
+
+    library = AILibrary(args.model)
+    options = dict(max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms, backend=args.backend)
+
+    address = args.socket if args.socket else f"{args.host}:{args.port}"
+
+    try:
+        if args.idle_timeout is not None:
+            daemon = ScoringDaemon(library, args.model, idle_timeout=args.idle_timeout, **options)
+            print(f"Demonio de evaluación (pid {os.getpid()}) escuchando en {address}", flush=True)
+            asyncio.run(daemon.serve_until_idle(args.socket))
+        else:
+            server = InferenceServer(library, **options)
+            print(f"Servidor de inferencia escuchando en {address}")
+            asyncio.run(server.serve_forever(args.host, args.port, args.socket))
+    except KeyboardInterrupt:
+        print("\nServidor detenido")
+
+if __name__ == "__main__":
+    main()
@@ -5,26 +5,36 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.model_handler import ModelHandler
 from core.test_model import ModelTester
+from utils.dataset_io import read_metrics
 import pandas as pd
 import argparse
 
 def main():
     parser = argparse.ArgumentParser(description='Probar modelo de clasificación de código')
     parser.add_argument('--model', type=str, required=True, help='Ruta al modelo guardado')
-    parser.add_argument('--data', type=str, required=True, help='Ruta al archivo CSV con datos para probar')
+    parser.add_argument('--data', type=str, required=True, help='Ruta a los datos para probar (CSV, .cols o .parquet)')
+    parser.add_argument('--daemon', action='store_true',
+                        help='Evaluar en un demonio en segundo plano que mantiene el modelo cargado entre invocaciones')
+    parser.add_argument('--idle-timeout', type=float, default=None,
+                        help='Segundos sin solicitudes tras los que se detiene el demonio (por defecto 600)')
 
     args = parser.parse_args()
 
     print("Cargando modelo y datos...")
 
-    # Cargar modelo
-    handler = ModelHandler()
-    model, metadata = handler.load_model(args.model)
+    # Cargar modelo (o conectarse al demonio que ya lo tiene cargado)
+    if args.daemon:
+        from core.daemon import DaemonClient, DEFAULT_IDLE_TIMEOUT
+        idle_timeout = DEFAULT_IDLE_TIMEOUT if args.idle_timeout is None else args.idle_timeout
+        model = DaemonClient(args.model, idle_timeout=idle_timeout)
+    else:
+        from core.model_handler import ModelHandler
+        handler = ModelHandler()
+        model, metadata = handler.load_model(args.model)
 
     # Cargar datos
-    data = pd.read_csv(args.data)
+    data = read_metrics(args.data)
 
     # Crear tester y probar modelo
     tester = ModelTester()
@@ -6,6 +6,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from core.train_model import ModelTrainer
 from core.model_handler import ModelHandler
+from utils.dataset_io import read_metrics
 import pandas as pd
 import argparse
 
@@ -26,11 +27,35 @@ def main():
     project_root = get_project_root()
 
     parser = argparse.ArgumentParser(description='Entrenar modelo de clasificación de código')
-    parser.add_argument('--data', type=str, required=True, help='Ruta al archivo CSV de entrenamiento')
+    parser.add_argument('--data', type=str, required=True, help='Ruta a los datos de entrenamiento (CSV, .cols o .parquet)')
     parser.add_argument('--model-type', type=str, default='random_forest',
-                       choices=['random_forest', 'decision_tree'],
+                       choices=['random_forest', 'decision_tree', 'hist_gradient_boosting'],
                        help='Tipo de modelo a entrenar')
     parser.add_argument('--output', type=str, required=True, help='Ruta donde guardar el modelo')
+    parser.add_argument('--tune', action='store_true',
+                       help='Buscar hiperparámetros con successive halving (search_spaces de config/parameters.json)')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Número de procesos para evaluar candidatos en la búsqueda')
+    parser.add_argument('--grow-from', type=str, default=None,
+                       help='Modelo Random Forest guardado al que añadir árboles entrenados solo con --data')
+    parser.add_argument('--new-trees', type=int, default=10,
+                       help='Número de árboles a añadir con --grow-from')
+    parser.add_argument('--max-trees', type=int, default=None,
+                       help='Tamaño máximo del ensamble con --grow-from (se descartan los árboles más antiguos)')
+    parser.add_argument('--batch-id', type=str, default=None,
+                       help='Identificador del lote nuevo en los metadatos del modelo')
+    parser.add_argument('--bin-cache', type=str, default=None,
+                       help='Directorio de caché de características discretizadas (hist_gradient_boosting)')
+    parser.add_argument('--bin-cache-max-mb', type=float, default=None,
+                       help='Tamaño máximo de la caché de características discretizadas en MB (por defecto 1024)')
+    parser.add_argument('--out-of-core', action='store_true',
+                       help='Entrenar leyendo los datos por bloques con memoria acotada (muestreo por depósitos)')
+    parser.add_argument('--chunksize', type=int, default=100000,
+                       help='Filas por bloque con --out-of-core')
+    parser.add_argument('--sample-size', type=int, default=200000,
+                       help='Filas de cada depósito de muestreo con --out-of-core')
+    parser.add_argument('--reservoirs', type=int, default=None,
+                       help='Número de depósitos con --out-of-core (por defecto, hasta 10)')
 
     args = parser.parse_args()
 
@@ -41,26 +66,65 @@ def main():
         data_path = os.path.join(project_root, args.data)
         output_path = os.path.join(project_root, args.output)
 
-        # Cargar datos
-        print(f"Cargando datos desde {data_path}")
-        training_data = pd.read_csv(data_path)
-        print(f"Datos cargados: {len(training_data)} muestras")
-        print(f"Columnas disponibles: {training_data.columns.tolist()}")
+        if not args.out_of_core:
+            # Cargar datos
+            print(f"Cargando datos desde {data_path}")
+            training_data = read_metrics(data_path, require_target=True)
+            print(f"Datos cargados: {len(training_data)} muestras")
+            print(f"Columnas disponibles: {training_data.columns.tolist()}")
 
-        # Verificar que los datos son correctos
-        if not isinstance(training_data, pd.DataFrame):
-            raise TypeError("Error: Los datos no son un DataFrame")
+            # Verificar que los datos son correctos
+            if not isinstance(training_data, pd.DataFrame):
+                raise TypeError("Error: Los datos no son un DataFrame")
 
-        if 'is_optimal' not in training_data.columns:
-            raise ValueError("Error: No se encontró la columna 'is_optimal' en los datos")
+            if 'is_optimal' not in training_data.columns:
+                raise ValueError("Error: No se encontró la columna 'is_optimal' en los datos")
 
         # Crear entrenador y manejador de modelos
-        trainer = ModelTrainer()
+        if args.tune:
+            trainer = ModelTrainer.from_config(os.path.join(project_root, 'config', 'parameters.json'))
+        else:
+            trainer = ModelTrainer()
+        if args.bin_cache:
+            params = {'cache_dir': os.path.join(project_root, args.bin_cache)}
+            if args.bin_cache_max_mb is not None:
+                params['cache_max_bytes'] = int(args.bin_cache_max_mb * 2 ** 20)
+            trainer.set_model_params('hist_gradient_boosting', params)
         handler = ModelHandler()
 
-        # Entrenar modelo
-        print("Iniciando entrenamiento...")
-        model, metrics = trainer.train_model(training_data, args.model_type)
+        if args.out_of_core:
+            # Leer por bloques sin cargar el conjunto completo
+            print(f"Entrenando por bloques de {args.chunksize} filas desde {data_path}")
+            model, metrics = trainer.train_out_of_core(
+                data_path, args.model_type, chunksize=args.chunksize,
+                sample_size=args.sample_size, num_reservoirs=args.reservoirs
+            )
+            summary = metrics['out_of_core']
+            print(f"Filas leídas: {summary['rows_seen']} (entrenamiento: {summary['train_rows']}, holdout: {summary['holdout_rows']})")
+            print(f"Depósitos: {summary['num_reservoirs']} x {summary['sample_size']} filas ({summary['reservoir_bytes'] / 2**20:.1f} MB)")
+        elif args.grow_from:
+            # Añadir árboles entrenados solo con el lote nuevo
+            model, previous_metadata = handler.load_model(os.path.join(project_root, args.grow_from))
+            print(f"Añadiendo {args.new_trees} árboles al modelo existente...")
+            model, metrics = trainer.grow_model(
+                model, training_data, previous_metadata=previous_metadata,
+                n_new_trees=args.new_trees, max_trees=args.max_trees, batch_id=args.batch_id
+            )
+            print(f"Árboles en el ensamble: {len(model.estimators_)}")
+            for batch in metrics['training_batches']:
+                print(f"  Lote {batch['batch_id']}: {batch['num_trees']} árboles")
+        elif args.tune:
+            # Buscar hiperparámetros y entrenar el ganador
+            print("Iniciando búsqueda de hiperparámetros...")
+            model, metrics = trainer.tune_model(training_data, args.model_type, workers=args.workers)
+            search = metrics['search']
+            print(f"Candidatos: {search['num_candidates']}, rondas: {search['num_rounds']}, entrenamientos: {search['fits']}")
+            print(f"Mejores hiperparámetros: {search['best_params']}")
+            print(f"Precisión en validación: {search['best_validation_score']:.3f}")
+        else:
+            # Entrenar modelo
+            print("Iniciando entrenamiento...")
+            model, metrics = trainer.train_model(training_data, args.model_type)
 
         # Asegurar que el directorio de salida existe
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -0,0 +1,60 @@
+# scripts/test_compiled_forest.py
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.train_model import ModelTrainer
+from core.compiled_forest import CompiledForest, CompactForest
+import pandas as pd
+import numpy as np
+
+def get_project_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_compiled_forest():
+    print("=== Prueba de Paridad del Motor Compilado ===")
+
+    project_root = get_project_root()
+    train_data = pd.read_csv(os.path.join(project_root, 'data', 'train', 'code_metrics.csv'))
+    test_data = pd.read_csv(os.path.join(project_root, 'data', 'test', 'code_metrics_test_final.csv'))
+    X_test = test_data.drop('is_optimal', axis=1)
+
+    trainer = ModelTrainer(random_state=42)
+    failures = 0
+
+    for model_type in ['random_forest', 'decision_tree']:
+        print(f"\n--- {model_type} ---")
+        model, _ = trainer.train_model(train_data, model_type)
+        compiled = CompiledForest.from_model(model)
+
+        expected_proba = model.predict_proba(X_test)
+        compiled_proba = compiled.predict_proba(X_test)
+        same_proba = np.array_equal(expected_proba, compiled_proba)
+        same_labels = np.array_equal(model.predict(X_test), compiled.predict(X_test))
+
+        print(f"Árboles compilados: {compiled.n_trees}")
+        print(f"Probabilidades idénticas bit a bit: {same_proba}")
+        print(f"Predicciones idénticas: {same_labels}")
+
+        if not (same_proba and same_labels):
+            print(f"Diferencia máxima: {np.max(np.abs(expected_proba - compiled_proba))}")
+            failures += 1
+
+        # Formato compacto: mismas hojas y solo el error de cuantización en las probabilidades
+        for leaf_dtype in ['uint8', 'uint16', 'float32']:
+            parity = CompactForest.from_model(model, leaf_dtype=leaf_dtype).check_parity(model, X_test)
+            print(f"Compacto {leaf_dtype}: mismas hojas {parity['same_leaves']}, "
+                  f"predicciones iguales {parity['prediction_agreement']:.2%}, "
+                  f"diferencia máxima {parity['max_probability_diff']:.2e}")
+            if not parity['same_leaves'] or parity['max_probability_diff'] > 1.0 / 255:
+                failures += 1
+
+    if failures:
+        print(f"\n{failures} modelo(s) sin paridad")
+        sys.exit(1)
+
+    print("\nParidad verificada para todos los modelos")
+
+if __name__ == "__main__":
+    test_compiled_forest()
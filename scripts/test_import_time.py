@@ -0,0 +1,138 @@
+# scripts/test_import_time.py
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import json
+import argparse
+import tempfile
+import subprocess
+
+# Presupuesto de tiempo (ms) por escenario, medido en un intérprete nuevo
+BUDGETS_MS = {
+    'import_model_handler': 400,
+    'import_ailibrary': 900,
+    'list_models': 500,
+    'import_analyze_cli': 700,
+    'score_compact': 900
+}
+
+# Módulos que ningún escenario debe cargar: el arranque de scikit-learn domina el tiempo en frío
+FORBIDDEN_MODULES = ['sklearn', 'scipy', 'core.train_model']
+
+# Cada escenario imprime en la última línea un JSON con el tiempo y los módulos prohibidos cargados
+_SCENARIOS = {
+    'import_model_handler': """
+from core.model_handler import ModelHandler
+""",
+    'import_ailibrary': """
+from AIlibrary import AILibrary
+""",
+    'list_models': """
+import joptimizer
+joptimizer.main(['list-models', '--models-dir', {models_dir!r}])
+""",
+    'import_analyze_cli': """
+import scripts.run_production_test
+assert 'AIlibrary' not in sys.modules and 'core.parallel' not in sys.modules
+""",
+    'score_compact': """
+from core.model_handler import ModelHandler
+from utils.dataset_io import read_metrics
+model, _ = ModelHandler({models_dir!r}, verbose=False).load_model({model_path!r})
+data = read_metrics({data_path!r})
+model.predict_proba(data[list(model.feature_names_in_)])
+"""
+}
+
+_WRAPPER = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+{body}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{'elapsed_ms': elapsed, 'loaded': [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+def get_project_root():
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_scenario(name, repeat, **params):
+    """
+    Ejecuta un escenario en intérpretes nuevos y devuelve el mejor tiempo.
+
+    Args:
+        name: Nombre del escenario
+        repeat: Número de ejecuciones
+        **params: Valores para la plantilla del escenario
+
+    Returns:
+        Tuple[float, list]: Tiempo mínimo en ms y módulos prohibidos cargados
+    """
+    body = _SCENARIOS[name].format(**params)
+    code = _WRAPPER.format(root=get_project_root(), body=body, forbidden=FORBIDDEN_MODULES)
+    best, loaded = None, []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=get_project_root()
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best = result['elapsed_ms'] if best is None else min(best, result['elapsed_ms'])
+        loaded = sorted(set(loaded) | set(result['loaded']))
+    return best, loaded
+
+def build_compact_model(models_dir, data_path):
+    """Entrena un bosque pequeño y lo guarda en formato compacto para el escenario de evaluación."""
+    from core.train_model import ModelTrainer
+    from core.model_handler import ModelHandler
+    from utils.dataset_io import read_metrics
+
+    model, metrics = ModelTrainer(random_state=42).train_model(read_metrics(data_path), 'random_forest')
+    return ModelHandler(models_dir, verbose=False).export_compact(model, 'import_time', metrics)
+
+def test_import_time(repeat=3, scale=1.0):
+    """
+    Mide cada escenario en intérpretes nuevos y falla si supera su presupuesto o carga scikit-learn.
+
+    Args:
+        repeat: Ejecuciones por escenario (se toma la mejor)
+        scale: Factor aplicado a los presupuestos (máquinas lentas)
+    """
+    print("=== Prueba de Tiempo de Importación ===")
+
+    project_root = get_project_root()
+    train_path = os.path.join(project_root, 'data', 'train', 'code_metrics.csv')
+    test_path = os.path.join(project_root, 'data', 'test', 'code_metrics_test_final.csv')
+    failures = []
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        model_path = build_compact_model(models_dir, train_path)
+        params = {'models_dir': models_dir, 'model_path': model_path, 'data_path': test_path}
+
+        for name, budget in BUDGETS_MS.items():
+            elapsed, loaded = run_scenario(name, repeat, **params)
+            budget *= scale
+            ok = elapsed <= budget and not loaded
+            print(f"{name:<22} {elapsed:8.1f} ms (presupuesto {budget:.0f} ms)"
+                  f"{'' if not loaded else f'  módulos cargados: {loaded}'}  {'OK' if ok else 'FALLO'}")
+            if not ok:
+                failures.append(name)
+
+    assert not failures, f"Escenarios fuera de presupuesto: {failures}"
+    print("\nArranque en frío dentro del presupuesto")
+
+def main():
+    parser = argparse.ArgumentParser(description='Comprobar el tiempo de arranque en frío frente a un presupuesto')
+    parser.add_argument('--repeat', type=int, default=3, help='Ejecuciones por escenario (se toma la mejor)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Factor aplicado a los presupuestos (máquinas lentas)')
+    args = parser.parse_args()
+
+    try:
+        test_import_time(args.repeat, args.scale)
+    except AssertionError as e:
+        print(f"\n{e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
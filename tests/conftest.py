@@ -0,0 +1,37 @@
+# tests/conftest.py
+
+import os
+import pytest
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRAIN_PATH = os.path.join(PROJECT_ROOT, 'data', 'train', 'code_metrics.csv')
+TEST_PATH = os.path.join(PROJECT_ROOT, 'data', 'test', 'code_metrics_test_final.csv')
+
+
+@pytest.fixture(scope='session')
+def train_data():
+    """Datos de entrenamiento del repositorio (métricas y 'is_optimal')."""
+    return pd.read_csv(TRAIN_PATH)
+
+
+@pytest.fixture(scope='session')
+def test_features():
+    """Métricas de prueba sin la etiqueta."""
+    return pd.read_csv(TEST_PATH).drop(columns=['is_optimal'])
+
+
+@pytest.fixture(scope='session')
+def forest(train_data):
+    """Random Forest pequeño entrenado con los datos del repositorio."""
+    X = train_data.drop(columns=['is_optimal'])
+    return RandomForestClassifier(n_estimators=5, max_depth=6, random_state=0).fit(X, train_data['is_optimal'])
+
+
+@pytest.fixture(scope='session')
+def tree(train_data):
+    """Árbol de decisión pequeño entrenado con los datos del repositorio."""
+    X = train_data.drop(columns=['is_optimal'])
+    return DecisionTreeClassifier(max_depth=4, random_state=0).fit(X, train_data['is_optimal'])
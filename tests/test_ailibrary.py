@@ -0,0 +1,25 @@
+# tests/test_ailibrary.py
+
+import numpy as np
+from AIlibrary import AILibrary
+
+
+def make_library(forest):
+    library = AILibrary()
+    library.model = forest
+    return library
+
+
+def test_analyze_code_includes_full_results_by_default(forest, test_features):
+    results, analysis = make_library(forest).analyze_code(test_features)
+
+    full = analysis['full_results']
+    assert len(full) == len(test_features)
+    np.testing.assert_array_equal(full['predicted_label'], results['predictions'])
+
+
+def test_analyze_code_can_skip_full_results(forest, test_features):
+    results, analysis = make_library(forest).analyze_code(test_features, full_results=False)
+
+    assert analysis['full_results'] is None
+    np.testing.assert_array_equal(results['predictions'], forest.predict(test_features))
@@ -0,0 +1,53 @@
+# tests/test_binned_boosting.py
+
+import os
+import numpy as np
+import pytest
+from core.binned_boosting import BinCache, BinnedHistGradientBoosting, compute_bin_edges, apply_bins
+
+
+def make_values(seed, num_rows=500):
+    rng = np.random.RandomState(seed)
+    return np.column_stack([rng.randint(0, 20, num_rows), rng.rand(num_rows)]).astype(np.float32)
+
+
+def test_cache_hit_returns_the_stored_codes(tmp_path):
+    cache = BinCache(tmp_path)
+    values = make_values(0)
+    edges, codes = cache.get_or_compute(values, 255, 0)
+    cached_edges, cached_codes = cache.get_or_compute(values, 255, 0)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(cached_codes, codes)
+    np.testing.assert_array_equal(cached_codes, apply_bins(values, compute_bin_edges(values, 255, 0)))
+    assert all(np.array_equal(a, b) for a, b in zip(cached_edges, edges))
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    first, second, third = make_values(1), make_values(2), make_values(3)
+    cache = BinCache(tmp_path, max_bytes=None)
+    cache.get_or_compute(first, 255, 0)
+    entry_size = next(tmp_path.glob('*.npz')).stat().st_size
+    cache.max_bytes = 2 * entry_size + entry_size // 2
+
+    cache.get_or_compute(second, 255, 0)
+    # Envejecer las entradas y usar la primera: la menos usada pasa a ser la segunda
+    for path in tmp_path.glob('*.npz'):
+        os.utime(path, ns=(0, 0))
+    cache.get_or_compute(first, 255, 0)
+    cache.get_or_compute(third, 255, 0)
+
+    stored = {path.stem for path in tmp_path.glob('*.npz')}
+    assert stored == {BinCache.key(first, 255, 0), BinCache.key(third, 255, 0)}
+
+
+def test_model_fits_through_the_cache(tmp_path, train_data):
+    X, y = train_data.drop(columns=['is_optimal']), train_data['is_optimal']
+    model = BinnedHistGradientBoosting(max_iter=10, random_state=0, cache_dir=str(tmp_path))
+    model.fit(X, y)
+    again = BinnedHistGradientBoosting(max_iter=10, random_state=0, cache_dir=str(tmp_path)).fit(X, y)
+
+    assert len(list(tmp_path.glob('*.npz'))) == 1
+    np.testing.assert_array_equal(model.predict_proba(X), again.predict_proba(X))
+    with pytest.raises(ValueError, match='lack_of_cohesion'):
+        model.predict(X.drop(columns=['lack_of_cohesion']))
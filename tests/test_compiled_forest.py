@@ -0,0 +1,53 @@
+# tests/test_compiled_forest.py
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.tree import DecisionTreeClassifier
+from core.compiled_forest import LEAF_SCALES, NODE_ARRAYS, CompactForest, CompiledForest
+from core.model_handler import ModelHandler
+
+
+@pytest.fixture(scope='module')
+def split(train_data):
+    return train_data.drop(columns=['is_optimal']), train_data['is_optimal']
+
+
+@pytest.mark.parametrize('model', [
+    RandomForestClassifier(n_estimators=20, random_state=0),
+    RandomForestClassifier(n_estimators=20, max_features=None, random_state=0),
+    DecisionTreeClassifier(random_state=0)
+], ids=['random_forest', 'random_forest_all_features', 'decision_tree'])
+def test_compiled_probabilities_are_bit_identical(split, test_features, model):
+    m = model.fit(*split)
+    compiled = CompiledForest.from_model(m)
+
+    assert np.array_equal(compiled.predict_proba(test_features), m.predict_proba(test_features))
+    assert np.array_equal(compiled.predict(test_features), m.predict(test_features))
+    # Lotes más pequeños que la entrada recorren lo mismo
+    assert np.array_equal(compiled.predict_proba(test_features, batch_size=7), m.predict_proba(test_features))
+
+
+def test_missing_features_are_rejected(forest, test_features):
+    with pytest.raises(ValueError, match='lack_of_cohesion'):
+        CompiledForest.from_model(forest).predict_proba(test_features.drop(columns=['lack_of_cohesion']))
+    with pytest.raises(TypeError):
+        CompiledForest.from_model(object())
+
+
+@pytest.mark.parametrize('leaf_dtype', ['uint8', 'uint16', 'float32'])
+def test_exported_compact_artifact_keeps_parity(tmp_path, forest, test_features, leaf_dtype):
+    handler = ModelHandler(tmp_path, verbose=False)
+    path = handler.export_compact(forest, 'compact', leaf_dtype=leaf_dtype, parity_data=test_features)
+    compact, metadata = handler.load_model(path)
+
+    # Cada hoja se redondea como mucho media unidad de la escala; el promedio entre árboles no lo aumenta
+    scale = LEAF_SCALES[leaf_dtype]
+    tolerance = 0.5 / scale + 1e-12 if scale else 1e-6
+    parity = compact.check_parity(forest, test_features)
+    assert isinstance(compact, CompactForest)
+    assert parity['same_leaves']
+    assert parity['max_probability_diff'] <= tolerance
+    assert metadata['compact']['parity'] == parity
+    compiled = CompiledForest.from_model(forest)
+    assert compact.nbytes < sum(getattr(compiled, name).nbytes for name in NODE_ARRAYS)
@@ -0,0 +1,61 @@
+# tests/test_daemon.py
+
+import os
+import time
+import numpy as np
+import pytest
+from core.daemon import DaemonClient, send_request
+from core.model_handler import ModelHandler
+
+
+def wait_until(condition, timeout=20.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    path = str(tmp_path / 'daemon.sock')
+    yield path
+    if os.path.exists(path):
+        try:
+            send_request(path, {'op': 'shutdown'}, timeout=5)
+        except OSError:
+            pass
+
+
+def test_daemon_lifecycle(tmp_path, socket_path, tree, forest, test_features):
+    handler = ModelHandler(tmp_path / 'models', verbose=False)
+    model_path = handler.save_model(tree, str(tmp_path / 'models' / 'model'))
+
+    # Arranque: el primer cliente lanza el demonio y el segundo lo reutiliza
+    client = DaemonClient(model_path, socket_path=socket_path, idle_timeout=3)
+    assert client.spawned
+    reused = DaemonClient(model_path, socket_path=socket_path, idle_timeout=3)
+    assert not reused.spawned and reused.pid == client.pid
+
+    np.testing.assert_allclose(client.predict_proba(test_features), tree.predict_proba(test_features))
+
+    # Recarga: la siguiente solicitud espera a que se cargue el modelo nuevo
+    os.replace(handler.save_model(forest, str(tmp_path / 'models' / 'forest')), model_path)
+    np.testing.assert_allclose(client.predict_proba(test_features), forest.predict_proba(test_features))
+    stats = client.stats()
+    assert stats['reloads'] == 1 and stats['reload_errors'] == 0
+
+    # Un archivo corrupto no sustituye al modelo cargado
+    with open(model_path, 'wb') as f:
+        f.write(b'no es un modelo')
+    np.testing.assert_allclose(client.predict_proba(test_features), forest.predict_proba(test_features))
+    assert client.stats()['reload_errors'] == 1
+
+    # Inactividad: el demonio se detiene solo y borra su socket
+    assert wait_until(lambda: not os.path.exists(socket_path))
+
+
+def test_client_requires_an_existing_model(tmp_path, socket_path):
+    with pytest.raises(FileNotFoundError):
+        DaemonClient(str(tmp_path / 'missing.joblib'), socket_path=socket_path)
@@ -0,0 +1,81 @@
+# tests/test_dataset_io.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from core.metrics_schema import FEATURE_COLUMNS, METRICS_SCHEMA, TARGET_COLUMN, downcast_metrics
+from core.test_model import ModelTester
+from utils.dataset_io import convert_csv, iter_metrics, read_metrics
+
+
+@pytest.fixture
+def metrics_csv(tmp_path, train_data):
+    path = tmp_path / 'metrics.csv'
+    data = train_data.head(40).copy()
+    # El segundo bloque supera el rango de uint8: los dtypes no deben cambiar entre bloques
+    data.loc[20:, 'number_of_methods'] = 300
+    data['effective_lines'] = data['effective_lines'].astype(float)
+    data.to_csv(path, index=False)
+    return path
+
+
+def test_chunks_share_the_schema_dtypes(metrics_csv):
+    chunks = list(iter_metrics(str(metrics_csv), chunksize=20))
+
+    assert len(chunks) == 2
+    for chunk in chunks:
+        assert chunk[FEATURE_COLUMNS].dtypes.to_dict() == METRICS_SCHEMA
+    assert chunks[0].dtypes.equals(chunks[1].dtypes)
+
+
+def test_columnar_and_csv_reads_agree(metrics_csv):
+    columnar = read_metrics(convert_csv(str(metrics_csv)))
+    csv = read_metrics(str(metrics_csv))
+    assert columnar.dtypes.equals(csv.dtypes)
+    np.testing.assert_array_equal(columnar.to_numpy(), csv.to_numpy())
+
+
+def test_missing_metrics_are_rejected(tmp_path, train_data):
+    path = tmp_path / 'partial.csv'
+    train_data.drop(columns=['lack_of_cohesion']).head(5).to_csv(path, index=False)
+
+    with pytest.raises(ValueError, match='lack_of_cohesion'):
+        read_metrics(str(path))
+    with pytest.raises(ValueError, match='lack_of_cohesion'):
+        next(iter_metrics(str(path), chunksize=2))
+    # Con columnas explícitas solo se cargan las pedidas
+    assert list(read_metrics(str(path), columns=['lines_of_code']).columns) == ['lines_of_code']
+
+
+def test_training_data_requires_the_target(tmp_path, test_features):
+    path = tmp_path / 'unlabeled.csv'
+    test_features.head(5).to_csv(path, index=False)
+
+    assert TARGET_COLUMN not in read_metrics(str(path)).columns
+    with pytest.raises(ValueError, match=TARGET_COLUMN):
+        read_metrics(str(path), require_target=True)
+
+
+def test_counts_that_do_not_fit_are_rejected():
+    data = pd.DataFrame({'inheritance_depth': [1, 300]})
+    with pytest.raises(ValueError, match='inheritance_depth'):
+        downcast_metrics(data)
+    with pytest.raises(ValueError, match='enteros'):
+        downcast_metrics(pd.DataFrame({'number_of_methods': [1.5, np.nan]}))
+
+
+def test_line_counts_widen_instead_of_overflowing():
+    data = pd.DataFrame({'lines_of_code': [120, 70000], 'effective_lines': [80, 500]})
+    compact = downcast_metrics(data)
+
+    assert compact['lines_of_code'].dtype == np.uint32
+    assert compact['effective_lines'].dtype == np.uint16
+    assert compact['lines_of_code'].tolist() == [120, 70000]
+
+
+def test_scoring_does_not_downcast(forest, test_features):
+    data = test_features.head(10).astype(float)
+    data.loc[data.index[0], 'number_of_methods'] = 12.5
+
+    results = ModelTester().test_model(forest, data)
+    np.testing.assert_array_equal(results['probabilities'], forest.predict_proba(data))
@@ -0,0 +1,40 @@
+# tests/test_distillation.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from core.distillation import FastPathTree, build_transfer_set
+from core.train_model import ModelTrainer
+
+
+@pytest.fixture(scope='module')
+def distilled(forest, train_data):
+    return ModelTrainer(random_state=0).distill_model(forest, num_samples=20000, eval_data=train_data)
+
+
+def test_surrogate_stays_faithful_to_the_teacher(distilled, forest, train_data):
+    surrogate, metrics = distilled
+    distillation = metrics['distillation']
+
+    assert distillation['fidelity_synthetic'] > 0.85
+    assert distillation['fidelity_data'] > 0.95
+    X = train_data[list(forest.feature_names_in_)]
+    assert distillation['fidelity_data'] == np.mean(surrogate.predict(X) == forest.predict(X))
+    assert surrogate.get_depth() <= 8
+
+
+def test_fast_path_matches_the_surrogate_row_by_row(distilled, forest, test_features):
+    surrogate, _ = distilled
+    fast_path = FastPathTree.from_model(surrogate)
+    # Filas reales y sintéticas con columnas barajadas (combinaciones fuera de la distribución)
+    X = test_features[list(forest.feature_names_in_)]
+    rows = list(X.to_dict('records')) + list(build_transfer_set(500, random_state=1)[X.columns].to_dict('records'))
+
+    labels = [fast_path.predict_one(row)[0] for row in rows]
+    assert labels == surrogate.predict(pd.DataFrame(rows, columns=X.columns)).tolist()
+    assert np.array_equal(fast_path.predict_proba(X), surrogate.predict_proba(X))
+
+
+def test_fast_path_requires_a_single_tree(forest):
+    with pytest.raises(TypeError):
+        FastPathTree.from_model(forest)
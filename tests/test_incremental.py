@@ -0,0 +1,60 @@
+# tests/test_incremental.py
+
+import numpy as np
+import pandas as pd
+import pytest
+from AIlibrary import AILibrary
+from core.incremental import IncrementalAnalyzer
+
+
+@pytest.fixture
+def classes(test_features):
+    data = test_features.head(20).copy()
+    data.insert(0, 'file_path', [f'src/File{i}.java' for i in range(len(data))])
+    data.insert(1, 'class_name', [f'File{i}' for i in range(len(data))])
+    return data
+
+
+def make_analyzer(tmp_path, model):
+    library = AILibrary()
+    library.model = model
+    return IncrementalAnalyzer(library, str(tmp_path / 'state.cols'))
+
+
+def test_only_new_or_changed_classes_are_scored(tmp_path, forest, classes):
+    analyzer = make_analyzer(tmp_path, forest)
+    first, _ = analyzer.run(classes)
+    assert first['diff'] == {'new': 20, 'changed': 0, 'unchanged': 0, 'removed': 0}
+
+    again, _ = analyzer.run(classes)
+    assert len(again['changed']) == 0
+    np.testing.assert_array_equal(again['probabilities'], first['probabilities'])
+
+    # Una clase modificada, una eliminada y una nueva
+    edited = classes.drop(index=classes.index[-1]).copy()
+    edited.loc[edited.index[0], 'lines_of_code'] += 500
+    added = classes.iloc[[1]].assign(file_path='src/New.java', class_name='New')
+    edited = pd.concat([edited, added], ignore_index=True)
+    results, _ = analyzer.run(edited)
+
+    assert results['diff'] == {'new': 1, 'changed': 1, 'unchanged': 18, 'removed': 1}
+    assert results['changed'].tolist() == [0, 19]
+    features = edited[list(forest.feature_names_in_)]
+    np.testing.assert_allclose(results['probabilities'], forest.predict_proba(features))
+
+
+def test_model_change_invalidates_the_state(tmp_path, forest, tree, classes):
+    analyzer = make_analyzer(tmp_path, forest)
+    analyzer.run(classes)
+
+    analyzer.library.model = tree
+    results, _ = analyzer.run(classes)
+    assert results['diff']['unchanged'] == 0
+    np.testing.assert_allclose(results['probabilities'], tree.predict_proba(classes[list(tree.feature_names_in_)]))
+
+
+def test_missing_key_columns_are_rejected(tmp_path, forest, test_features):
+    analyzer = make_analyzer(tmp_path, forest)
+    analyzer.key_columns = ['file_path']
+    with pytest.raises(ValueError, match='file_path'):
+        analyzer.run(test_features.head(5))
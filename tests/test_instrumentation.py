@@ -0,0 +1,99 @@
+# tests/test_instrumentation.py
+
+import json
+import time
+import pytest
+from core.instrumentation import TimingRecorder, timed, timings
+from core.test_model import ModelTester
+
+
+@pytest.fixture
+def recorder():
+    recorder = TimingRecorder(enabled=True)
+    for seconds in (0.002, 0.002, 0.2):
+        recorder.record('analyze.score', seconds)
+    recorder.record('suggestions.evaluate', 20.0)
+    return recorder
+
+
+@pytest.fixture
+def global_timings():
+    timings.reset()
+    timings.enable()
+    yield timings
+    timings.disable()
+    timings.reset()
+
+
+def test_disabled_spans_record_nothing():
+    recorder = TimingRecorder()
+    with recorder.span('analyze.score') as span:
+        pass
+
+    assert span is None
+    assert recorder.span('a') is recorder.span('b')
+    assert recorder.get_stats() == {}
+
+
+def test_spans_record_counts_and_totals(recorder):
+    seen = []
+    recorder.enable(lambda name, seconds: seen.append(name))
+    with recorder.span('analyze.score'):
+        pass
+
+    stats = recorder.get_stats()['analyze.score']
+    assert stats['count'] == 4 and seen == ['analyze.score']
+    assert stats['total_s'] == pytest.approx(0.204, abs=0.01)
+    assert stats['max_s'] == 0.2
+    assert stats['histogram']['<=0.005'] == 2 and stats['histogram']['<=0.5'] == 1
+    assert recorder.get_stats()['suggestions.evaluate']['histogram']['>10.0'] == 1
+
+
+def test_prometheus_histogram_is_cumulative(recorder):
+    lines = recorder.to_prometheus().splitlines()
+
+    assert lines[1] == '# TYPE joptimizer_stage_seconds histogram'
+    assert 'joptimizer_stage_seconds_bucket{stage="analyze.score",le="0.001"} 0' in lines
+    assert 'joptimizer_stage_seconds_bucket{stage="analyze.score",le="0.005"} 2' in lines
+    assert 'joptimizer_stage_seconds_bucket{stage="analyze.score",le="+Inf"} 3' in lines
+    assert 'joptimizer_stage_seconds_bucket{stage="suggestions.evaluate",le="10.0"} 0' in lines
+    assert 'joptimizer_stage_seconds_count{stage="analyze.score"} 3' in lines
+    assert any(line.startswith('joptimizer_stage_seconds_sum{stage="analyze.score"} 0.20') for line in lines)
+
+
+def test_json_dump_round_trips(tmp_path, recorder):
+    path = tmp_path / 'timings.json'
+    recorder.dump_json(str(path))
+    assert json.loads(path.read_text(encoding='utf-8')) == recorder.get_stats()
+
+
+def test_capture_fills_last_capture():
+    recorder = TimingRecorder()
+    with recorder.capture('cprofile', limit=5):
+        sorted(range(1000), key=lambda value: -value)
+
+    assert 'function calls' in recorder.last_capture
+    with pytest.raises(ValueError):
+        with recorder.capture('perf'):
+            pass
+
+
+def test_timed_uses_the_shared_recorder(global_timings):
+    @timed('stage')
+    def stage(value):
+        return value * 2
+
+    assert stage(2) == 4
+    assert global_timings.get_stats()['stage']['count'] == 1
+
+
+def test_predict_span_times_the_model_call(global_timings, forest, test_features):
+    class SlowModel:
+        classes_ = forest.classes_
+
+        def predict_proba(self, X):
+            time.sleep(0.05)
+            return forest.predict_proba(X)
+
+    ModelTester().test_model(SlowModel(), test_features)
+    assert global_timings.get_stats()['test_model.predict']['total_s'] >= 0.05
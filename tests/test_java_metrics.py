@@ -0,0 +1,111 @@
+# tests/test_java_metrics.py
+
+import os
+import pytest
+from core.java_metrics import JavaMetricsExtractor, SourceMetricsCache, parse_java_source
+
+
+def write_sources(root, files):
+    for relative, source in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source)
+
+
+def test_nested_types_are_qualified_by_their_enclosing_type():
+    parsed = parse_java_source("""
+package com.acme;
+public class Order {
+    static class Builder { }
+}
+""")
+    names = [record['qualified_name'] for record in parsed['classes']]
+    assert names == ['com.acme.Order', 'com.acme.Order.Builder']
+
+
+def test_same_named_nested_classes_keep_their_own_inheritance_depth(tmp_path):
+    write_sources(tmp_path, {
+        'com/acme/Base.java': "package com.acme;\npublic class Base { }\n",
+        'com/acme/Middle.java': "package com.acme;\npublic class Middle extends Base { }\n",
+        'com/acme/Order.java': """
+package com.acme;
+public class Order {
+    static class Builder extends Middle { }
+}
+""",
+        'com/acme/Invoice.java': """
+package com.acme;
+public class Invoice {
+    static class Builder { }
+}
+"""
+    })
+    frame = JavaMetricsExtractor(workers=1).extract(str(tmp_path))
+    depths = dict(zip(frame['file_path'].map(os.path.basename) + ':' + frame['class_name'],
+                      frame['inheritance_depth']))
+
+    assert depths['Order.java:Builder'] == 2
+    assert depths['Invoice.java:Builder'] == 0
+    assert depths['Middle.java:Middle'] == 1
+
+
+def test_imports_of_project_packages_are_not_external(tmp_path):
+    write_sources(tmp_path, {
+        'com/acme/model/User.java': "package com.acme.model;\npublic class User { }\n",
+        'com/acme/web/UserController.java': """
+package com.acme.web;
+import com.acme.model.User;
+import com.acme.model.*;
+import java.util.List;
+import org.springframework.stereotype.Controller;
+public class UserController { }
+"""
+    })
+    frame = JavaMetricsExtractor(workers=1).extract(str(tmp_path))
+    controller = frame[frame['class_name'] == 'UserController'].iloc[0]
+    assert controller['external_dependencies'] == 1
+
+
+def test_cache_skips_unchanged_files(tmp_path):
+    sources = tmp_path / 'src'
+    write_sources(sources, {
+        'A.java': "public class A { void run() { if (true) { } } }\n",
+        'B.java': "public class B extends A { }\n"
+    })
+    extractor = JavaMetricsExtractor(workers=1, cache_path=str(tmp_path / 'cache.sqlite'))
+
+    first = extractor.extract(str(sources))
+    assert extractor.last_run == {'files': 2, 'parsed': 2, 'cached': 0}
+
+    second = extractor.extract(str(sources))
+    assert extractor.last_run == {'files': 2, 'parsed': 0, 'cached': 2}
+    assert second.equals(first)
+
+    (sources / 'B.java').write_text("public class B extends A { void run() { } }\n")
+    extractor.extract(str(sources))
+    assert extractor.last_run['parsed'] == 1
+
+
+def test_shared_cache_keeps_other_source_trees(tmp_path):
+    first, second = tmp_path / 'app', tmp_path / 'app-lib'
+    write_sources(first, {'A.java': "public class A { }\n", 'Old.java': "public class Old { }\n"})
+    write_sources(second, {'L.java': "public class L { }\n"})
+    extractor = JavaMetricsExtractor(workers=1, cache_path=str(tmp_path / 'cache.sqlite'))
+    extractor.extract(str(first))
+    extractor.extract(str(second))
+
+    # Un archivo borrado se poda solo en su árbol; el otro árbol sigue en caché
+    (first / 'Old.java').unlink()
+    extractor.extract(str(first))
+    assert extractor.last_run == {'files': 1, 'parsed': 0, 'cached': 1}
+    extractor.extract(str(second))
+    assert extractor.last_run == {'files': 1, 'parsed': 0, 'cached': 1}
+
+    cache = SourceMetricsCache(str(tmp_path / 'cache.sqlite'))
+    assert sorted(os.path.basename(path) for path in cache.load()) == ['A.java', 'L.java']
+    cache.close()
+
+
+def test_missing_source_dir_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        JavaMetricsExtractor(workers=1).extract(str(tmp_path / 'missing'))
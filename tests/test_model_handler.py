@@ -0,0 +1,145 @@
+# tests/test_model_handler.py
+
+import os
+import json
+import threading
+import numpy as np
+import pytest
+from pathlib import Path
+from core.model_handler import ModelHandler, INDEX_FILENAME, INDEX_LOCK_FILENAME
+
+
+def test_list_models_reads_index_and_filters(tmp_path, forest, tree):
+    handler = ModelHandler(tmp_path, verbose=False)
+    handler.save_model(forest, 'rf', {'model_type': 'random_forest', 'test_score': 0.9})
+    handler.save_model(tree, 'dt', {'model_type': 'decision_tree', 'test_score': 0.7})
+
+    assert len(handler.list_models()) == 2
+    assert [m['metadata']['model_name'] for m in handler.list_models(model_type='decision_tree')] == ['dt']
+    assert [m['metadata']['model_name'] for m in handler.list_models(min_test_score=0.8)] == ['rf']
+    assert handler.list_models(since='99991231_000000') == []
+
+
+def test_list_models_rebuilds_missing_index(tmp_path, tree):
+    handler = ModelHandler(tmp_path, verbose=False)
+    handler.save_model(tree, 'dt', {'model_type': 'decision_tree'})
+    (tmp_path / INDEX_FILENAME).unlink()
+
+    models = handler.list_models()
+    assert len(models) == 1
+    assert json.loads((tmp_path / INDEX_FILENAME).read_text())[models[0]['filename']]['model_type'] == 'decision_tree'
+
+
+def test_concurrent_saves_keep_every_index_entry(tmp_path, tree):
+    handler = ModelHandler(tmp_path, verbose=False)
+    threads = [threading.Thread(target=handler.save_model, args=(tree, f'dt{i}')) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    index = json.loads((tmp_path / INDEX_FILENAME).read_text())
+    assert len(index) == 8
+
+
+def test_models_saved_outside_models_dir_stay_indexed(tmp_path, tree):
+    handler = ModelHandler(tmp_path / 'models', verbose=False)
+    (tmp_path / 'other').mkdir()
+    outside = handler.save_model(tree, str(tmp_path / 'other' / 'dt'))
+
+    assert [m['filepath'] for m in handler.list_models()] == [outside]
+    assert [m['filepath'] for m in handler.list_models()] == [outside]
+
+
+def test_content_addressed_saves_deduplicate_loaded_models(tmp_path, forest):
+    handler = ModelHandler(tmp_path, verbose=False, content_addressed=True)
+    first = handler.save_model(forest, 'rf')
+    loaded, _ = handler.load_model(first)
+    handler.save_model(loaded, 'rf_again')
+
+    assert len(list((tmp_path / 'objects').glob('*.joblib'))) == 1
+
+
+def test_collect_garbage_removes_only_unreferenced_objects(tmp_path, forest, tree):
+    handler = ModelHandler(tmp_path, verbose=False, content_addressed=True)
+    kept = handler.save_model(forest, 'rf')
+    dropped = handler.save_model(tree, 'dt')
+    Path(dropped).unlink()
+
+    removed = handler.collect_garbage()
+    assert len(removed) == 1
+    assert handler.load_model(kept)[0].n_estimators == forest.n_estimators
+
+
+def test_collect_garbage_keeps_objects_referenced_outside_models_dir(tmp_path, tree):
+    handler = ModelHandler(tmp_path / 'models', verbose=False, content_addressed=True)
+    (tmp_path / 'other').mkdir()
+    outside = handler.save_model(tree, str(tmp_path / 'other' / 'dt'))
+
+    assert handler.collect_garbage() == []
+    model, _ = handler.load_model(outside)
+    assert model.get_depth() == tree.get_depth()
+
+
+def test_missing_object_is_reported(tmp_path, tree):
+    handler = ModelHandler(tmp_path, verbose=False, content_addressed=True)
+    saved = handler.save_model(tree, 'dt')
+    for blob in (tmp_path / 'objects').glob('*.joblib'):
+        blob.unlink()
+
+    with pytest.raises(FileNotFoundError, match="objeto referenciado"):
+        handler.load_model(saved)
+
+
+def test_cache_bytes_counts_referenced_object_size(tmp_path, forest, tree):
+    handler = ModelHandler(tmp_path, verbose=False, content_addressed=True, cache_size=4)
+    rf_path = handler.save_model(forest, 'rf')
+    dt_path = handler.save_model(tree, 'dt')
+    blobs = sorted(blob.stat().st_size for blob in (tmp_path / 'objects').glob('*.joblib'))
+    handler.cache_bytes = blobs[-1]
+
+    handler.load_model(rf_path)
+    assert handler.cache_info()['bytes'] == blobs[-1]
+    handler.load_model(dt_path)
+    assert handler.cache_info()['entries'] == 1
+
+
+def test_cache_hits_share_the_loaded_model(tmp_path, tree):
+    path = ModelHandler(tmp_path, verbose=False).save_model(tree, 'dt')
+    handler = ModelHandler(tmp_path, verbose=False, cache_size=2)
+    model, metadata = handler.load_model(path)
+    metadata['model_name'] = 'cambiado'
+
+    cached, cached_metadata = handler.load_model(path)
+    # El modelo en caché es de solo lectura y se comparte; los metadatos son una copia
+    assert cached is model
+    assert cached_metadata['model_name'] == 'dt'
+    assert ModelHandler(tmp_path, verbose=False).load_model(path)[0] is not model
+
+
+def test_mmap_loading_only_applies_to_compact_artifacts(tmp_path, forest):
+    handler = ModelHandler(tmp_path, verbose=False)
+    compact, _ = handler.load_model(handler.export_compact(forest, 'compact'), mmap_mode='r')
+    assert isinstance(compact.value, np.memmap) and isinstance(compact.threshold, np.memmap)
+
+    with pytest.raises(ValueError, match='mmap_mode'):
+        handler.load_model(handler.save_model(forest, 'rf'), mmap_mode='r')
+
+
+def test_list_models_on_a_read_only_directory(tmp_path, tree, monkeypatch):
+    handler = ModelHandler(tmp_path, verbose=False)
+    path = handler.save_model(tree, 'dt', {'model_type': 'decision_tree'})
+    (tmp_path / INDEX_FILENAME).unlink()
+    (tmp_path / INDEX_LOCK_FILENAME).unlink()
+
+    # Simula un models_dir de solo lectura (como root, chmod no basta)
+    real_access = os.access
+    monkeypatch.setattr(os, 'access', lambda target, mode: False if mode == os.W_OK else real_access(target, mode))
+
+    def no_writes(*args, **kwargs):
+        raise PermissionError("solo lectura")
+    monkeypatch.setattr(handler, '_index_lock', no_writes)
+    monkeypatch.setattr(handler, '_write_index', no_writes)
+
+    assert [m['filepath'] for m in handler.list_models(model_type='decision_tree')] == [path]
+    assert not (tmp_path / INDEX_FILENAME).exists()
@@ -0,0 +1,63 @@
+# tests/test_out_of_core.py
+
+import numpy as np
+import pytest
+from core.out_of_core import ReservoirSampler, holdout_mask
+from core.train_model import ModelTrainer
+
+
+@pytest.fixture
+def train_csv(tmp_path, train_data):
+    path = tmp_path / 'train.csv'
+    train_data.to_csv(path, index=False)
+    return str(path)
+
+
+def make_trainer():
+    trainer = ModelTrainer(random_state=0)
+    trainer.models['random_forest'].set_params(n_estimators=10, max_depth=6)
+    return trainer
+
+
+def test_holdout_mask_is_stable_across_passes():
+    rows = np.arange(10000)
+    mask = holdout_mask(rows, 0.2, seed=3)
+    np.testing.assert_array_equal(mask[5000:], holdout_mask(rows[5000:], 0.2, seed=3))
+    assert 0.17 < mask.mean() < 0.23
+
+
+def test_reservoir_keeps_a_bounded_sample(train_data):
+    features = [column for column in train_data.columns if column != 'is_optimal']
+    sampler = ReservoirSampler(features, sample_size=50, num_reservoirs=2, seed=0)
+    for start in range(0, len(train_data), 128):
+        chunk = train_data.iloc[start:start + 128]
+        sampler.add(chunk[features], chunk['is_optimal'])
+
+    assert sampler.rows_seen == len(train_data)
+    X, y = sampler.sample(0)
+    assert len(X) == len(y) == 50
+    with pytest.raises(ValueError):
+        ReservoirSampler(features, sample_size=0)
+
+
+def test_train_out_of_core_reads_in_chunks(train_csv, train_data):
+    model, metrics = make_trainer().train_out_of_core(train_csv, chunksize=128, sample_size=200, num_reservoirs=2)
+
+    details = metrics['out_of_core']
+    assert details['rows_seen'] == len(train_data)
+    assert details['holdout_rows'] == metrics['confusion_matrix'].sum()
+    assert details['trees_per_reservoir'] == [5, 5]
+    assert len(model.estimators_) == 10 and not model.warm_start
+    assert metrics['test_score'] > 0.8
+
+    _, again = make_trainer().train_out_of_core(train_csv, chunksize=300, sample_size=200, num_reservoirs=2)
+    assert again['out_of_core']['holdout_rows'] == details['holdout_rows']
+
+
+def test_train_out_of_core_requires_the_target(tmp_path, test_features):
+    path = tmp_path / 'unlabeled.csv'
+    test_features.to_csv(path, index=False)
+    with pytest.raises(ValueError, match='is_optimal'):
+        make_trainer().train_out_of_core(str(path), chunksize=100)
+    with pytest.raises(ValueError, match='Tipo de modelo'):
+        make_trainer().train_out_of_core(str(path), model_type='svm')
@@ -0,0 +1,60 @@
+# tests/test_parallel.py
+
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from core.binned_boosting import BinnedHistGradientBoosting
+from core.compiled_forest import CompactForest, CompiledForest
+from core.model_handler import ModelHandler
+from core.parallel import ParallelScorer
+
+
+@pytest.fixture
+def shuffled_features(test_features):
+    # Varias copias barajadas: cada fragmento recibe filas distintas
+    return pd.concat([test_features] * 3, ignore_index=True).sample(frac=1, random_state=0)
+
+
+def save(tmp_path, model):
+    return ModelHandler(tmp_path, verbose=False).save_model(model, 'model')
+
+
+@pytest.mark.parametrize('backend', ['sklearn', 'compiled'])
+def test_parallel_scores_match_single_process_in_input_order(tmp_path, forest, shuffled_features, backend):
+    with ParallelScorer(save(tmp_path, forest), workers=3, backend=backend, min_rows_per_worker=10) as scorer:
+        probabilities = scorer.predict_proba(shuffled_features)
+        from_array = scorer.predict_proba(shuffled_features[list(forest.feature_names_in_)].to_numpy())
+        labels = scorer.predict(shuffled_features)
+        arrays_dir = scorer._arrays_dir
+
+    assert np.array_equal(probabilities, forest.predict_proba(shuffled_features))
+    assert np.array_equal(from_array, probabilities)
+    assert np.array_equal(labels, forest.predict(shuffled_features))
+    # close() borra los arreglos compartidos
+    assert arrays_dir is not None and not os.path.exists(arrays_dir)
+
+
+def test_models_that_cannot_be_compiled_load_in_each_worker(tmp_path, train_data, shuffled_features):
+    X, y = train_data.drop(columns=['is_optimal']), train_data['is_optimal']
+    model = BinnedHistGradientBoosting(max_iter=5, random_state=0).fit(X, y)
+
+    with ParallelScorer(save(tmp_path, model), workers=2, min_rows_per_worker=10) as scorer:
+        assert np.array_equal(scorer.predict_proba(shuffled_features), model.predict_proba(shuffled_features))
+        assert scorer._arrays_dir is None
+
+
+@pytest.mark.parametrize('compile_model', [CompiledForest.from_model, CompactForest.from_model])
+def test_saved_arrays_open_memory_mapped(tmp_path, forest, test_features, compile_model):
+    compiled = compile_model(forest)
+    loaded = CompiledForest.load_arrays(compiled.save_arrays(str(tmp_path / 'arrays')))
+
+    assert type(loaded) is type(compiled)
+    assert isinstance(loaded.value, np.memmap) and isinstance(loaded.children_left, np.memmap)
+    assert np.array_equal(loaded.classes_, forest.classes_)
+    assert np.array_equal(loaded.predict_proba(test_features), compiled.predict_proba(test_features))
+
+
+def test_missing_arrays_are_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        CompiledForest.load_arrays(str(tmp_path))
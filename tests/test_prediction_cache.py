@@ -0,0 +1,55 @@
+# tests/test_prediction_cache.py
+
+import numpy as np
+import pandas as pd
+from core.prediction_cache import PredictionCache
+
+FINGERPRINT = '0123456789abcdef' * 4
+
+
+def make_features(num_rows):
+    return pd.DataFrame({'lines_of_code': np.arange(num_rows), 'lack_of_cohesion': np.linspace(0, 1, num_rows)})
+
+
+def test_memory_is_bounded_to_max_size():
+    cache = PredictionCache(max_size=3)
+    keys = PredictionCache.row_keys(make_features(5), FINGERPRINT)
+    cache.put_many(keys, np.full((5, 2), 0.5))
+
+    assert cache.get_stats()['size'] == 3
+    hits, _, misses = cache.get_many(keys)
+    assert hits.tolist() == [2, 3, 4]
+    assert misses.tolist() == [0, 1]
+
+
+def test_entries_do_not_keep_the_batch_alive():
+    cache = PredictionCache(max_size=10)
+    keys = PredictionCache.row_keys(make_features(4), FINGERPRINT)
+    probabilities = np.random.default_rng(0).random((4, 2))
+    cache.put_many(keys, probabilities)
+
+    _, stored, _ = cache.get_many(keys)
+    assert all(row.base is None for row in stored)
+    np.testing.assert_array_equal(np.vstack(stored), probabilities)
+
+
+def test_keys_depend_on_the_model_fingerprint():
+    features = make_features(3)
+    assert PredictionCache.row_keys(features, FINGERPRINT) != PredictionCache.row_keys(features, 'f' * 32)
+    assert PredictionCache.row_keys(features, FINGERPRINT) == PredictionCache.row_keys(features.copy(), FINGERPRINT)
+
+
+def test_entries_persist_on_disk(tmp_path):
+    path = str(tmp_path / 'predictions.sqlite')
+    keys = PredictionCache.row_keys(make_features(3), FINGERPRINT)
+    cache = PredictionCache(path=path)
+    cache.put_many(keys, [[0.2, 0.8], [0.6, 0.4], [1.0, 0.0]])
+    cache.close()
+
+    reopened = PredictionCache(path=path)
+    hits, stored, misses = reopened.get_many(keys)
+    assert len(hits) == 3 and len(misses) == 0
+    assert stored[0].tolist() == [0.2, 0.8]
+    reopened.clear()
+    assert len(reopened.get_many(keys)[0]) == 0
+    reopened.close()
@@ -0,0 +1,64 @@
+# tests/test_rule_engine.py
+
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from AIlibrary import AILibrary
+from core.rule_engine import DEFAULT_CONFIG_PATH, RuleEngine
+
+
+@pytest.fixture
+def metrics():
+    return pd.DataFrame({
+        'cyclomatic_complexity': [20, 3, 3, 18],
+        'coupling_between_objects': [2, 2, 12, 2],
+        'lack_of_cohesion': [0.1, 0.1, 0.1, 0.9],
+        'number_of_methods': [5, 5, 5, 5]
+    }, index=[10, 11, 12, 13])
+
+
+def test_rules_come_from_the_configuration():
+    with open(DEFAULT_CONFIG_PATH, encoding='utf-8') as f:
+        configured = json.load(f)['optimization_rules']
+    assert RuleEngine().rules == configured
+
+
+def test_missing_configuration_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        RuleEngine.from_config(tmp_path / 'missing.json')
+    config = tmp_path / 'parameters.json'
+    config.write_text('{}')
+    with pytest.raises(ValueError, match='optimization_rules'):
+        RuleEngine.from_config(config)
+
+
+def test_issue_and_suboptimal_indexes(metrics):
+    evaluation = RuleEngine().evaluate(metrics, np.array([0, 0, 1, 0]))
+
+    assert evaluation['issue_index'].tolist() == [10, 13]
+    assert evaluation['suboptimal_index'].tolist() == [10, 11, 13]
+    assert RuleEngine().decode(evaluation['issue_mask'][3]) == ['Alta complejidad ciclomática', 'Baja cohesión']
+
+
+def test_predictions_are_aligned_by_index(metrics):
+    engine = RuleEngine()
+    shuffled = pd.Series([1, 0, 0, 0], index=[12, 13, 11, 10])
+
+    evaluation = engine.evaluate(metrics, shuffled)
+    assert evaluation['suboptimal_index'].tolist() == [10, 11, 13]
+    assert [suggestion['index'] for suggestion in engine.to_suggestions(evaluation)] == [10, 13]
+
+    with pytest.raises(ValueError, match='Faltan predicciones'):
+        engine.evaluate(metrics, shuffled.iloc[1:])
+
+
+def test_suggestions_follow_the_scored_rows(forest, test_features):
+    library = AILibrary()
+    library.model = forest
+    subset = test_features.iloc[::-2]
+    results, _ = library.analyze_code(subset, full_results=False)
+
+    suggestions = library.get_optimization_suggestions(subset.sort_index(), results)
+    suboptimal = set(subset.index[results['predictions'] == 0])
+    assert {suggestion['index'] for suggestion in suggestions} <= suboptimal
@@ -0,0 +1,113 @@
+# tests/test_server.py
+
+import asyncio
+import json
+import pytest
+from AIlibrary import AILibrary
+from core.server import InferenceServer
+
+
+def make_server(forest, **kwargs):
+    library = AILibrary()
+    library.model = forest
+    return InferenceServer(library, **kwargs)
+
+
+def run_with_server(server, tmp_path, make_coroutine):
+    async def main():
+        await server.start(unix_socket=str(tmp_path / 'server.sock'))
+        try:
+            return await make_coroutine()
+        finally:
+            await server.stop()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_a_batch(tmp_path, forest, test_features):
+    server = make_server(forest, max_wait_ms=50)
+    rows = test_features.head(4).to_dict('records')
+
+    results = run_with_server(server, tmp_path, lambda: asyncio.gather(*(server.predict([row]) for row in rows)))
+
+    expected = forest.predict(test_features.head(4)).tolist()
+    assert [result['predictions'][0] for result in results] == expected
+    assert server.get_stats()['batches'] == 1
+
+
+def test_bad_request_does_not_fail_the_rest_of_its_batch(tmp_path, forest, test_features):
+    server = make_server(forest, max_wait_ms=50)
+    good = test_features.head(2).to_dict('records')
+    non_numeric = [dict(good[0], lines_of_code='abc')]
+    # Pasa la validación pero el modelo la rechaza al evaluar el lote (valor infinito)
+    infinite = [dict(good[0], lack_of_cohesion=float('inf'))]
+
+    results = run_with_server(server, tmp_path, lambda: asyncio.gather(
+        server.predict(good), server.predict(non_numeric), server.predict(infinite),
+        return_exceptions=True
+    ))
+
+    assert results[0]['predictions'] == forest.predict(test_features.head(2)).tolist()
+    assert isinstance(results[1], ValueError) and 'lines_of_code' in str(results[1])
+    assert isinstance(results[2], Exception)
+    assert server.get_stats()['errors'] == 1
+
+
+def test_requests_over_the_socket(tmp_path, forest, test_features):
+    server = make_server(forest)
+    socket_path = str(tmp_path / 'server.sock')
+
+    async def client():
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        requests = [
+            {'id': 1, 'metrics': test_features.iloc[0].to_dict()},
+            {'id': 2, 'rows': []},
+            {'id': 3, 'op': 'stats'}
+        ]
+        responses = []
+        for request in requests:
+            writer.write(json.dumps(request).encode('utf-8') + b'\n')
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        return responses
+
+    first, empty, stats = run_with_server(server, tmp_path, client)
+
+    assert first['id'] == 1 and len(first['predictions']) == 1
+    assert empty['id'] == 2 and 'error' in empty
+    assert stats['requests'] == 1
+
+
+def test_model_without_feature_names_is_rejected(train_data):
+    from sklearn.tree import DecisionTreeClassifier
+    model = DecisionTreeClassifier(max_depth=2).fit(train_data.drop(columns=['is_optimal']).values,
+                                                    train_data['is_optimal'])
+    with pytest.raises(ValueError, match="feature_names_in_"):
+        make_server(model)
+
+
+def test_oversized_request_gets_an_error_response(tmp_path, forest, test_features):
+    server = make_server(forest, max_request_bytes=1024)
+    socket_path = str(tmp_path / 'server.sock')
+
+    async def client():
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        rows = test_features.head(50).to_dict('records')
+        writer.write(json.dumps({'id': 1, 'rows': rows}).encode('utf-8') + b'\n')
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        closed = await reader.read() == b''
+        writer.close()
+
+        # El servidor sigue atendiendo conexiones nuevas
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        writer.write(json.dumps({'id': 2, 'op': 'stats'}).encode('utf-8') + b'\n')
+        await writer.drain()
+        stats = json.loads(await reader.readline())
+        writer.close()
+        return response, closed, stats
+
+    response, closed, stats = run_with_server(server, tmp_path, client)
+
+    assert '1024' in response['error'] and closed
+    assert stats['id'] == 2
@@ -0,0 +1,51 @@
+# tests/test_standalone_export.py
+
+import json
+import subprocess
+import sys
+import textwrap
+import numpy as np
+import pytest
+from core.compiled_forest import CompactForest
+from core.standalone_export import export_standalone
+
+# Se ejecuta con -I (sin PYTHONPATH ni site de usuario) y con las bibliotecas numéricas bloqueadas
+RUNNER = textwrap.dedent('''
+    import csv, json, sys
+    for name in ('sklearn', 'numpy', 'pandas', 'joblib', 'scipy'):
+        sys.modules[name] = None
+    sys.path.insert(0, sys.argv[1])
+    import predictor
+    with open(sys.argv[2], newline='') as f:
+        rows = [{key: float(value) for key, value in row.items()} for row in csv.DictReader(f)]
+    json.dump(predictor.predict_proba(rows), sys.stdout)
+''')
+
+
+def run_standalone(tmp_path, model, features):
+    export_standalone(model, str(tmp_path / 'predictor.py'))
+    data_path = tmp_path / 'metrics.csv'
+    features.to_csv(data_path, index=False)
+    result = subprocess.run(
+        [sys.executable, '-I', '-c', RUNNER, str(tmp_path), str(data_path)],
+        capture_output=True, text=True, check=True, timeout=120
+    )
+    return np.array(json.loads(result.stdout))
+
+
+@pytest.mark.parametrize('model_name', ['forest', 'tree'])
+def test_standalone_module_reproduces_sklearn(tmp_path, request, test_features, model_name):
+    model = request.getfixturevalue(model_name)
+    probabilities = run_standalone(tmp_path, model, test_features)
+    assert np.array_equal(probabilities, model.predict_proba(test_features))
+
+
+def test_standalone_module_from_compact_artifact(tmp_path, forest, test_features):
+    compact = CompactForest.from_model(forest, leaf_dtype='uint16')
+    probabilities = run_standalone(tmp_path, compact, test_features)
+    np.testing.assert_allclose(probabilities, compact.predict_proba(test_features), rtol=0, atol=1e-12)
+
+
+def test_invalid_module_name_is_rejected(tmp_path, forest):
+    with pytest.raises(ValueError, match='identificador'):
+        export_standalone(forest, str(tmp_path / 'mi-modelo.py'))
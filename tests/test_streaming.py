@@ -0,0 +1,46 @@
+# tests/test_streaming.py
+
+import numpy as np
+import pytest
+from core.streaming import StreamingSummary
+
+
+def make_batch(seed, num_rows):
+    rng = np.random.default_rng(seed)
+    positive = rng.random(num_rows)
+    probabilities = np.column_stack([1 - positive, positive])
+    return (positive > 0.5).astype(int), probabilities
+
+
+def summarize(chunks):
+    summary = StreamingSummary()
+    for predictions, probabilities in chunks:
+        summary.update(predictions, probabilities)
+    return summary
+
+
+def test_merged_chunks_match_the_whole_array():
+    chunks = [make_batch(seed, size) for seed, size in enumerate([1, 500, 37, 0, 2000])]
+    # Dos acumuladores (p.ej. de dos procesos) con bloques distintos
+    merged = summarize(chunks[:2]).merge(summarize(chunks[2:]))
+
+    predictions = np.concatenate([batch[0] for batch in chunks])
+    confidence = np.concatenate([batch[1] for batch in chunks]).max(axis=1)
+    stats = merged.to_dict()
+    assert stats['num_samples'] == len(predictions) and merged.num_chunks == 4
+    assert stats['prediction_counts'] == {'optimal_count': int((predictions == 1).sum()),
+                                          'suboptimal_count': int((predictions == 0).sum())}
+    analysis = stats['confidence_analysis']
+    assert analysis['mean_confidence'] == pytest.approx(np.mean(confidence), rel=1e-12)
+    # Desviación muestral, como pandas en ModelTester.analyze_predictions
+    assert analysis['std_confidence'] == pytest.approx(np.std(confidence, ddof=1), rel=1e-12)
+    assert (analysis['min_confidence'], analysis['max_confidence']) == (confidence.min(), confidence.max())
+
+
+def test_merging_empty_summaries_is_a_no_op():
+    summary = summarize([make_batch(0, 10)])
+    before = summary.to_dict()
+
+    assert summary.merge(StreamingSummary()).to_dict() == before
+    assert StreamingSummary().merge(summary).to_dict() == before
+    assert np.isnan(StreamingSummary().to_dict()['confidence_analysis']['mean_confidence'])
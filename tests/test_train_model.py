@@ -0,0 +1,75 @@
+# tests/test_train_model.py
+
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from core.train_model import ModelTrainer
+
+
+def tree_seeds(model):
+    return [estimator.random_state for estimator in model.estimators_]
+
+
+def test_grown_trees_never_reuse_seeds(train_data):
+    X, y = train_data.drop(columns=['is_optimal']), train_data['is_optimal']
+    model = RandomForestClassifier(n_estimators=6, max_depth=4, random_state=0).fit(X, y)
+    trainer = ModelTrainer(random_state=0)
+
+    seeds = set(tree_seeds(model))
+    metadata = None
+    for _ in range(3):
+        model, metadata = trainer.grow_model(model, train_data, previous_metadata=metadata, n_new_trees=4, max_trees=6)
+        new_seeds = tree_seeds(model)[-4:]
+        assert not seeds & set(new_seeds)
+        seeds.update(new_seeds)
+
+    assert len(model.estimators_) == 6
+    assert metadata['trees_grown'] == 18
+    assert model.random_state == 0
+    assert metadata['tree_batches'].count('initial') == 0
+
+
+def test_grow_model_requires_a_random_forest(train_data, tree):
+    with pytest.raises(TypeError):
+        ModelTrainer().grow_model(tree, train_data)
+
+
+SEARCH_SPACE = {'max_depth': [2, 3, 4], 'min_samples_leaf': [1, 10, 30]}
+
+
+def rounds_of(history):
+    rounds = {}
+    for entry in history:
+        rounds.setdefault(entry['round'], []).append(entry)
+    return [rounds[index] for index in sorted(rounds)]
+
+
+def test_successive_halving_keeps_one_in_factor(train_data):
+    trainer = ModelTrainer(random_state=0)
+    model, metrics = trainer.tune_model(train_data, 'decision_tree', search_space=SEARCH_SPACE,
+                                        factor=3, min_resources=60, workers=1)
+    search = metrics['search']
+    rounds = rounds_of(search['history'])
+
+    assert search['num_candidates'] == 9 and len(rounds) == search['num_rounds'] > 1
+    assert [len(entries) for entries in rounds] == [9, 3, 1]
+    for previous, current in zip(rounds, rounds[1:]):
+        assert current[0]['num_rows'] == previous[0]['num_rows'] * 3
+        # Solo pasan de ronda los mejores de la anterior
+        best_previous = sorted(previous, key=lambda entry: -entry['score'])[:len(current)]
+        assert {entry['candidate'] for entry in current} == {entry['candidate'] for entry in best_previous}
+
+    candidates = [dict(max_depth=depth, min_samples_leaf=leaf) for depth in SEARCH_SPACE['max_depth']
+                  for leaf in SEARCH_SPACE['min_samples_leaf']]
+    assert search['best_params'] in candidates
+    assert search['best_params'] == rounds[-1][0]['params']
+    assert model.get_params()['max_depth'] == search['best_params']['max_depth']
+
+
+def test_parallel_search_matches_sequential(train_data):
+    kwargs = dict(search_space=SEARCH_SPACE, factor=3, min_resources=60)
+    _, sequential = ModelTrainer(random_state=0).tune_model(train_data, 'decision_tree', workers=1, **kwargs)
+    _, parallel = ModelTrainer(random_state=0).tune_model(train_data, 'decision_tree', workers=2, **kwargs)
+
+    assert parallel['search']['best_params'] == sequential['search']['best_params']
+    with pytest.raises(ValueError, match='factor'):
+        ModelTrainer().tune_model(train_data, 'decision_tree', search_space=SEARCH_SPACE, factor=1)
@@ -0,0 +1,218 @@
+#Módulo para lectura y conversión de conjuntos de datos de métricas.
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterator, List
+from core.metrics_schema import downcast_metrics, validate_metrics
+from core.instrumentation import timings, timed
+
+# Directorio con un .npy por columna y un schema.json
+COLUMNAR_SUFFIX = '.cols'
+SCHEMA_FILENAME = 'schema.json'
+SCHEMA_VERSION = 1
+
+
+def is_columnar(path: str) -> bool:
+    """
+    Indica si la ruta corresponde a un conjunto de datos columnar.
+
+    Args:
+        path (str): Ruta del conjunto de datos
+
+    Returns:
+        bool: True si es un directorio .cols con schema.json
+    """
+    path = Path(path)
+    return path.suffix == COLUMNAR_SUFFIX and (path / SCHEMA_FILENAME).exists()
+
+
+def write_columnar(data: pd.DataFrame, output_path: str) -> str:
+    """
+    Guarda un DataFrame en formato columnar binario (un .npy por columna).
+
+    Las columnas numéricas conservan su dtype; las de texto se guardan como cadenas
+    Unicode de ancho fijo para poder mapearlas en memoria.
+
+    Args:
+        data (pd.DataFrame): Datos a guardar
+        output_path (str): Directorio de salida (se recomienda la extensión .cols)
+
+    Returns:
+        str: Ruta del directorio generado
+    """
+    output_path = Path(output_path)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    columns = []
+    for position, column in enumerate(data.columns):
+        values = data[column].to_numpy()
+        if not (np.issubdtype(values.dtype, np.number) or values.dtype == bool):
+            values = values.astype(str)
+
+        filename = f"{position:03d}.npy"
+        np.save(output_path / filename, np.ascontiguousarray(values))
+        columns.append({'name': str(column), 'file': filename, 'dtype': values.dtype.str})
+
+    schema = {
+        'version': SCHEMA_VERSION,
+        'num_rows': len(data),
+        'columns': columns
+    }
+    # El esquema se escribe al final: sin schema.json el directorio no se considera válido
+    tmp_schema = output_path / f".{SCHEMA_FILENAME}.tmp"
+    with open(tmp_schema, 'w', encoding='utf-8') as f:
+        json.dump(schema, f, indent=2)
+    os.replace(tmp_schema, output_path / SCHEMA_FILENAME)
+
+    return str(output_path)
+
+
+def read_schema(path: str) -> dict:
+    """
+    Lee el esquema de un conjunto de datos columnar.
+
+    Args:
+        path (str): Directorio .cols
+
+    Returns:
+        dict: Esquema con 'num_rows' y 'columns'
+    """
+    with open(Path(path) / SCHEMA_FILENAME, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_columnar(path: str, columns: List[str] = None, mmap: bool = True) -> pd.DataFrame:
+    """
+    Carga un conjunto de datos columnar.
+
+    Args:
+        path (str): Directorio .cols
+        columns (List[str]): Columnas a cargar (opcional, todas por defecto)
+        mmap (bool): Si las columnas se mapean en memoria en lugar de leerse
+
+    Returns:
+        pd.DataFrame: Datos con los dtypes originales (sin copiar los arreglos mapeados)
+    """
+    path = Path(path)
+    schema = read_schema(path)
+    available = {column['name']: column for column in schema['columns']}
+
+    if columns is None:
+        columns = [column['name'] for column in schema['columns']]
+    missing = [column for column in columns if column not in available]
+    if missing:
+        raise ValueError(f"Columnas no encontradas en {path}: {missing}")
+
+    arrays = {
+        column: np.load(path / available[column]['file'], mmap_mode='r' if mmap else None)
+        for column in columns
+    }
+    return pd.DataFrame(arrays, columns=columns, copy=False)
+
+
+def convert_csv(csv_path: str, output_path: str = None) -> str:
+    """
+    Convierte un CSV de métricas al formato columnar binario, con las métricas ya en sus dtypes compactos.
+
+    Args:
+        csv_path (str): Ruta al CSV
+        output_path (str): Directorio de salida (por defecto, el CSV con extensión .cols)
+
+    Returns:
+        str: Ruta del directorio generado
+    """
+    if output_path is None:
+        output_path = str(Path(csv_path).with_suffix(COLUMNAR_SUFFIX))
+
+    return write_columnar(downcast_metrics(pd.read_csv(csv_path)), output_path)
+
+
+@timed('read_metrics')
+def read_metrics(path: str,
+                 columns: List[str] = None,
+                 downcast: bool = True,
+                 require_target: bool = False) -> pd.DataFrame:
+    """
+    Carga un conjunto de datos de métricas en cualquiera de los formatos soportados.
+
+    Si se cargan todas las columnas, se verifica que estén las métricas del esquema.
+
+    Args:
+        path (str): Ruta a un .csv, un directorio .cols o un .parquet
+        columns (List[str]): Columnas a cargar (opcional)
+        downcast (bool): Si las métricas se convierten a los dtypes compactos del esquema
+        require_target (bool): Si también se exige la columna 'is_optimal' (datos de entrenamiento)
+
+    Returns:
+        pd.DataFrame: Datos cargados
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No se encontró el archivo de datos: {path}")
+
+    with timings.span('read_metrics.parse'):
+        if is_columnar(path):
+            data = read_columnar(path, columns=columns)
+        elif Path(path).suffix == '.parquet':
+            data = pd.read_parquet(path, columns=columns)
+        else:
+            data = pd.read_csv(path, usecols=columns)
+
+    if columns is None:
+        validate_metrics(data, require_target=require_target)
+    if not downcast:
+        return data
+    with timings.span('read_metrics.downcast'):
+        return downcast_metrics(data)
+
+
+def iter_metrics(path: str,
+                 chunksize: int,
+                 columns: List[str] = None,
+                 downcast: bool = True,
+                 require_target: bool = False) -> Iterator[pd.DataFrame]:
+    """
+    Recorre un conjunto de datos de métricas por bloques.
+
+    Si se cargan todas las columnas, se verifica que estén las métricas del esquema.
+    Los dtypes compactos los fija el esquema, así que todos los bloques comparten dtypes.
+
+    Args:
+        path (str): Ruta a un .csv, un directorio .cols o un .parquet
+        chunksize (int): Número de filas por bloque
+        columns (List[str]): Columnas a cargar (opcional)
+        downcast (bool): Si las métricas se convierten a los dtypes compactos del esquema
+        require_target (bool): Si también se exige la columna 'is_optimal' (datos de entrenamiento)
+
+    Yields:
+        pd.DataFrame: Bloque de filas (con índice global de fila)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No se encontró el archivo de datos: {path}")
+
+    if is_columnar(path):
+        data = read_columnar(path, columns=columns)
+        chunks = (data.iloc[start:start + chunksize] for start in range(0, len(data), chunksize))
+    elif Path(path).suffix == '.parquet':
+        chunks = _iter_parquet(path, chunksize, columns)
+    else:
+        chunks = pd.read_csv(path, usecols=columns, chunksize=chunksize)
+
+    for position, chunk in enumerate(chunks):
+        if position == 0 and columns is None:
+            validate_metrics(chunk, require_target=require_target)
+        yield downcast_metrics(chunk) if downcast else chunk
+
+
+def _iter_parquet(path: str, chunksize: int, columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """Recorre un archivo Parquet por lotes de filas (requiere pyarrow)."""
+    import pyarrow.parquet as pq
+
+    start = 0
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=columns):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
@@ -3,25 +3,26 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, Tuple
+from utils.dataset_io import read_metrics
 
 def analyze_code_metrics(file_path: str) -> Tuple[pd.DataFrame, Dict]:
     """
     Analiza las métricas de código y proporciona un resumen estadístico.
 
     Args:
-        file_path (str): Ruta al archivo CSV con las métricas.
+        file_path (str): Ruta a las métricas (CSV, directorio columnar .cols o .parquet).
 
     Returns:
         Tuple[pd.DataFrame, Dict]: DataFrame con los datos y diccionario con estadísticas.
     """
     # Leer los datos
-    data = pd.read_csv(file_path)
+    data = read_metrics(file_path, require_target=True)
 
     # Estadísticas básicas
     stats = {
         'total_samples': len(data),
-        'optimal_code': sum(data['is_optimal']),
-        'suboptimal_code': len(data) - sum(data['is_optimal']),
+        'optimal_code': int(data['is_optimal'].sum()),
+        'suboptimal_code': len(data) - int(data['is_optimal'].sum()),
         'metrics_summary': data.describe().to_dict(),
         'correlations': data.corr()['is_optimal'].to_dict()
     }